@@ -1,13 +1,19 @@
 from typing import Dict, List, Optional
-import openai
-from sentence_transformers import SentenceTransformer
-import spacy
-from .config import settings
+from .services.model_registry import model_registry
+from .services.embedding_batcher import embedding_batcher
+from .services.llm_cache import llm_cache
+from .services.llm_client import llm_client
 
-# Initialize AI models
-nlp = spacy.load("en_core_web_sm")
-sentence_model = SentenceTransformer('all-MiniLM-L6-v2')
-openai.api_key = settings.OPENAI_API_KEY
+# AI models are loaded lazily through the shared registry; LLM calls go through
+# the shared rate-limited client
+
+async def complete(agent: str, prompt: str, model: str = "gpt-4") -> str:
+    """Run a chat completion, served from the LLM cache when enabled for this agent"""
+    messages = [{"role": "user", "content": prompt}]
+    
+    return await llm_cache.get_or_create(
+        agent, model, messages, lambda: llm_client.chat(model, messages)
+    )
 
 class JDAgent:
     @staticmethod
@@ -24,20 +30,17 @@ class JDAgent:
         5. Role type
         """
         
-        response = await openai.ChatCompletion.acreate(
-            model="gpt-4",
-            messages=[{"role": "user", "content": prompt}]
-        )
+        content = await complete("jd", prompt)
         
         return {
-            "summary": response.choices[0].message.content,
+            "summary": content,
             "raw_text": jd_text
         }
     
     @staticmethod
     def extract_skills(jd_text: str) -> List[str]:
         """Extract skills from job description using spaCy"""
-        doc = nlp(jd_text)
+        doc = model_registry.get_nlp()(jd_text)
         skills = []
         
         # Extract noun phrases and technical terms
@@ -62,13 +65,10 @@ class ResumeAgent:
         5. Certifications
         """
         
-        response = await openai.ChatCompletion.acreate(
-            model="gpt-4",
-            messages=[{"role": "user", "content": prompt}]
-        )
+        content = await complete("resume", prompt)
         
         return {
-            "parsed_data": response.choices[0].message.content,
+            "parsed_data": content,
             "raw_text": resume_text
         }
 
@@ -89,13 +89,14 @@ class MatchingAgent:
     @staticmethod
     def get_embeddings(text: str) -> List[float]:
         """Get sentence embeddings for text"""
-        return sentence_model.encode(text).tolist()
+        return model_registry.get_sentence_model().encode(text).tolist()
     
     @staticmethod
     async def analyze_match(jd_text: str, resume_text: str) -> Dict:
         """Analyze match between JD and resume"""
-        jd_embedding = MatchingAgent.get_embeddings(jd_text)
-        resume_embedding = MatchingAgent.get_embeddings(resume_text)
+        embeddings = await embedding_batcher.encode([jd_text, resume_text])
+        jd_embedding = embeddings[0].tolist()
+        resume_embedding = embeddings[1].tolist()
         
         match_score = MatchingAgent.calculate_match_score(jd_embedding, resume_embedding)
         
@@ -116,14 +117,11 @@ class MatchingAgent:
         5. Recommendations
         """
         
-        response = await openai.ChatCompletion.acreate(
-            model="gpt-4",
-            messages=[{"role": "user", "content": prompt}]
-        )
+        content = await complete("matching", prompt)
         
         return {
             "match_score": match_score,
-            "analysis": response.choices[0].message.content,
+            "analysis": content,
             "jd_embedding": jd_embedding,
             "resume_embedding": resume_embedding
         }
@@ -148,9 +146,4 @@ class InterviewSchedulerAgent:
         Make it warm, professional, and include all necessary details.
         """
         
-        response = await openai.ChatCompletion.acreate(
-            model="gpt-4",
-            messages=[{"role": "user", "content": prompt}]
-        )
-        
-        return response.choices[0].message.content 
\ No newline at end of file
+        return await complete("interview", prompt)
\ No newline at end of file
@@ -1,15 +1,17 @@
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from . import models
 from .config import settings
-from .database import get_db
+from .database import get_async_db
+from .services.user_cache import user_cache
+from .services.password_hasher import password_hasher
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Synchronous helpers for scripts; request handlers use password_hasher
+pwd_context = password_hasher.context
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -18,6 +20,10 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
+def user_claims(user: models.User) -> dict:
+    """Principal fields carried in the token when JWT_USER_CLAIMS is on"""
+    return {"email": user.email, "name": user.full_name, "role": user.role.value}
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     if expires_delta:
@@ -30,7 +36,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> models.User:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -45,10 +51,22 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
     
-    user = db.query(models.User).filter(models.User.id == user_id).first()
-    if user is None:
-        raise credentials_exception
-    return user
+    # Tokens that carry the principal need no lookup at all
+    if settings.JWT_USER_CLAIMS and "role" in payload:
+        try:
+            role = models.UserRole(payload["role"])
+        except ValueError:
+            raise credentials_exception
+        return models.User(id=user_id, email=payload.get("email"), full_name=payload.get("name"), role=role)
+    
+    principal = user_cache.get(user_id)
+    if principal is None:
+        user = await db.get(models.User, user_id)
+        if user is None:
+            raise credentials_exception
+        principal = user_cache.put(user)
+    # A fresh transient instance per request; cached principals are never shared
+    return models.User(**principal)
 
 def get_current_active_user(
     current_user: models.User = Depends(get_current_user)
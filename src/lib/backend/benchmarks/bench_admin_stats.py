@@ -0,0 +1,75 @@
+"""
+/admin/stats latency: five full-table aggregates versus the materialized
+counters, at increasing table sizes.
+
+Each size builds a synthetic SQLite database, reconciles the counters once
+(which is also the cost of one periodic reconciliation pass) and times both
+ways of answering the dashboard.
+
+    python -m src.lib.backend.benchmarks.bench_admin_stats --matches 10000 100000 1000000
+"""
+from typing import List
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from .. import models
+from ..migrations import run_migrations
+from ..services.admin_stats import AdminStats
+from .bench_match_indexes import populate
+
+async def aggregate_stats(db) -> dict:
+    """The dashboard query before the counters were materialized"""
+    counts = {}
+    for name, model in (("jobs", models.JobPosting), ("resumes", models.Resume),
+                        ("matches", models.Match), ("interviews", models.Interview)):
+        counts[name] = (await db.execute(select(func.count()).select_from(model))).scalar()
+    counts["avg_match_score"] = (await db.execute(select(func.avg(models.Match.match_score)))).scalar()
+    return counts
+
+async def median_ms(fn, repeats: int) -> float:
+    timings: List[float] = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        await fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+async def run(db_path: str, matches: int, repeats: int) -> None:
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    Session = async_sessionmaker(async_engine, expire_on_commit=False)
+    stats = AdminStats()
+    async with Session() as db:
+        started = time.perf_counter()
+        await stats.reconcile(db)
+        reconcile_ms = (time.perf_counter() - started) * 1000
+        aggregate_ms = await median_ms(lambda: aggregate_stats(db), repeats)
+        materialized_ms = await median_ms(lambda: stats.totals(db), repeats)
+    print(f"{matches:>9} {aggregate_ms:12.2f} ms {materialized_ms:14.3f} ms {reconcile_ms:12.1f} ms")
+    await async_engine.dispose()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--matches", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'matches':>9} {'aggregates':>15} {'materialized':>17} {'reconcile':>15}")
+    for matches in args.matches:
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, "bench.db")
+            engine = create_engine(f"sqlite:///{db_path}")
+            models.Base.metadata.create_all(bind=engine)
+            run_migrations(engine)
+            # Resumes and interviews scale with matches, as on a live deployment
+            populate(engine, max(1_000, matches // 10), 1_000, max(50, matches // 4), matches, matches // 10)
+            engine.dispose()
+            asyncio.run(run(db_path, matches, args.repeats))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+Requests per second for the shortlist endpoint with three database paths.
+
+    blocking  sync Session queries straight in the async handler
+    threaded  sync Session queries offloaded with executor.run_io
+    async     AsyncSession (aiosqlite) through DatabaseService
+
+Each mode serves the same job lookup plus shortlist page through a small
+FastAPI app driven in-process by httpx at a fixed concurrency. Event-loop lag
+is sampled alongside, since that is what other requests feel while the
+database is busy.
+
+    python -m src.lib.backend.benchmarks.bench_db_async --requests 2000 --concurrency 64
+"""
+from typing import Any, Dict, List
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from .. import models
+from ..database import set_sqlite_pragmas
+from ..migrations import run_migrations
+from ..services.database import DatabaseService
+from ..services.executor import executor
+from .bench_match_indexes import populate
+
+def shortlist_query(job_id: str, limit: int):
+    return select(
+        models.Match.id,
+        models.Match.match_score,
+        models.Match.resume_id,
+        models.User.full_name
+    ).join(
+        models.Resume, models.Resume.id == models.Match.resume_id
+    ).join(
+        models.User, models.User.id == models.Resume.user_id
+    ).filter(
+        models.Match.job_id == job_id,
+        models.Match.match_score >= 70
+    ).order_by(models.Match.match_score.desc(), models.Match.id.desc()).limit(limit)
+
+def build_app(SyncSession, AsyncSession) -> FastAPI:
+    app = FastAPI()
+    db_service = DatabaseService()
+
+    def sync_shortlist(job_id: str, limit: int) -> List[Dict[str, Any]]:
+        db = SyncSession()
+        try:
+            if db.get(models.JobPosting, job_id) is None:
+                return []
+            return [dict(row._mapping) for row in db.execute(shortlist_query(job_id, limit))]
+        finally:
+            db.close()
+
+    @app.get("/blocking/{job_id}")
+    async def blocking(job_id: str, limit: int = 50):
+        return sync_shortlist(job_id, limit)
+
+    @app.get("/threaded/{job_id}")
+    async def threaded(job_id: str, limit: int = 50):
+        return await executor.run_io(sync_shortlist, job_id, limit)
+
+    @app.get("/async/{job_id}")
+    async def async_(job_id: str, limit: int = 50):
+        async with AsyncSession() as db:
+            if await db_service.get_job_posting(db, job_id) is None:
+                return []
+            return (await db_service.get_shortlisted_candidates(db, job_id, limit=limit))["shortlisted"]
+
+    return app
+
+async def monitor_lag(samples: List[float], stop: asyncio.Event, interval: float = 0.001) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append((time.perf_counter() - started - interval) * 1000)
+
+async def load(app: FastAPI, mode: str, job_ids: List[str], requests: int, concurrency: int) -> Dict[str, float]:
+    latencies: List[float] = []
+    lag: List[float] = []
+    stop = asyncio.Event()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        async def one(i: int) -> None:
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.get(f"/{mode}/{job_ids[i % len(job_ids)]}")
+                response.raise_for_status()
+                latencies.append((time.perf_counter() - started) * 1000)
+
+        monitor = asyncio.create_task(monitor_lag(lag, stop))
+        started = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(requests)))
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await monitor
+
+    latencies.sort()
+    return {
+        "rps": requests / elapsed,
+        "p50_ms": statistics.median(latencies),
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1],
+        "max_loop_lag_ms": max(lag) if lag else 0.0
+    }
+
+async def run(db_path: str, job_ids: List[str], args: argparse.Namespace) -> None:
+    sync_engine = create_engine(
+        f"sqlite:///{db_path}",
+        connect_args={"check_same_thread": False},
+        pool_size=args.concurrency
+    )
+    async_engine = create_async_engine(
+        f"sqlite+aiosqlite:///{db_path}",
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=args.concurrency
+    )
+    for engine in (sync_engine, async_engine.sync_engine):
+        event.listen(engine, "connect", set_sqlite_pragmas)
+
+    app = build_app(
+        sessionmaker(bind=sync_engine),
+        async_sessionmaker(async_engine, expire_on_commit=False)
+    )
+    for mode in ("blocking", "threaded", "async"):
+        # Warm the pool and page cache before measuring
+        await load(app, mode, job_ids, min(200, args.requests), args.concurrency)
+        result = await load(app, mode, job_ids, args.requests, args.concurrency)
+        print(
+            f"{mode:>9}: {result['rps']:8.1f} req/s  p50 {result['p50_ms']:7.2f} ms  "
+            f"p99 {result['p99_ms']:7.2f} ms  max loop lag {result['max_loop_lag_ms']:7.2f} ms"
+        )
+
+    await async_engine.dispose()
+    sync_engine.dispose()
+    executor.shutdown()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--matches", type=int, default=200_000)
+    parser.add_argument("--resumes", type=int, default=50_000)
+    parser.add_argument("--jobs", type=int, default=1_000)
+    parser.add_argument("--users", type=int, default=20_000)
+    parser.add_argument("--requests", type=int, default=2_000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        engine = create_engine(f"sqlite:///{db_path}")
+        models.Base.metadata.create_all(bind=engine)
+        run_migrations(engine)
+        samples = populate(engine, args.users, args.jobs, args.resumes, args.matches, 0)
+        engine.dispose()
+        print(f"{args.matches} matches, {args.requests} requests at concurrency {args.concurrency}\n")
+        asyncio.run(run(db_path, samples["job_id"], args))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Conflict checks and free-slot searches over 1M interviews: SQL versus the
+in-memory interval index.
+
+Builds a synthetic SQLite database (1M interviews by default, on working-hour
+slots across a year, spread over the matches of ~1k interviewers), then times
+
+    load         full InterviewSlotIndex.refresh from the interviews table
+    incremental  refresh after 1,000 new interviews
+    conflicts    overlap check for one slot: SQL join with datetime arithmetic
+                 versus InterviewSlotIndex.conflicts
+    free slots   next N free slots for an (interviewer, candidate) pair
+
+    python -m src.lib.backend.benchmarks.bench_interview_slots --interviews 1000000
+"""
+from typing import List, Tuple
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from .. import models
+from ..migrations import run_migrations
+from ..services.interview_slots import InterviewSlotIndex
+from .bench_match_indexes import populate
+
+START = datetime(2026, 1, 5)
+STORED = "%Y-%m-%d %H:%M:%S.%f"  # SQLAlchemy's SQLite datetime format
+
+CONFLICT_SQL = text(
+    "SELECT interviews.id FROM interviews "
+    "JOIN matches ON matches.id = interviews.match_id "
+    "JOIN job_postings ON job_postings.id = matches.job_id "
+    "JOIN resumes ON resumes.id = matches.resume_id "
+    # Either participant may be busy in either role
+    "WHERE (job_postings.user_id IN (:interviewer_id, :candidate_id) OR resumes.user_id IN (:interviewer_id, :candidate_id)) "
+    "AND interviews.status != 'cancelled' "
+    "AND interviews.scheduled_time < :end "
+    "AND datetime(interviews.scheduled_time, '+' || interviews.duration_minutes || ' minutes') > :start"
+)
+
+def random_slot(rng: random.Random) -> datetime:
+    return START + timedelta(days=rng.randrange(365), hours=9 + rng.randrange(8), minutes=15 * rng.randrange(4))
+
+def insert_interviews(engine, match_ids: List[str], count: int, rng: random.Random, now: datetime, spread_days: int) -> None:
+    raw = engine.raw_connection()
+    try:
+        cur = raw.cursor()
+        for offset in range(0, count, 100_000):
+            cur.executemany(
+                "INSERT INTO interviews (id, match_id, scheduled_time, duration_minutes, interview_type, status, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        str(uuid.uuid4()),
+                        rng.choice(match_ids),
+                        random_slot(rng).strftime(STORED),
+                        rng.choice((30, 45, 60)),
+                        "video",
+                        "scheduled",
+                        changed.strftime(STORED),
+                        changed.strftime(STORED)
+                    )
+                    for changed in sorted(
+                        now - timedelta(seconds=rng.uniform(0, spread_days * 86400))
+                        for _ in range(min(100_000, count - offset))
+                    )
+                ]
+            )
+        raw.commit()
+        cur.execute("ANALYZE")
+        raw.commit()
+    finally:
+        raw.close()
+
+def median_ms(timings: List[float]) -> float:
+    return statistics.median(timings) * 1000
+
+async def run(db_path: str, engine, match_ids: List[str], args: argparse.Namespace) -> None:
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    Session = async_sessionmaker(async_engine, expire_on_commit=False)
+    index = InterviewSlotIndex()
+
+    started = time.perf_counter()
+    async with Session() as db:
+        rows = await index.refresh(db)
+    print(f"load         {rows} rows in {time.perf_counter() - started:.2f} s ({index.stats()['people']} people)")
+
+    rng = random.Random(1)
+    insert_interviews(engine, match_ids, 1_000, rng, datetime.utcnow() + timedelta(seconds=1), 0)
+    started = time.perf_counter()
+    async with Session() as db:
+        rows = await index.refresh(db)
+    print(f"incremental  {rows} rows in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    async with Session() as db:
+        pairs: List[Tuple[str, str]] = [
+            tuple(row) for row in (await db.execute(text(
+                "SELECT job_postings.user_id, resumes.user_id FROM matches "
+                "JOIN job_postings ON job_postings.id = matches.job_id "
+                "JOIN resumes ON resumes.id = matches.resume_id "
+                "WHERE matches.id IN (SELECT match_id FROM interviews ORDER BY random() LIMIT :n)"
+            ), {"n": args.queries})).all()
+        ]
+
+        sql_timings, index_timings, free_timings = [], [], []
+        agree = 0
+        for interviewer_id, candidate_id in pairs:
+            slot = random_slot(rng)
+            end = slot + timedelta(minutes=45)
+            started = time.perf_counter()
+            sql_ids = {row[0] for row in await db.execute(CONFLICT_SQL, {
+                "interviewer_id": interviewer_id,
+                "candidate_id": candidate_id,
+                "start": slot.strftime(STORED),
+                "end": end.strftime(STORED)
+            })}
+            sql_timings.append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            index_ids = set(index.conflicts(interviewer_id, candidate_id, slot, 45))
+            index_timings.append(time.perf_counter() - started)
+            agree += sql_ids == index_ids
+
+            started = time.perf_counter()
+            index.free_slots(interviewer_id, candidate_id, 45, slot, args.slots)
+            free_timings.append(time.perf_counter() - started)
+
+    print(f"conflicts    SQL {median_ms(sql_timings):8.3f} ms   index {median_ms(index_timings):8.4f} ms   "
+          f"(same answer for {agree}/{len(pairs)} queries)")
+    print(f"free slots   index {median_ms(free_timings):8.4f} ms for the next {args.slots}")
+    await async_engine.dispose()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--interviews", type=int, default=1_000_000)
+    parser.add_argument("--matches", type=int, default=200_000)
+    parser.add_argument("--resumes", type=int, default=50_000)
+    parser.add_argument("--jobs", type=int, default=1_000)
+    parser.add_argument("--users", type=int, default=20_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--slots", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        engine = create_engine(f"sqlite:///{db_path}")
+        models.Base.metadata.create_all(bind=engine)
+        run_migrations(engine)
+        populate(engine, args.users, args.jobs, args.resumes, args.matches, 0)
+        with engine.connect() as conn:
+            match_ids = [row[0] for row in conn.execute(text("SELECT id FROM matches"))]
+        # Booked over the past year, so updated_at is spread like a live table's
+        insert_interviews(engine, match_ids, args.interviews, random.Random(0), datetime.utcnow(), 365)
+        print(f"{args.interviews} interviews over {len(match_ids)} matches\n")
+        asyncio.run(run(db_path, engine, match_ids, args))
+        engine.dispose()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Page latency at increasing depth: offset pagination of full rows versus the
+keyset, projected pages served by the list endpoints.
+
+Builds a synthetic SQLite database (200k resumes with a ~2 KB parsed_data
+document each by default) and times one page at several depths both ways.
+
+    python -m src.lib.backend.benchmarks.bench_list_pagination --resumes 200000
+"""
+from typing import List
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import tempfile
+import time
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import undefer_group
+
+from .. import models
+from ..migrations import run_migrations
+from ..services.pagination import encode_cursor, keyset_page_query, stream_json_page
+from .bench_match_indexes import populate
+
+async def time_offset(Session, depth: int, limit: int, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        async with Session() as db:
+            rows = (await db.execute(
+                select(models.Resume).options(undefer_group("details")).order_by(
+                    models.Resume.created_at.desc(), models.Resume.id.desc()
+                ).offset(depth).limit(limit)
+            )).scalars().all()
+            json.dumps([{"id": row.id, "parsed_data": row.parsed_data} for row in rows])
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+async def time_keyset(Session, cursor: str, fields: List[str], limit: int, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        query = keyset_page_query(models.Resume, fields, limit, cursor)
+        body = b"".join([chunk async for chunk in await stream_json_page(Session, query, fields, limit)])
+        json.loads(body)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+async def run(db_path: str, args: argparse.Namespace) -> None:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    Session = async_sessionmaker(engine, expire_on_commit=False)
+    print(f"{'depth':>8} {'offset, full rows':>18} {'keyset, all fields':>19} {'keyset, id+file_name':>21}")
+    for depth in args.depths:
+        if depth >= args.resumes:
+            continue
+        async with Session() as db:
+            anchor = (await db.execute(
+                select(models.Resume.created_at, models.Resume.id).order_by(
+                    models.Resume.created_at.desc(), models.Resume.id.desc()
+                ).offset(depth).limit(1)
+            )).first()
+        # The cursor a client holds after paging down to this depth
+        cursor = encode_cursor(anchor.created_at.isoformat(), anchor.id) if depth else None
+        offset_ms = await time_offset(Session, depth, args.limit, args.repeats)
+        all_ms = await time_keyset(Session, cursor, ["id", "user_id", "file_name", "parsed_data", "skills"], args.limit, args.repeats)
+        slim_ms = await time_keyset(Session, cursor, ["id", "file_name"], args.limit, args.repeats)
+        print(f"{depth:>8} {offset_ms:>15.2f} ms {all_ms:>16.2f} ms {slim_ms:>18.2f} ms")
+    await engine.dispose()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resumes", type=int, default=200_000)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--repeats", type=int, default=10)
+    parser.add_argument("--depths", type=int, nargs="+", default=[0, 1_000, 10_000, 100_000, 190_000])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        engine = create_engine(f"sqlite:///{db_path}")
+        models.Base.metadata.create_all(bind=engine)
+        run_migrations(engine)
+        populate(engine, 1_000, 10, args.resumes, 100, 0)
+        document = json.dumps({"summary": "x" * 1500, "skills": ["python"] * 50})
+        with engine.begin() as conn:
+            # Spread creation times (in SQLAlchemy's stored format) so pages order by created_at, not only id
+            conn.execute(
+                text(
+                    "UPDATE resumes SET parsed_data = :document, "
+                    "created_at = datetime('now', '-' || (rowid % 100000) || ' seconds') || '.000000'"
+                ),
+                {"document": document}
+            )
+            conn.execute(text("ANALYZE"))
+        engine.dispose()
+        asyncio.run(run(db_path, args))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Login throughput with bcrypt on the event loop versus the bounded hasher pool.
+
+    blocking  passlib verify called directly in the async handler
+    pooled    password_hasher.verify on its dedicated thread pool
+
+Each mode serves the same credential check through a small FastAPI app driven
+in-process by httpx at a fixed concurrency, while a probe measures event-loop
+lag (what every other request feels during a login burst). Requests shed by
+the pool's backpressure are counted, not retried.
+
+    python -m src.lib.backend.benchmarks.bench_login_throughput --requests 400 --concurrency 64 --rounds 12
+"""
+from typing import Dict, List
+import argparse
+import asyncio
+import statistics
+import time
+import httpx
+from fastapi import FastAPI, HTTPException
+
+from ..services.password_hasher import HasherBusy, PasswordHasher
+from .bench_db_async import monitor_lag
+
+def build_app(hasher: PasswordHasher, hashed_password: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/blocking")
+    async def blocking(password: str):
+        return {"ok": hasher.context.verify(password, hashed_password)}
+
+    @app.post("/pooled")
+    async def pooled(password: str):
+        try:
+            return {"ok": await hasher.verify(password, hashed_password)}
+        except HasherBusy as e:
+            raise HTTPException(status_code=503, detail=str(e))
+
+    return app
+
+async def load(app: FastAPI, mode: str, requests: int, concurrency: int) -> Dict[str, float]:
+    latencies: List[float] = []
+    lag: List[float] = []
+    shed = 0
+    stop = asyncio.Event()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        async def one() -> None:
+            nonlocal shed
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.post(f"/{mode}", params={"password": "correct horse"})
+                if response.status_code == 503:
+                    shed += 1
+                    return
+                response.raise_for_status()
+                latencies.append((time.perf_counter() - started) * 1000)
+
+        monitor = asyncio.create_task(monitor_lag(lag, stop))
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await monitor
+
+    latencies.sort()
+    return {
+        "logins_per_s": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) if latencies else 0.0,
+        "p99_ms": latencies[max(0, int(len(latencies) * 0.99) - 1)] if latencies else 0.0,
+        "max_loop_lag_ms": max(lag) if lag else 0.0,
+        "shed": shed
+    }
+
+async def run(args: argparse.Namespace) -> None:
+    hasher = PasswordHasher(rounds=args.rounds, workers=args.workers, max_pending=args.max_pending)
+    hashed_password = await hasher.hash("correct horse")
+    app = build_app(hasher, hashed_password)
+    for mode in ("blocking", "pooled"):
+        result = await load(app, mode, args.requests, args.concurrency)
+        print(
+            f"{mode:>9}: {result['logins_per_s']:7.1f} logins/s  p50 {result['p50_ms']:8.2f} ms  "
+            f"p99 {result['p99_ms']:8.2f} ms  max loop lag {result['max_loop_lag_ms']:8.2f} ms  "
+            f"shed {result['shed']}"
+        )
+    hasher.shutdown()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--rounds", type=int, default=12)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--max-pending", type=int, default=256)
+    args = parser.parse_args()
+    print(f"bcrypt cost {args.rounds}, {args.requests} logins at concurrency {args.concurrency}, {args.workers} hasher workers\n")
+    asyncio.run(run(args))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+Query plans and timings for hot lookups before and after the index migration.
+
+Builds a synthetic SQLite database (1M matches by default), drops the indexes
+added by migration 1, measures the hot queries, applies the migration and
+measures again.
+
+    python -m src.lib.backend.benchmarks.bench_match_indexes --matches 1000000
+"""
+from typing import Dict, List, Tuple
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+import uuid
+from datetime import datetime
+from sqlalchemy import create_engine, text
+
+from .. import models
+from ..migrations import MIGRATIONS, run_migrations
+
+NEW_INDEXES = [
+    "ix_matches_job_id_match_score",
+    "ix_matches_resume_id",
+    "uq_matches_job_id_resume_id",
+    "ix_resumes_user_id",
+    "ix_job_postings_user_id",
+    "ix_interviews_match_id",
+]
+
+QUERIES: Dict[str, str] = {
+    "shortlist": (
+        "SELECT matches.id, matches.match_score, matches.resume_id, users.full_name "
+        "FROM matches JOIN resumes ON resumes.id = matches.resume_id "
+        "JOIN users ON users.id = resumes.user_id "
+        "WHERE matches.job_id = :job_id AND matches.match_score >= 70 "
+        "ORDER BY matches.match_score DESC, matches.id DESC LIMIT 50"
+    ),
+    "matches_for_resume": "SELECT id, job_id, match_score FROM matches WHERE resume_id = :resume_id",
+    "match_exists": "SELECT id FROM matches WHERE job_id = :job_id AND resume_id = :resume_id",
+    "resumes_for_user": "SELECT id FROM resumes WHERE user_id = :user_id",
+    "jobs_for_user": "SELECT id FROM job_postings WHERE user_id = :user_id",
+    "interviews_for_match": "SELECT id, scheduled_time FROM interviews WHERE match_id = :match_id",
+}
+
+def populate(engine, n_users: int, n_jobs: int, n_resumes: int, n_matches: int, n_interviews: int) -> Dict[str, List[str]]:
+    rng = random.Random(0)
+    now = datetime.utcnow()
+    users = [str(uuid.uuid4()) for _ in range(n_users)]
+    jobs = [str(uuid.uuid4()) for _ in range(n_jobs)]
+    resumes = [str(uuid.uuid4()) for _ in range(n_resumes)]
+
+    raw = engine.raw_connection()
+    try:
+        cur = raw.cursor()
+        cur.executemany(
+            "INSERT INTO users (id, email, full_name, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+            [(u, f"{u}@example.com", f"User {i}", now, now) for i, u in enumerate(users)]
+        )
+        cur.executemany(
+            "INSERT INTO job_postings (id, user_id, title, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+            [(j, rng.choice(users), "Engineer", now, now) for j in jobs]
+        )
+        cur.executemany(
+            "INSERT INTO resumes (id, user_id, created_at, updated_at) VALUES (?, ?, ?, ?)",
+            [(r, rng.choice(users), now, now) for r in resumes]
+        )
+
+        pairs = set()
+        while len(pairs) < n_matches:
+            pairs.add((rng.randrange(n_jobs), rng.randrange(n_resumes)))
+        matches = []
+        batch = []
+        for job_no, resume_no in pairs:
+            match_id = str(uuid.uuid4())
+            matches.append(match_id)
+            batch.append((match_id, jobs[job_no], resumes[resume_no], rng.uniform(0, 100), "{}", "pending", now, now))
+            if len(batch) >= 50000:
+                cur.executemany(
+                    "INSERT INTO matches (id, job_id, resume_id, match_score, match_details, status, created_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", batch
+                )
+                batch = []
+        if batch:
+            cur.executemany(
+                "INSERT INTO matches (id, job_id, resume_id, match_score, match_details, status, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", batch
+            )
+        cur.executemany(
+            "INSERT INTO interviews (id, match_id, scheduled_time, duration_minutes, interview_type, status, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [(str(uuid.uuid4()), rng.choice(matches), now, 60, "video", "scheduled", now, now) for _ in range(n_interviews)]
+        )
+        raw.commit()
+        cur.execute("ANALYZE")
+        raw.commit()
+    finally:
+        raw.close()
+
+    sample_pairs = rng.sample(sorted(pairs), 50)
+    return {
+        "job_id": [jobs[j] for j, _ in sample_pairs],
+        "resume_id": [resumes[r] for _, r in sample_pairs],
+        "user_id": rng.sample(users, 50),
+        "match_id": rng.sample(matches, 50),
+    }
+
+def measure(engine, samples: Dict[str, List[str]], repeats: int) -> Dict[str, Tuple[str, float]]:
+    results = {}
+    with engine.connect() as conn:
+        for name, sql in QUERIES.items():
+            keys = [key for key in samples if f":{key}" in sql]
+            params = [
+                {key: samples[key][i % len(samples[key])] for key in keys}
+                for i in range(repeats)
+            ]
+            plan = " | ".join(
+                row[-1] for row in conn.execute(text("EXPLAIN QUERY PLAN " + sql), params[0])
+            )
+            timings = []
+            for param in params:
+                started = time.perf_counter()
+                conn.execute(text(sql), param).fetchall()
+                timings.append((time.perf_counter() - started) * 1000)
+            results[name] = (plan, statistics.median(timings))
+    return results
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--matches", type=int, default=1_000_000)
+    parser.add_argument("--resumes", type=int, default=200_000)
+    parser.add_argument("--jobs", type=int, default=5_000)
+    parser.add_argument("--users", type=int, default=50_000)
+    parser.add_argument("--interviews", type=int, default=100_000)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        models.Base.metadata.create_all(bind=engine)
+        with engine.begin() as conn:
+            # Start from the pre-migration schema
+            for index in NEW_INDEXES:
+                conn.execute(text(f"DROP INDEX IF EXISTS {index}"))
+
+        started = time.perf_counter()
+        samples = populate(engine, args.users, args.jobs, args.resumes, args.matches, args.interviews)
+        print(f"Loaded {args.matches} matches in {time.perf_counter() - started:.1f}s\n")
+
+        before = measure(engine, samples, args.repeats)
+        started = time.perf_counter()
+        run_migrations(engine)
+        with engine.begin() as conn:
+            conn.execute(text("ANALYZE"))
+        print(f"Migrations {[version for version, _, _ in MIGRATIONS]} took {time.perf_counter() - started:.1f}s\n")
+        after = measure(engine, samples, args.repeats)
+
+        for name in QUERIES:
+            plan_before, ms_before = before[name]
+            plan_after, ms_after = after[name]
+            print(f"{name}: {ms_before:.3f} ms -> {ms_after:.3f} ms (median of {args.repeats})")
+            print(f"  before: {plan_before}")
+            print(f"  after:  {plan_after}")
+        engine.dispose()
+
+if __name__ == "__main__":
+    main()
@@ -3,21 +3,104 @@ from typing import Optional
 
 class Settings(BaseSettings):
     # Database settings
-    DATABASE_URL: str = "sqlite:///./jobspark.db"
+    DATABASE_URL: str = "sqlite:///data/jobspark.db"
+    DB_POOL_SIZE: int = 32  # Sized to EXECUTOR_IO_WORKERS so every I/O thread can hold a connection
+    DB_MAX_OVERFLOW: int = 8
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    DB_SERIALIZE_WRITES: bool = True  # Run write transactions one at a time, in arrival order
+    
+    # SQLite settings (applied on every new connection)
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    SQLITE_CACHE_SIZE_KB: int = 16 * 1024  # Per connection
     
     # JWT settings
     SECRET_KEY: str = "your-secret-key-here"  # Change in production
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    JWT_USER_CLAIMS: bool = False  # Carry email, name and role in tokens; role changes apply at the next login
+    AUTH_USER_CACHE_TTL_SECONDS: float = 60.0
+    AUTH_USER_CACHE_MAX_ENTRIES: int = 10000
+    
+    # Password hashing settings
+    BCRYPT_ROUNDS: int = 12  # Cost factor for new hashes; existing hashes keep their own
+    PASSWORD_HASH_WORKERS: int = 0  # 0 means one per CPU core
+    PASSWORD_HASH_MAX_PENDING: int = 0  # Running plus queued before logins get a 503; 0 means 16 per worker
     
     # OpenAI settings
     OPENAI_API_KEY: Optional[str] = None
+    OPENAI_BASE_URL: Optional[str] = None  # Override to point at a local fake server
+    
+    # LLM client settings
+    LLM_MAX_CONCURRENCY: int = 8
+    LLM_REQUESTS_PER_MINUTE: int = 500
+    LLM_TOKENS_PER_MINUTE: int = 40000
+    LLM_TIMEOUT_SECONDS: float = 60.0
+    LLM_MAX_RETRIES: int = 4
+    LLM_RETRY_BASE_SECONDS: float = 1.0
+    
+    # LLM response cache settings
+    LLM_CACHE_PATH: str = "data/llm_cache.db"  # Relative to the backend package
+    LLM_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    LLM_CACHE_MAX_ENTRIES: int = 10000
+    LLM_CACHE_AGENTS: str = "jd,resume,matching,interview"  # Comma-separated; remove an agent to disable its cache
+    
+    # Model settings
+    SPACY_MODEL: str = "en_core_web_sm"
+    PRELOAD_MODELS: bool = False  # Load models at import time, e.g. before gunicorn --preload forks
+    WARM_UP_MODELS: bool = True  # Run a warm-up inference pass on startup
+    
+    # Upload settings
+    UPLOAD_DIR: str = "uploads"
+    MAX_UPLOAD_BYTES: int = 20 * 1024 * 1024
+    UPLOAD_CHUNK_BYTES: int = 1024 * 1024
+    
+    # Executor settings
+    EXECUTOR_IO_WORKERS: int = 32
+    EXECUTOR_CPU_WORKERS: int = 0  # 0 means one per CPU core
+    EXECUTOR_CPU_MODE: str = "thread"  # "thread" or "process"
+    
+    # Embedding settings
+    EMBEDDING_MODEL: str = "all-MiniLM-L6-v2"
+    EMBEDDING_MODEL_VERSION: str = "1"  # Bump to invalidate cached vectors
+    EMBEDDING_CACHE_PATH: str = "data/embeddings.db"
+    EMBEDDING_CACHE_MEMORY_ITEMS: int = 50000
+    EMBEDDING_BATCHING_ENABLED: bool = True  # Coalesce concurrent encodes into one forward pass
+    EMBEDDING_BATCH_MAX_SIZE: int = 64
+    EMBEDDING_BATCH_MAX_WAIT_MS: float = 5.0
+    
+    # Match analysis settings
+    DEFER_MATCH_ANALYSIS: bool = False  # Store scores immediately, fill in the LLM analysis later
+    ANALYSIS_WORKERS: int = 4
+    ANALYSIS_MAX_ATTEMPTS: int = 3
     
     # Email settings
     SMTP_HOST: str = "smtp.gmail.com"
     SMTP_PORT: int = 587
     SMTP_USERNAME: Optional[str] = None
     SMTP_PASSWORD: Optional[str] = None
+    SMTP_FROM: Optional[str] = None  # Defaults to SMTP_USERNAME; with neither set mail stays queued
+    SMTP_STARTTLS: bool = True
+    SMTP_TIMEOUT_SECONDS: float = 30.0
+    SMTP_IDLE_SECONDS: float = 60.0  # Close the reused connection after this long without sends
+    
+    # Admin stats settings
+    ADMIN_STATS_RECONCILE_SECONDS: float = 3600.0  # Recompute the materialized counters from source rows
+    ADMIN_STATS_MAX_DAYS: int = 366
+    
+    # Interview scheduling settings
+    INTERVIEW_BULK_MAX_ITEMS: int = 200
+    INTERVIEW_EMAIL_CONCURRENCY: int = 4  # LLM-written invitations generated at once per bulk request
+    INTERVIEW_SLOT_GRANULARITY_MINUTES: int = 15
+    INTERVIEW_WORKDAY_START_HOUR: int = 9  # UTC
+    INTERVIEW_WORKDAY_END_HOUR: int = 17  # UTC
+    INTERVIEW_SLOT_SEARCH_DAYS: int = 60
+    
+    # Outbox settings
+    OUTBOX_BATCH_SIZE: int = 50
+    OUTBOX_MAX_ATTEMPTS: int = 5
+    OUTBOX_RETRY_BACKOFF_SECONDS: float = 30.0  # Doubles after each failed attempt
+    OUTBOX_POLL_SECONDS: float = 5.0
     
     class Config:
         env_file = ".env"
@@ -1,23 +1,86 @@
-from sqlalchemy import create_engine
+from contextlib import asynccontextmanager
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+import asyncio
 import os
 
-# Create the database directory if it doesn't exist
-os.makedirs("data", exist_ok=True)
+from .config import settings
 
-# SQLite database URL
-SQLALCHEMY_DATABASE_URL = "sqlite:///data/jobspark.db"
+# Database URL comes from settings
+SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
+database_url = make_url(SQLALCHEMY_DATABASE_URL)
+is_sqlite = database_url.get_backend_name() == "sqlite"
+is_memory = is_sqlite and database_url.database in (None, "", ":memory:")
 
-# Create SQLite engine. Note: check_same_thread=False is needed for SQLite
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, 
-    connect_args={"check_same_thread": False}
-)
+# Async drivers for the same database
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql"
+}
+async_database_url = database_url
+if database_url.drivername in ASYNC_DRIVERS:
+    async_database_url = database_url.set(drivername=ASYNC_DRIVERS[database_url.drivername])
+
+engine_options = {}
+if not is_memory:
+    # Enough connections for every I/O worker thread plus a little headroom
+    engine_options.update(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS
+    )
+
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Apply production pragmas to every new SQLite connection"""
+    cursor = dbapi_connection.cursor()
+    # WAL lets readers run while a writer commits
+    cursor.execute("PRAGMA journal_mode=WAL")
+    # Safe against application crashes in WAL mode, with far fewer fsyncs
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+    # A negative cache_size is in KiB
+    cursor.execute(f"PRAGMA cache_size=-{int(settings.SQLITE_CACHE_SIZE_KB)}")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+if is_sqlite:
+    # Create the database directory if it doesn't exist
+    if not is_memory:
+        os.makedirs(os.path.dirname(database_url.database) or ".", exist_ok=True)
+
+    # Sessions are used from worker threads; timeout matches busy_timeout
+    sqlite_connect_args = {
+        "check_same_thread": False,
+        "timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000
+    }
+    engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args=sqlite_connect_args, **engine_options)
+    # aiosqlite defaults to NullPool for files; pool so pragmas and page cache are reused
+    async_pool = {"poolclass": AsyncAdaptedQueuePool} if not is_memory else {}
+    async_engine = create_async_engine(
+        async_database_url,
+        connect_args=sqlite_connect_args,
+        **async_pool,
+        **engine_options
+    )
+    event.listen(engine, "connect", set_sqlite_pragmas)
+    event.listen(async_engine.sync_engine, "connect", set_sqlite_pragmas)
+else:
+    engine = create_engine(SQLALCHEMY_DATABASE_URL, pool_pre_ping=True, **engine_options)
+    async_engine = create_async_engine(async_database_url, pool_pre_ping=True, **engine_options)
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async sessions; attributes stay loaded after commit since lazy loads cannot run there
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 # Create Base class
 Base = declarative_base()
 
@@ -27,4 +90,30 @@ def get_db():
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+# Async dependency to get DB session
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+# One async write transaction at a time when DB_SERIALIZE_WRITES is on
+write_lock = asyncio.Lock()
+
+@asynccontextmanager
+async def serialized_write():
+    """Hold the write lock, if enabled, from the first write to the commit"""
+    if not settings.DB_SERIALIZE_WRITES:
+        yield
+        return
+    async with write_lock:
+        yield
+
+def insert_ignoring_duplicates(table):
+    """INSERT that skips rows violating a unique constraint instead of failing"""
+    dialect = engine.dialect.name
+    if dialect == "sqlite":
+        return sqlite.insert(table).on_conflict_do_nothing()
+    if dialect == "postgresql":
+        return postgresql.insert(table).on_conflict_do_nothing()
+    return insert(table).prefix_with("IGNORE")
@@ -1,55 +1,41 @@
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from .config import settings
+from sqlalchemy.ext.asyncio import AsyncSession
+from . import models
+from .services.mail_outbox import mail_outbox
 
-async def send_email(
+def queue_email(
+    db: AsyncSession,
     recipient_email: str,
     subject: str,
     body: str,
     is_html: bool = False
-) -> bool:
+) -> models.OutboxMessage:
     """
-    Send an email using the configured SMTP settings.
-    
+    Queue an email in the outbox for the background sender.
+
+    The message is added to the caller's session and is only sent once the
+    caller commits; call ``mail_outbox.wake()`` after the commit to send it
+    without waiting for the next poll.
+
     Args:
+        db: The session whose transaction the message joins
         recipient_email: The email address of the recipient
         subject: The subject of the email
         body: The body content of the email
         is_html: Whether the body content is HTML (default: False)
-    
+
     Returns:
-        bool: True if the email was sent successfully, False otherwise
+        models.OutboxMessage: The queued outbox row
     """
-    # Check if SMTP settings are configured
-    if not settings.SMTP_USERNAME or not settings.SMTP_PASSWORD:
-        print("SMTP settings not configured. Email not sent.")
-        return False
-    
-    try:
-        # Create message
-        msg = MIMEMultipart()
-        msg['From'] = settings.SMTP_USERNAME
-        msg['To'] = recipient_email
-        msg['Subject'] = subject
-        
-        # Attach body
-        content_type = 'html' if is_html else 'plain'
-        msg.attach(MIMEText(body, content_type))
-        
-        # Connect to SMTP server and send email
-        with smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT) as server:
-            server.starttls()  # Enable TLS
-            server.login(settings.SMTP_USERNAME, settings.SMTP_PASSWORD)
-            server.send_message(msg)
-        
-        return True
-    
-    except Exception as e:
-        print(f"Error sending email: {str(e)}")
-        return False
+    return mail_outbox.add(
+        db,
+        recipient=recipient_email,
+        subject=subject,
+        body=body,
+        is_html=is_html
+    )
 
-async def send_interview_invitation(
+def queue_interview_invitation(
+    db: AsyncSession,
     candidate_email: str,
     candidate_name: str,
     job_title: str,
@@ -57,11 +43,12 @@ async def send_interview_invitation(
     interview_time: str,
     interview_type: str,
     email_content: str
-) -> bool:
+) -> models.OutboxMessage:
     """
-    Send an interview invitation email to a candidate.
-    
+    Queue an interview invitation email to a candidate.
+
     Args:
+        db: The session whose transaction the message joins
         candidate_email: The email address of the candidate
         candidate_name: The name of the candidate
         job_title: The title of the job
@@ -69,12 +56,12 @@ async def send_interview_invitation(
         interview_time: The scheduled interview time
         interview_type: The type of interview (e.g., "video", "in-person")
         email_content: The pre-generated email content
-    
+
     Returns:
-        bool: True if the email was sent successfully, False otherwise
+        models.OutboxMessage: The queued outbox row
     """
     subject = f"Interview Invitation: {job_title} at {company_name}"
-    
+
     # If email_content is not provided, generate a default one
     if not email_content:
         email_content = f"""
@@ -92,10 +79,11 @@ async def send_interview_invitation(
         </body>
         </html>
         """
-    
-    return await send_email(
+
+    return queue_email(
+        db,
         recipient_email=candidate_email,
         subject=subject,
         body=email_content,
         is_html=True
-    ) 
\ No newline at end of file
+    )
\ No newline at end of file
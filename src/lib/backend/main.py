@@ -1,24 +1,48 @@
-from fastapi import FastAPI, Depends, HTTPException, status, File, UploadFile, BackgroundTasks
+from fastapi import FastAPI, Depends, HTTPException, status, File, UploadFile, BackgroundTasks, Query
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from datetime import datetime, timedelta
-import json
+import asyncio
 import os
 import uvicorn
 import uuid
 
 from . import models, auth, schemas
-from .database import engine, get_db
+from .database import engine, async_engine, get_async_db, SessionLocal, AsyncSessionLocal, serialized_write
+from .migrations import run_migrations
 from .agents import JDAgent, ResumeAgent, MatchingAgent, InterviewSchedulerAgent
 from .config import settings
-from .email import send_interview_invitation
+from .email import queue_interview_invitation
 from .services.cv_processor import CVProcessor
 from .services.matcher import Matcher
 from .services.database import DatabaseService
+from .services.candidate_retriever import CandidateRetriever
+from .services.bulk_matcher import BulkMatcher
+from .services.analysis_queue import AnalysisQueue
+from .services.model_registry import model_registry
+from .services.executor import executor
+from .services.embedding_batcher import embedding_batcher
+from .services.uploads import spool_upload, UploadTooLarge
+from .services.resume_store import ResumeStore
+from .services.llm_cache import llm_cache
+from .services.llm_client import llm_client
+from .services.user_cache import user_cache
+from .services.password_hasher import password_hasher, HasherBusy
+from .services.mail_outbox import mail_outbox
+from .services.interview_slots import interview_slots, SlotConflict
+from .services.admin_stats import admin_stats
+from .services.pagination import InvalidCursor, InvalidFields, select_fields, keyset_page_query, stream_json_page
+from .services.skills import skill_filter
 
-# Create database tables
+# Load models in this process before any worker fork so their pages are shared
+if settings.PRELOAD_MODELS:
+    model_registry.preload()
+
+# Create database tables, then bring existing ones up to date
 models.Base.metadata.create_all(bind=engine)
+run_migrations(engine)
 
 app = FastAPI(
     title="JobSpark API",
@@ -30,6 +54,13 @@ app = FastAPI(
 cv_processor = CVProcessor()
 matcher = Matcher()
 db_service = DatabaseService()
+candidate_retriever = CandidateRetriever(matcher)
+bulk_matcher = BulkMatcher(matcher)
+resume_store = ResumeStore(os.path.join(settings.UPLOAD_DIR, "store"))
+analysis_queue = AnalysisQueue(
+    workers=settings.ANALYSIS_WORKERS,
+    max_attempts=settings.ANALYSIS_MAX_ATTEMPTS
+)
 
 # Configure CORS
 app.add_middleware(
@@ -41,21 +72,73 @@ app.add_middleware(
 )
 
 # Ensure uploads directory exists
-os.makedirs("uploads", exist_ok=True)
+os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
+
+interview_slots_loader: Optional[asyncio.Task] = None
+
+async def load_interview_slots() -> None:
+    try:
+        async with AsyncSessionLocal() as db:
+            rows = await interview_slots.refresh(db)
+        print(f"Loaded {rows} interviews into the slot index")
+    except Exception as e:
+        print(f"Error loading interview slot index: {str(e)}")
+
+@app.on_event("startup")
+async def start_background_workers():
+    if settings.WARM_UP_MODELS:
+        await executor.run_io(model_registry.warm_up)
+    if settings.EMBEDDING_BATCHING_ENABLED:
+        await embedding_batcher.start()
+    await analysis_queue.start()
+    # Load the interview slot index in the background; bookings that arrive first
+    # wait for it before taking the write lock, and later refreshes read only changed rows
+    global interview_slots_loader
+    interview_slots_loader = asyncio.create_task(load_interview_slots())
+    await mail_outbox.start()
+    await admin_stats.start()
+
+@app.on_event("shutdown")
+async def stop_background_workers():
+    await analysis_queue.stop()
+    await mail_outbox.stop()
+    await admin_stats.stop()
+    if interview_slots_loader is not None:
+        interview_slots_loader.cancel()
+        await asyncio.gather(interview_slots_loader, return_exceptions=True)
+    await embedding_batcher.stop()
+    # Pooled aiosqlite connections each hold a thread until disposed
+    await async_engine.dispose()
+    executor.shutdown()
+    password_hasher.shutdown()
+
+async def run_password_hasher(call):
+    """Await a password hash or check, shedding load when the hasher is saturated"""
+    try:
+        return await call
+    except HasherBusy as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"}
+        )
 
 # Authentication routes
 @app.post("/token")
-async def login(email: str, password: str, db: Session = Depends(get_db)):
-    user = db.query(models.User).filter(models.User.email == email).first()
-    if not user or not auth.verify_password(password, user.hashed_password):
+async def login(email: str, password: str, db: AsyncSession = Depends(get_async_db)):
+    user = await db_service.get_user_by_email(db, email)
+    if not user or not await run_password_hasher(password_hasher.verify(password, user.hashed_password)):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    claims = {"sub": str(user.id)}
+    if settings.JWT_USER_CLAIMS:
+        claims.update(auth.user_claims(user))
     access_token = auth.create_access_token(
-        data={"sub": str(user.id)},
+        data=claims,
         expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     )
     return {"access_token": access_token, "token_type": "bearer"}
@@ -66,52 +149,101 @@ async def register(
     password: str,
     full_name: str,
     role: models.UserRole,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     # Check if user exists
-    if db.query(models.User).filter(models.User.email == email).first():
+    if await db_service.get_user_by_email(db, email):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
     # Create new user
-    hashed_password = auth.get_password_hash(password)
+    hashed_password = await run_password_hasher(password_hasher.hash(password))
     user = models.User(
         email=email,
         hashed_password=hashed_password,
         full_name=full_name,
         role=role
     )
-    db.add(user)
-    db.commit()
-    db.refresh(user)
+    async with serialized_write():
+        db.add(user)
+        await db.commit()
     
     return {"message": "User created successfully"}
 
 # Job Posting routes
+# Summaries attached after the response; referenced here so they are not garbage collected
+summary_tasks = set()
+
+async def attach_job_summary(job_id: str, summary_task: "asyncio.Task") -> None:
+    """Store the AI summary for a job posting once the LLM call finishes"""
+    try:
+        async with AsyncSessionLocal() as db:
+            try:
+                jd_summary = await summary_task
+            except Exception as e:
+                await db_service.save_job_summary(db, job_id, status="failed", error=str(e))
+                return
+            await db_service.save_job_summary(db, job_id, status="completed", summary=jd_summary["summary"])
+    except Exception as e:
+        print(f"Error attaching summary to job {job_id}: {str(e)}")
+
 @app.post("/job-postings")
 async def create_job_posting(
     title: str,
     company: str,
     description: str,
     skills_required: List[str],
+    summarize_async: bool = False,
     current_user: models.User = Depends(auth.get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    # Process JD with AI
-    jd_summary = await JDAgent.summarize_jd(description)
-    extracted_skills = JDAgent.extract_skills(description)
+    # Start the LLM summary, then overlap skill extraction and the insert with it
+    summary_task = asyncio.create_task(JDAgent.summarize_jd(description))
+    try:
+        extracted_skills, job_posting = await asyncio.gather(
+            executor.run_cpu(JDAgent.extract_skills, description),
+            db_service.create_job_posting(
+                db=db,
+                user_id=current_user.id,
+                title=title,
+                company=company,
+                description=description,
+                skills_required=skills_required
+            )
+        )
+    except BaseException:
+        # No posting to attach it to; don't leave the LLM call running unobserved
+        summary_task.cancel()
+        await asyncio.gather(summary_task, return_exceptions=True)
+        raise
     
-    # Create job posting
-    job_posting = await db_service.create_job_posting(
-        db=db,
-        user_id=current_user.id,
-        title=title,
-        company=company,
-        description=description,
-        skills_required=skills_required
-    )
+    if summarize_async:
+        # Return now; the summary is attached when ready (GET /job-postings/{id}/summary)
+        await db_service.save_job_summary(db, job_posting.id, status="pending")
+        task = asyncio.create_task(attach_job_summary(job_posting.id, summary_task))
+        summary_tasks.add(task)
+        task.add_done_callback(summary_tasks.discard)
+        return {
+            "job_posting": job_posting,
+            "ai_summary": None,
+            "ai_summary_status": "pending",
+            "extracted_skills": extracted_skills
+        }
+    
+    try:
+        jd_summary = await summary_task
+    except Exception as e:
+        # The posting is already committed; record the failed summary instead of a 500
+        await db_service.save_job_summary(db, job_posting.id, status="failed", error=str(e))
+        return {
+            "job_posting": job_posting,
+            "ai_summary": None,
+            "ai_summary_status": "failed",
+            "extracted_skills": extracted_skills
+        }
+    await db_service.save_job_summary(db, job_posting.id, status="completed", summary=jd_summary["summary"])
     
     return {
         "job_posting": job_posting,
@@ -119,25 +251,68 @@ async def create_job_posting(
         "extracted_skills": extracted_skills
     }
 
+@app.get("/job-postings/{job_id}/summary")
+async def get_job_posting_summary(
+    job_id: str,
+    current_user: models.User = Depends(auth.get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    job_summary = await db_service.get_job_summary(db, job_id)
+    if not job_summary:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Summary not found"
+        )
+    return {
+        "job_id": job_id,
+        "status": job_summary.status,
+        "summary": job_summary.summary,
+        "error": job_summary.error
+    }
+
 # Resume routes
 @app.post("/resumes")
 async def upload_resume(
     file: UploadFile = File(...),
     current_user: models.User = Depends(auth.get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    # Save file
-    file_path = f"uploads/{current_user.id}_{file.filename}"
-    content = await file.read()
-    
-    with open(file_path, "wb") as buffer:
-        buffer.write(content)
-    
-    # Extract text from CV
-    cv_text = cv_processor.extract_text(content, file.content_type)
+    # Stream file to disk in chunks, enforcing the size cap
+    spooled_path = os.path.join(settings.UPLOAD_DIR, "incoming", uuid.uuid4().hex)
+    try:
+        size_bytes, sha256 = await spool_upload(
+            file,
+            spooled_path,
+            max_bytes=settings.MAX_UPLOAD_BYTES,
+            chunk_size=settings.UPLOAD_CHUNK_BYTES
+        )
+    except UploadTooLarge as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e)
+        )
     
-    # Parse resume with AI
-    parsed_data = await ResumeAgent.parse_resume(cv_text)
+    # Identical content reuses the stored file, extracted text and parsed output
+    file_path = await resume_store.store_file(spooled_path, sha256)
+    stored = await resume_store.lookup(db, sha256)
+    if stored:
+        cv_text = stored.extracted_text
+        parsed_data = stored.parsed_data
+    else:
+        # Extract text from CV
+        cv_text = await executor.run_io(cv_processor.extract_text_from_file, file_path, file.content_type)
+        
+        # Parse resume with AI
+        parsed_data = await ResumeAgent.parse_resume(cv_text)
+        await resume_store.save(
+            db,
+            sha256=sha256,
+            file_path=file_path,
+            file_type=file.content_type,
+            size_bytes=size_bytes,
+            extracted_text=cv_text,
+            parsed_data=parsed_data
+        )
     
     # Structure CV data
     structured_data = cv_processor.structure_cv_data(cv_text, parsed_data)
@@ -155,6 +330,7 @@ async def upload_resume(
         skills=structured_data["skills"],
         certifications=structured_data["certifications"]
     )
+    await executor.run_io(candidate_retriever.add_resume, resume)
     
     return {
         "resume": resume,
@@ -166,8 +342,9 @@ async def upload_resume(
 async def create_match(
     job_id: str,
     resume_id: str,
+    defer_analysis: Optional[bool] = None,
     current_user: models.User = Depends(auth.get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     # Get job and resume
     job = await db_service.get_job_posting(db, job_id)
@@ -180,21 +357,17 @@ async def create_match(
         )
     
     # Prepare data for matching
-    job_data = {
-        "title": job.title,
-        "description": job.description,
-        "skills_required": json.loads(job.skills_required)
-    }
+    job_data = Matcher.job_data_from_posting(job)
+    cv_data = Matcher.cv_data_from_resume(resume)
     
-    cv_data = {
-        "raw_text": resume.parsed_data,
-        "skills": json.loads(resume.skills),
-        "experience": json.loads(resume.experience),
-        "education": json.loads(resume.education)
-    }
+    if defer_analysis is None:
+        defer_analysis = settings.DEFER_MATCH_ANALYSIS
     
-    # Perform matching
-    match_result = await matcher.match_cv_with_job(job_data, cv_data)
+    # Perform matching; in deferred mode the LLM analysis is filled in by the queue
+    if defer_analysis:
+        match_result = await executor.run_io(matcher.score_cv_with_job, job_data, cv_data)
+    else:
+        match_result = await matcher.match_cv_with_job(job_data, cv_data)
     
     # Save match result
     match = await db_service.create_match(
@@ -205,22 +378,142 @@ async def create_match(
         match_details=match_result
     )
     
-    return {
+    response = {
         "match": match,
         "analysis": match_result
     }
+    if defer_analysis:
+        analysis_job = await analysis_queue.enqueue(db, match.id)
+        response["analysis_status"] = analysis_job.status
+    return response
+
+@app.get("/matches/{match_id}/analysis")
+async def get_match_analysis(
+    match_id: str,
+    current_user: models.User = Depends(auth.get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    match = await db_service.get_match(db, match_id)
+    if not match:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Match not found"
+        )
+    
+    details = match.match_details or {}
+    job_status = await analysis_queue.get_status(db, match_id)
+    return {
+        "match_id": match_id,
+        # Matches created synchronously never had a queued job
+        "status": job_status["status"] if job_status else "completed",
+        "job": job_status,
+        "analysis": details.get("analysis", "")
+    }
+
+def run_bulk_match(job_id: str):
+    """Background task: score a job against every resume with its own session"""
+    db = SessionLocal()
+    try:
+        job = db.query(models.JobPosting).filter(models.JobPosting.id == job_id).first()
+        if job:
+            result = bulk_matcher.match_job(db, job)
+            print(f"Bulk match for job {job_id} created {result['matches_created']} matches")
+    except Exception as e:
+        print(f"Error in bulk match for job {job_id}: {str(e)}")
+    finally:
+        db.close()
+
+@app.post("/jobs/{job_id}/match-all", status_code=status.HTTP_202_ACCEPTED)
+async def match_job_with_all_resumes(
+    job_id: str,
+    background_tasks: BackgroundTasks,
+    current_user: models.User = Depends(auth.get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    job = await db_service.get_job_posting(db, job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    
+    background_tasks.add_task(run_bulk_match, job_id)
+    return {"job_id": job_id, "status": "queued"}
+
+def rank_candidates(job: models.JobPosting, k: int):
+    """Shortlist and score candidates on an I/O thread with its own session"""
+    db = SessionLocal()
+    try:
+        return candidate_retriever.rank_candidates(db, job, k)
+    finally:
+        db.close()
+
+@app.get("/jobs/{job_id}/candidates")
+async def get_top_candidates(
+    job_id: str,
+    k: int = 10,
+    current_user: models.User = Depends(auth.get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    job = await db_service.get_job_posting(db, job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    if k < 1 or k > 500:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="k must be between 1 and 500"
+        )
+    
+    # Shortlist with the ANN index, then run detailed scoring only on the shortlist
+    candidates = await executor.run_io(rank_candidates, job, k)
+    return {"job_id": job_id, "candidates": candidates}
 
 @app.get("/shortlist")
 async def get_shortlisted_candidates(
     job_id: str,
     min_score: float = 70.0,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    include_details: bool = False,
     current_user: models.User = Depends(auth.get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    shortlisted = await db_service.get_shortlisted_candidates(db, job_id, min_score)
-    return {"shortlisted": shortlisted}
+    if limit < 1 or limit > 500:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="limit must be between 1 and 500"
+        )
+    try:
+        return await db_service.get_shortlisted_candidates(
+            db, job_id, min_score, limit=limit, cursor=cursor, include_details=include_details
+        )
+    except InvalidCursor as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
 
 # Interview routes
+def slot_conflict_error(e: SlotConflict) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail={"message": str(e), "conflicts": e.conflicts}
+    )
+
+async def get_participants(db: AsyncSession, match_id: str):
+    """Interviewer and candidate for a match, with the slot index brought up to date"""
+    participants = (await db_service.get_interview_participants(db, [match_id])).get(match_id)
+    if not participants:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Match not found"
+        )
+    await interview_slots.refresh(db)
+    return participants
+
 @app.post("/interviews")
 async def schedule_interview(
     match_id: str,
@@ -228,7 +521,7 @@ async def schedule_interview(
     duration_minutes: int,
     interview_type: str,
     current_user: models.User = Depends(auth.get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     # Get match and related data
     match = await db_service.get_match(db, match_id)
@@ -238,10 +531,17 @@ async def schedule_interview(
             detail="Match not found"
         )
     
+    # Reject double bookings before spending an LLM call on the invitation
+    conflicts = interview_slots.conflicts(
+        *await get_participants(db, match_id), scheduled_time, duration_minutes
+    )
+    if conflicts:
+        raise slot_conflict_error(SlotConflict(conflicts))
+    
     # Get resume and job details
     resume = await db_service.get_resume(db, match.resume_id)
     job = await db_service.get_job_posting(db, match.job_id)
-    candidate = db.query(models.User).filter(models.User.id == resume.user_id).first()
+    candidate = await db_service.get_user(db, resume.user_id)
     
     # Generate interview email
     email_content = await InterviewSchedulerAgent.generate_interview_email(
@@ -252,8 +552,9 @@ async def schedule_interview(
         interview_type=interview_type
     )
     
-    # Send interview invitation email
-    email_sent = await send_interview_invitation(
+    # Queue the invitation; it commits together with the interview below
+    outbox_message = queue_interview_invitation(
+        db,
         candidate_email=candidate.email,
         candidate_name=candidate.full_name,
         job_title=job.title,
@@ -263,59 +564,230 @@ async def schedule_interview(
         email_content=email_content
     )
     
-    # Create interview record
-    interview = await db_service.create_interview(
-        db=db,
-        match_id=match_id,
-        scheduled_time=scheduled_time,
-        duration_minutes=duration_minutes,
-        interview_type=interview_type
-    )
+    # Create interview record; the booking is re-checked under the write lock
+    try:
+        interview = await db_service.create_interview(
+            db=db,
+            match_id=match_id,
+            scheduled_time=scheduled_time,
+            duration_minutes=duration_minutes,
+            interview_type=interview_type
+        )
+    except SlotConflict as e:
+        raise slot_conflict_error(e)
     
     # Update match status
     await db_service.update_match_status(db, match_id, "interviewing")
+    mail_outbox.wake()
     
     return {
         "interview": interview,
         "email_content": email_content,
-        "email_sent": email_sent
+        "email_id": outbox_message.id,
+        "email_status": outbox_message.status
+    }
+
+@app.post("/interviews/bulk")
+async def schedule_interviews_bulk(
+    request: schemas.BulkInterviewCreate,
+    current_user: models.User = Depends(auth.get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    slots = request.interviews
+    if not slots:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No interviews given"
+        )
+    if len(slots) > settings.INTERVIEW_BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.INTERVIEW_BULK_MAX_ITEMS} interviews per request"
+        )
+    
+    match_ids = list({slot.match_id for slot in slots})
+    details = await db_service.get_invitation_details(db, match_ids)
+    missing = [match_id for match_id in match_ids if match_id not in details]
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Matches not found: {', '.join(missing)}"
+        )
+    
+    # Template invitations unless LLM-written ones were asked for
+    contents = [""] * len(slots)
+    llm_failures = 0
+    if request.generate_emails:
+        semaphore = asyncio.Semaphore(settings.INTERVIEW_EMAIL_CONCURRENCY)
+        
+        async def generate(slot: schemas.InterviewCreate) -> str:
+            nonlocal llm_failures
+            row = details[slot.match_id]
+            async with semaphore:
+                try:
+                    return await InterviewSchedulerAgent.generate_interview_email(
+                        candidate_name=row.full_name,
+                        job_title=row.title,
+                        company_name=row.company,
+                        interview_time=slot.scheduled_time.isoformat(),
+                        interview_type=slot.interview_type
+                    )
+                except Exception as e:
+                    print(f"Error generating interview email for match {slot.match_id}: {str(e)}")
+                    llm_failures += 1
+                    return ""
+        
+        contents = await asyncio.gather(*(generate(slot) for slot in slots))
+    
+    # Invitations join the interviews' transaction
+    for slot, content in zip(slots, contents):
+        row = details[slot.match_id]
+        queue_interview_invitation(
+            db,
+            candidate_email=row.email,
+            candidate_name=row.full_name,
+            job_title=row.title,
+            company_name=row.company,
+            interview_time=slot.scheduled_time.isoformat(),
+            interview_type=slot.interview_type,
+            email_content=content
+        )
+    try:
+        interviews = await db_service.create_interviews(db, [slot.model_dump() for slot in slots])
+    except SlotConflict as e:
+        raise slot_conflict_error(e)
+    mail_outbox.wake()
+    
+    return {
+        "interviews": [schemas.Interview.model_validate(interview) for interview in interviews],
+        "emails_queued": len(slots),
+        "emails_generated": len(slots) - llm_failures if request.generate_emails else 0
+    }
+
+@app.get("/interviews/free-slots")
+async def get_free_slots(
+    match_id: str,
+    duration_minutes: int = 30,
+    after: Optional[datetime] = None,
+    count: int = 5,
+    current_user: models.User = Depends(auth.get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    if not 1 <= count <= 50:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="count must be between 1 and 50"
+        )
+    interviewer_id, candidate_id = await get_participants(db, match_id)
+    return {
+        "match_id": match_id,
+        "duration_minutes": duration_minutes,
+        "slots": interview_slots.free_slots(
+            interviewer_id, candidate_id, duration_minutes, after or datetime.utcnow(), count
+        )
+    }
+
+@app.get("/interviews/conflicts")
+async def get_slot_conflicts(
+    match_id: str,
+    scheduled_time: datetime,
+    duration_minutes: int = 30,
+    current_user: models.User = Depends(auth.get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    interviewer_id, candidate_id = await get_participants(db, match_id)
+    return {
+        "match_id": match_id,
+        "conflicts": interview_slots.conflicts(interviewer_id, candidate_id, scheduled_time, duration_minutes)
     }
 
 # Admin routes
 @app.get("/admin/stats")
 async def get_admin_stats(
     current_user: models.User = Depends(auth.check_admin_role),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     return await db_service.get_admin_stats(db)
 
+@app.get("/admin/stats/daily")
+async def get_daily_stats(
+    days: int = 30,
+    current_user: models.User = Depends(auth.check_admin_role),
+    db: AsyncSession = Depends(get_async_db)
+):
+    if not 1 <= days <= settings.ADMIN_STATS_MAX_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"days must be between 1 and {settings.ADMIN_STATS_MAX_DAYS}"
+        )
+    return {"days": await db_service.get_daily_stats(db, days)}
+
+@app.get("/admin/models")
+async def get_model_stats(
+    current_user: models.User = Depends(auth.check_admin_role)
+):
+    return {
+        **model_registry.stats(),
+        "embedding_cache": matcher.embeddings.stats(),
+        "executor": executor.stats(),
+        "resume_store": resume_store.stats(),
+        "llm_cache": llm_cache.stats(),
+        "llm_client": llm_client.stats(),
+        "embedding_batcher": embedding_batcher.stats(),
+        "auth_user_cache": user_cache.stats(),
+        "password_hasher": password_hasher.stats(),
+        "mail_outbox": mail_outbox.stats(),
+        "interview_slots": interview_slots.stats(),
+        "admin_stats": admin_stats.stats()
+    }
+
 @app.get("/")
 def read_root():
     return {"message": "Welcome to JobSpark API"}
 
+async def stream_list(model, schema, limit: int, cursor: Optional[str], fields: Optional[str], *filters) -> StreamingResponse:
+    """Keyset-paginated, projected list streamed as {"items": [...], "next_cursor": ...}"""
+    if limit < 1 or limit > 500:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="limit must be between 1 and 500"
+        )
+    try:
+        names = select_fields(fields, list(schema.model_fields))
+        query = keyset_page_query(model, names, limit, cursor, *filters)
+    except (InvalidCursor, InvalidFields) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    # Awaiting runs the query first, so database errors still get a 500 rather than a cut-off 200
+    return StreamingResponse(
+        await stream_json_page(AsyncSessionLocal, query, names, limit),
+        media_type="application/json"
+    )
+
 @app.post("/users/", response_model=schemas.User)
-async def create_user(user: schemas.UserCreate, db: Session = Depends(get_db)):
+async def create_user(user: schemas.UserCreate, db: AsyncSession = Depends(get_async_db)):
     db_user = models.User(
         id=str(uuid.uuid4()),
         email=user.email,
-        hashed_password=user.password,  # Note: In production, hash the password!
+        hashed_password=await run_password_hasher(password_hasher.hash(user.password)),
         full_name=user.full_name,
         role=user.role
     )
-    db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    async with serialized_write():
+        db.add(db_user)
+        await db.commit()
     return db_user
 
-@app.get("/users/", response_model=List[schemas.User])
-async def get_users(skip: int = 0, limit: int = 10, db: Session = Depends(get_db)):
-    users = db.query(models.User).offset(skip).limit(limit).all()
-    return users
+@app.get("/users/")
+async def get_users(limit: int = 10, cursor: Optional[str] = None, fields: Optional[str] = None):
+    return await stream_list(models.User, schemas.User, limit, cursor, fields)
 
 @app.post("/job-postings/", response_model=schemas.JobPosting)
 async def create_job_posting_schema(
     job: schemas.JobPostingCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     return await db_service.create_job_posting(
         db,
@@ -326,15 +798,23 @@ async def create_job_posting_schema(
         skills_required=job.skills_required
     )
 
-@app.get("/job-postings/", response_model=List[schemas.JobPosting])
-async def get_job_postings_schema(skip: int = 0, limit: int = 10, db: Session = Depends(get_db)):
-    jobs = db.query(models.JobPosting).offset(skip).limit(limit).all()
-    return jobs
+@app.get("/job-postings/")
+async def get_job_postings_schema(
+    limit: int = 10,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    skills: Optional[List[str]] = Query(None),
+    match_all_skills: bool = True
+):
+    filters = []
+    if skills:
+        filters.append(skill_filter(models.JobPostingSkill, models.JobPosting.id, skills, match_all_skills))
+    return await stream_list(models.JobPosting, schemas.JobPosting, limit, cursor, fields, *filters)
 
 @app.post("/resumes/", response_model=schemas.Resume)
 async def create_resume_schema(
     resume: schemas.ResumeCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     # Process the resume file and extract information
     parsed_data = await cv_processor.process_resume(resume.file_path)
@@ -352,15 +832,23 @@ async def create_resume_schema(
         certifications=parsed_data.get("certifications", [])
     )
 
-@app.get("/resumes/", response_model=List[schemas.Resume])
-async def get_resumes_schema(skip: int = 0, limit: int = 10, db: Session = Depends(get_db)):
-    resumes = db.query(models.Resume).offset(skip).limit(limit).all()
-    return resumes
+@app.get("/resumes/")
+async def get_resumes_schema(
+    limit: int = 10,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    skills: Optional[List[str]] = Query(None),
+    match_all_skills: bool = True
+):
+    filters = []
+    if skills:
+        filters.append(skill_filter(models.ResumeSkill, models.Resume.id, skills, match_all_skills))
+    return await stream_list(models.Resume, schemas.Resume, limit, cursor, fields, *filters)
 
 @app.post("/matches/", response_model=schemas.Match)
 async def create_match_schema(
     match: schemas.MatchCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     # Get job posting and resume
     job_posting = await db_service.get_job_posting(db, match.job_id)
@@ -380,28 +868,29 @@ async def create_match_schema(
         match_details=match_details
     )
 
-@app.get("/matches/", response_model=List[schemas.Match])
-async def get_matches_schema(skip: int = 0, limit: int = 10, db: Session = Depends(get_db)):
-    matches = db.query(models.Match).offset(skip).limit(limit).all()
-    return matches
+@app.get("/matches/")
+async def get_matches_schema(limit: int = 10, cursor: Optional[str] = None, fields: Optional[str] = None):
+    return await stream_list(models.Match, schemas.Match, limit, cursor, fields)
 
 @app.post("/interviews/", response_model=schemas.Interview)
 async def create_interview_schema(
     interview: schemas.InterviewCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    return await db_service.create_interview(
-        db,
-        match_id=interview.match_id,
-        scheduled_time=interview.scheduled_time,
-        duration_minutes=interview.duration_minutes,
-        interview_type=interview.interview_type
-    )
+    try:
+        return await db_service.create_interview(
+            db,
+            match_id=interview.match_id,
+            scheduled_time=interview.scheduled_time,
+            duration_minutes=interview.duration_minutes,
+            interview_type=interview.interview_type
+        )
+    except SlotConflict as e:
+        raise slot_conflict_error(e)
 
-@app.get("/interviews/", response_model=List[schemas.Interview])
-async def get_interviews_schema(skip: int = 0, limit: int = 10, db: Session = Depends(get_db)):
-    interviews = db.query(models.Interview).offset(skip).limit(limit).all()
-    return interviews
+@app.get("/interviews/")
+async def get_interviews_schema(limit: int = 10, cursor: Optional[str] = None, fields: Optional[str] = None):
+    return await stream_list(models.Interview, schemas.Interview, limit, cursor, fields)
 
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
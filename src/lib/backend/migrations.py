@@ -0,0 +1,142 @@
+from typing import Callable, Dict, List, Tuple
+from datetime import datetime
+import json
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from .services.skills import unique_skills
+
+# Versioned schema changes for databases created before a model change.
+# create_all only creates missing tables, so anything that alters an existing
+# table (new indexes, backfills) is added here and applied once, in order.
+
+def _add_lookup_indexes(conn: Connection) -> None:
+    """Indexes for shortlist, listing and interview lookups; one match per (job, resume)"""
+    # Collapse duplicate matches onto the newest row before adding the unique index
+    conn.execute(text(
+        "CREATE TEMPORARY TABLE match_duplicates AS "
+        "SELECT id, FIRST_VALUE(id) OVER ("
+        "PARTITION BY job_id, resume_id ORDER BY created_at DESC, id DESC"
+        ") AS keep_id FROM matches"
+    ))
+    conn.execute(text("DELETE FROM match_duplicates WHERE id = keep_id"))
+    for table in ("interviews", "analysis_jobs"):
+        conn.execute(text(
+            f"UPDATE {table} SET match_id = ("
+            "SELECT keep_id FROM match_duplicates WHERE match_duplicates.id = match_id"
+            ") WHERE match_id IN (SELECT id FROM match_duplicates)"
+        ))
+    conn.execute(text("DELETE FROM matches WHERE id IN (SELECT id FROM match_duplicates)"))
+    conn.execute(text("DROP TABLE match_duplicates"))
+
+    for statement in (
+        "CREATE INDEX IF NOT EXISTS ix_matches_job_id_match_score ON matches (job_id, match_score)",
+        "CREATE INDEX IF NOT EXISTS ix_matches_resume_id ON matches (resume_id)",
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_matches_job_id_resume_id ON matches (job_id, resume_id)",
+        "CREATE INDEX IF NOT EXISTS ix_resumes_user_id ON resumes (user_id)",
+        "CREATE INDEX IF NOT EXISTS ix_job_postings_user_id ON job_postings (user_id)",
+        "CREATE INDEX IF NOT EXISTS ix_interviews_match_id ON interviews (match_id)",
+    ):
+        conn.execute(text(statement))
+
+JSON_COLUMNS = [
+    ("job_postings", "skills_required"),
+    ("resumes", "parsed_data"),
+    ("resumes", "education"),
+    ("resumes", "experience"),
+    ("resumes", "skills"),
+    ("resumes", "certifications"),
+    ("matches", "match_details"),
+    ("resume_contents", "parsed_data"),
+]
+
+def _normalize_skills(conn: Connection) -> None:
+    """JSON column types and the skill dictionary backfilled from existing rows"""
+    # SQLite keeps JSON as text, which is what these columns already hold
+    if conn.dialect.name == "postgresql":
+        for table, column in JSON_COLUMNS:
+            conn.execute(text(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE JSON USING {column}::json"))
+
+    # skills and the join tables are created by create_all before migrations run
+    skill_ids: Dict[str, int] = {
+        name: skill_id for skill_id, name in conn.execute(text("SELECT id, name FROM skills"))
+    }
+    for table, column, link_table, owner_column in (
+        ("job_postings", "skills_required", "job_posting_skills", "job_id"),
+        ("resumes", "skills", "resume_skills", "resume_id"),
+    ):
+        links = []
+        for owner_id, raw in conn.execute(text(f"SELECT id, {column} FROM {table} WHERE {column} IS NOT NULL")).all():
+            try:
+                skills = json.loads(raw) if isinstance(raw, str) else raw
+            except ValueError:
+                continue
+            if not isinstance(skills, list):
+                continue
+            links.extend((owner_id, name, position) for position, name in enumerate(unique_skills(skills)))
+
+        missing = sorted({name for _, name, _ in links} - skill_ids.keys())
+        if missing:
+            now = datetime.utcnow()
+            conn.execute(
+                text("INSERT INTO skills (name, created_at) VALUES (:name, :created_at)"),
+                [{"name": name, "created_at": now} for name in missing]
+            )
+            skill_ids.update(
+                (name, skill_id) for skill_id, name in conn.execute(text("SELECT id, name FROM skills"))
+            )
+
+        conn.execute(text(f"DELETE FROM {link_table}"))
+        if links:
+            conn.execute(
+                text(
+                    f"INSERT INTO {link_table} ({owner_column}, skill_id, position) "
+                    "VALUES (:owner_id, :skill_id, :position)"
+                ),
+                [
+                    {"owner_id": owner_id, "skill_id": skill_ids[name], "position": position}
+                    for owner_id, name, position in links
+                ]
+            )
+
+def _add_keyset_indexes(conn: Connection) -> None:
+    """(created_at, id) indexes for keyset-paginated list endpoints"""
+    for table in ("users", "job_postings", "resumes", "matches", "interviews"):
+        conn.execute(text(f"CREATE INDEX IF NOT EXISTS ix_{table}_created_at_id ON {table} (created_at, id)"))
+
+def _add_interview_updated_at_index(conn: Connection) -> None:
+    """updated_at index for incremental loads of the interview slot index"""
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_interviews_updated_at ON interviews (updated_at)"))
+
+MIGRATIONS: List[Tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "lookup indexes and unique (job_id, resume_id) on matches", _add_lookup_indexes),
+    (2, "JSON columns and normalized skills for job postings and resumes", _normalize_skills),
+    (3, "(created_at, id) indexes for list pagination", _add_keyset_indexes),
+    (4, "updated_at index on interviews for the slot index", _add_interview_updated_at_index),
+]
+
+def run_migrations(engine: Engine) -> List[int]:
+    """Apply pending migrations in order; returns the versions applied"""
+    applied = []
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE IF NOT EXISTS schema_migrations ("
+            "version INTEGER PRIMARY KEY, description VARCHAR, applied_at DATETIME)"
+        ))
+        done = {row[0] for row in conn.execute(text("SELECT version FROM schema_migrations"))}
+
+    for version, description, migrate in MIGRATIONS:
+        if version in done:
+            continue
+        # Each migration commits or rolls back as a unit
+        with engine.begin() as conn:
+            migrate(conn)
+            conn.execute(
+                text(
+                    "INSERT INTO schema_migrations (version, description, applied_at) "
+                    "VALUES (:version, :description, :applied_at)"
+                ),
+                {"version": version, "description": description, "applied_at": datetime.utcnow()}
+            )
+        applied.append(version)
+        print(f"Applied migration {version}: {description}")
+    return applied
@@ -1,5 +1,5 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy import Boolean, Column, Integer, String, Float, Date, DateTime, ForeignKey, Enum, Text, Index, JSON
+from sqlalchemy.orm import deferred, relationship, synonym
 from datetime import datetime
 import enum
 import uuid
@@ -25,6 +25,11 @@ class User(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    __table_args__ = (
+        # Keyset pagination for list endpoints
+        Index("ix_users_created_at_id", "created_at", "id"),
+    )
+
     # Relationships
     job_postings = relationship("JobPosting", back_populates="user", cascade="all, delete-orphan")
     resumes = relationship("Resume", back_populates="user", cascade="all, delete-orphan")
@@ -37,13 +42,33 @@ class JobPosting(Base):
     title = Column(String)
     company = Column(String)
     description = Column(Text)
-    skills_required = Column(Text)  # JSON string
+    skills_required = Column(JSON)  # Ordered list; also linked through job_posting_skills
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    __table_args__ = (
+        Index("ix_job_postings_user_id", "user_id"),
+        Index("ix_job_postings_created_at_id", "created_at", "id"),
+    )
+
     # Relationships
     user = relationship("User", back_populates="job_postings")
     matches = relationship("Match", back_populates="job_posting", cascade="all, delete-orphan")
+    summary = relationship("JobPostingSummary", back_populates="job_posting", uselist=False, cascade="all, delete-orphan")
+    skill_links = relationship("JobPostingSkill", back_populates="job_posting", cascade="all, delete-orphan")
+
+class JobPostingSummary(Base):
+    __tablename__ = "job_posting_summaries"
+
+    job_id = Column(String, ForeignKey("job_postings.id", ondelete="CASCADE"), primary_key=True)
+    status = Column(String)  # pending, completed, failed
+    summary = Column(Text)
+    error = Column(Text)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Relationships
+    job_posting = relationship("JobPosting", back_populates="summary")
 
 class Resume(Base):
     __tablename__ = "resumes"
@@ -53,17 +78,24 @@ class Resume(Base):
     file_path = Column(String)
     file_name = Column(String)
     file_type = Column(String)
-    parsed_data = Column(Text)  # JSON string
-    education = Column(Text)    # JSON string
-    experience = Column(Text)   # JSON string
-    skills = Column(Text)       # JSON string
-    certifications = Column(Text)  # JSON string
+    # Large documents are only loaded (and decoded) when asked for: undefer_group("details")
+    parsed_data = deferred(Column(JSON), group="details")
+    education = deferred(Column(JSON), group="details")
+    experience = deferred(Column(JSON), group="details")
+    skills = Column(JSON)  # Ordered list; also linked through resume_skills
+    certifications = deferred(Column(JSON), group="details")
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    __table_args__ = (
+        Index("ix_resumes_user_id", "user_id"),
+        Index("ix_resumes_created_at_id", "created_at", "id"),
+    )
+
     # Relationships
     user = relationship("User", back_populates="resumes")
     matches = relationship("Match", back_populates="resume", cascade="all, delete-orphan")
+    skill_links = relationship("ResumeSkill", back_populates="resume", cascade="all, delete-orphan")
 
 class Match(Base):
     __tablename__ = "matches"
@@ -72,15 +104,25 @@ class Match(Base):
     job_id = Column(String, ForeignKey("job_postings.id", ondelete="CASCADE"))
     resume_id = Column(String, ForeignKey("resumes.id", ondelete="CASCADE"))
     match_score = Column(Float)
-    match_details = Column(Text)  # JSON string
+    match_details = deferred(Column(JSON), group="details")
     status = Column(String)  # pending, shortlisted, rejected, interviewing, hired
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    __table_args__ = (
+        # Shortlist: filter by job, order by score
+        Index("ix_matches_job_id_match_score", "job_id", "match_score"),
+        Index("ix_matches_resume_id", "resume_id"),
+        # One match per (job, resume) pair
+        Index("uq_matches_job_id_resume_id", "job_id", "resume_id", unique=True),
+        Index("ix_matches_created_at_id", "created_at", "id"),
+    )
+
     # Relationships
     job_posting = relationship("JobPosting", back_populates="matches")
     resume = relationship("Resume", back_populates="matches")
     interviews = relationship("Interview", back_populates="match", cascade="all, delete-orphan")
+    analysis_jobs = relationship("AnalysisJob", back_populates="match", cascade="all, delete-orphan")
 
 class Interview(Base):
     __tablename__ = "interviews"
@@ -94,5 +136,118 @@ class Interview(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    __table_args__ = (
+        Index("ix_interviews_match_id", "match_id"),
+        Index("ix_interviews_created_at_id", "created_at", "id"),
+        # Incremental refresh of the slot index
+        Index("ix_interviews_updated_at", "updated_at"),
+    )
+
+    # Relationships
+    match = relationship("Match", back_populates="interviews") 
+
+class AnalysisJob(Base):
+    __tablename__ = "analysis_jobs"
+
+    id = Column(String, primary_key=True, default=generate_uuid)
+    match_id = Column(String, ForeignKey("matches.id", ondelete="CASCADE"), index=True)
+    status = Column(String, index=True)  # queued, running, completed, failed
+    attempts = Column(Integer, default=0)
+    error = Column(Text)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Relationships
+    match = relationship("Match", back_populates="analysis_jobs")
+
+
+class ResumeContent(Base):
+    __tablename__ = "resume_contents"
+
+    sha256 = Column(String, primary_key=True)  # Content hash of the raw upload
+    file_path = Column(String)
+    file_type = Column(String)
+    size_bytes = Column(Integer)
+    extracted_text = Column(Text)
+    parsed_data = Column(JSON)
+    reuse_count = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class Skill(Base):
+    __tablename__ = "skills"
+
+    # Integer keys keep the join tables small
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String, unique=True, index=True)  # Normalized: lowercase, single spaces
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+class JobPostingSkill(Base):
+    __tablename__ = "job_posting_skills"
+
+    job_id = Column(String, ForeignKey("job_postings.id", ondelete="CASCADE"), primary_key=True)
+    skill_id = Column(Integer, ForeignKey("skills.id", ondelete="CASCADE"), primary_key=True)
+    position = Column(Integer)
+    owner_id = synonym("job_id")
+
+    __table_args__ = (
+        # Skill filters: find jobs by skill
+        Index("ix_job_posting_skills_skill_id", "skill_id", "job_id"),
+    )
+
+    # Relationships
+    job_posting = relationship("JobPosting", back_populates="skill_links")
+    skill = relationship("Skill")
+
+class ResumeSkill(Base):
+    __tablename__ = "resume_skills"
+
+    resume_id = Column(String, ForeignKey("resumes.id", ondelete="CASCADE"), primary_key=True)
+    skill_id = Column(Integer, ForeignKey("skills.id", ondelete="CASCADE"), primary_key=True)
+    position = Column(Integer)
+    owner_id = synonym("resume_id")
+
+    __table_args__ = (
+        # Skill filters: find resumes by skill
+        Index("ix_resume_skills_skill_id", "skill_id", "resume_id"),
+    )
+
     # Relationships
-    match = relationship("Match", back_populates="interviews") 
\ No newline at end of file
+    resume = relationship("Resume", back_populates="skill_links")
+    skill = relationship("Skill")
+
+class OutboxMessage(Base):
+    __tablename__ = "email_outbox"
+
+    id = Column(String, primary_key=True, default=generate_uuid)
+    recipient = Column(String)
+    subject = Column(String)
+    body = Column(Text)
+    is_html = Column(Boolean, default=False)
+    status = Column(String)  # queued, sending, sent, failed
+    attempts = Column(Integer, default=0)
+    next_attempt_at = Column(DateTime, default=datetime.utcnow)
+    last_error = Column(Text)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    sent_at = Column(DateTime)
+
+    __table_args__ = (
+        # The sender's poll: due messages in order
+        Index("ix_email_outbox_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+
+
+class AdminStat(Base):
+    __tablename__ = "admin_stats"
+
+    # Running totals maintained by DatabaseService writes and the reconciler
+    name = Column(String, primary_key=True)  # jobs, resumes, matches, interviews, match_score_sum, match_score_count
+    value = Column(Float, default=0)
+
+class AdminStatDaily(Base):
+    __tablename__ = "admin_stats_daily"
+
+    # The same counters bucketed by the UTC day rows were created
+    day = Column(Date, primary_key=True)
+    name = Column(String, primary_key=True)
+    value = Column(Float, default=0)
\ No newline at end of file
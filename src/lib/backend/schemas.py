@@ -1,19 +1,8 @@
 from pydantic import BaseModel, Field
 from datetime import datetime
 from typing import List, Optional, Dict, Any
-import json
 from .models import UserRole
 
-def json_string_to_list(value: str) -> List[str]:
-    if not value:
-        return []
-    return json.loads(value)
-
-def json_string_to_dict(value: str) -> Dict[str, Any]:
-    if not value:
-        return {}
-    return json.loads(value)
-
 class UserBase(BaseModel):
     email: str
     full_name: str
@@ -48,12 +37,6 @@ class JobPosting(JobPostingBase):
     created_at: datetime
     updated_at: datetime
 
-    @classmethod
-    def from_orm(cls, obj):
-        if isinstance(obj.skills_required, str):
-            obj.skills_required = json_string_to_list(obj.skills_required)
-        return super().from_orm(obj)
-
     class Config:
         from_attributes = True
 
@@ -76,21 +59,6 @@ class Resume(ResumeBase):
     created_at: datetime
     updated_at: datetime
 
-    @classmethod
-    def from_orm(cls, obj):
-        # Convert JSON strings to Python objects
-        if isinstance(obj.parsed_data, str):
-            obj.parsed_data = json_string_to_dict(obj.parsed_data)
-        if isinstance(obj.education, str):
-            obj.education = json_string_to_dict(obj.education)
-        if isinstance(obj.experience, str):
-            obj.experience = json_string_to_dict(obj.experience)
-        if isinstance(obj.skills, str):
-            obj.skills = json_string_to_list(obj.skills)
-        if isinstance(obj.certifications, str):
-            obj.certifications = json_string_to_list(obj.certifications)
-        return super().from_orm(obj)
-
     class Config:
         from_attributes = True
 
@@ -109,12 +77,6 @@ class Match(MatchBase):
     created_at: datetime
     updated_at: datetime
 
-    @classmethod
-    def from_orm(cls, obj):
-        if isinstance(obj.match_details, str):
-            obj.match_details = json_string_to_dict(obj.match_details)
-        return super().from_orm(obj)
-
     class Config:
         from_attributes = True
 
@@ -127,6 +89,10 @@ class InterviewBase(BaseModel):
 class InterviewCreate(InterviewBase):
     pass
 
+class BulkInterviewCreate(BaseModel):
+    interviews: List[InterviewCreate]
+    generate_emails: bool = False  # Write each invitation with the LLM instead of the template
+
 class Interview(InterviewBase):
     id: str
     status: str
@@ -0,0 +1,196 @@
+from typing import Any, Dict, List, Optional
+from datetime import date, datetime, timedelta
+import asyncio
+from sqlalchemy import delete, func, insert, select, text
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from .. import models
+from ..config import settings
+from ..database import AsyncSessionLocal, engine, serialized_write
+
+COUNTERS = ("jobs", "resumes", "matches", "interviews", "match_score_sum", "match_score_count")
+
+# Counter -> the table whose rows it counts
+COUNTED = {
+    "jobs": models.JobPosting,
+    "resumes": models.Resume,
+    "matches": models.Match,
+    "interviews": models.Interview,
+}
+
+UPSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert, "mysql": mysql.insert}
+
+def _upsert(table, keys: Dict[str, Any], delta: float):
+    """INSERT ... ON CONFLICT that adds delta to the counter row"""
+    dialect = engine.dialect.name
+    statement = UPSERTS[dialect](table).values(**keys, value=delta)
+    if dialect == "mysql":
+        return statement.on_duplicate_key_update(value=table.c.value + statement.inserted.value)
+    return statement.on_conflict_do_update(
+        index_elements=list(keys),
+        set_={"value": table.c.value + statement.excluded.value}
+    )
+
+def _day(value: Any) -> date:
+    # SQLite's date() returns text; other backends return a date
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+class AdminStats:
+    """Materialized admin dashboard counters.
+
+    Writes in ``DatabaseService`` (and the bulk matcher) add their deltas to
+    ``admin_stats`` and the day's bucket in ``admin_stats_daily`` inside their
+    own transaction, so reading the dashboard touches a handful of rows
+    regardless of table sizes. A periodic reconciliation recomputes both
+    tables from the source rows to correct drift from writes that bypass the
+    service.
+    """
+
+    def __init__(self, reconcile_seconds: float = 3600.0):
+        self.reconcile_seconds = reconcile_seconds
+        self._task: Optional[asyncio.Task] = None
+        self.reconciled_at: Optional[datetime] = None
+        self.last_drift: Dict[str, float] = {}
+
+    def statements(self, deltas: Dict[str, float], day: Optional[date] = None) -> List[Any]:
+        """Upserts applying counter deltas to the totals and one day's bucket"""
+        day = day or datetime.utcnow().date()
+        statements = []
+        for name, delta in deltas.items():
+            if not delta:
+                continue
+            statements.append(_upsert(models.AdminStat.__table__, {"name": name}, delta))
+            statements.append(_upsert(models.AdminStatDaily.__table__, {"day": day, "name": name}, delta))
+        return statements
+
+    async def record(self, db: AsyncSession, deltas: Dict[str, float], day: Optional[date] = None) -> None:
+        """Apply deltas in the caller's transaction; the caller commits"""
+        for statement in self.statements(deltas, day):
+            await db.execute(statement)
+
+    def record_sync(self, db: Session, deltas: Dict[str, float], day: Optional[date] = None) -> None:
+        """record for synchronous sessions"""
+        for statement in self.statements(deltas, day):
+            db.execute(statement)
+
+    async def totals(self, db: AsyncSession) -> Dict[str, float]:
+        values = dict((await db.execute(select(models.AdminStat.name, models.AdminStat.value))).all())
+        return {name: values.get(name, 0.0) for name in COUNTERS}
+
+    async def daily(self, db: AsyncSession, days: int) -> List[Dict[str, Any]]:
+        """Per-day counters for the last ``days`` days, oldest first, with empty days filled in"""
+        today = datetime.utcnow().date()
+        first = today - timedelta(days=days - 1)
+        buckets = {first + timedelta(days=i): dict.fromkeys(COUNTERS, 0.0) for i in range(days)}
+        rows = await db.execute(
+            select(models.AdminStatDaily.day, models.AdminStatDaily.name, models.AdminStatDaily.value).filter(
+                models.AdminStatDaily.day >= first
+            )
+        )
+        for day, name, value in rows:
+            if day in buckets and name in buckets[day]:
+                buckets[day][name] = value
+        return [{"day": day, **values} for day, values in buckets.items()]
+
+    async def _recompute(self, db: AsyncSession) -> Dict[date, Dict[str, float]]:
+        daily: Dict[Any, Dict[str, float]] = {}
+        for name, model in COUNTED.items():
+            rows = await db.execute(
+                select(func.date(model.created_at), func.count()).group_by(func.date(model.created_at))
+            )
+            for day, count in rows:
+                daily.setdefault(day, {})[name] = float(count)
+        rows = await db.execute(
+            select(
+                func.date(models.Match.created_at),
+                func.count(models.Match.match_score),
+                func.sum(models.Match.match_score)
+            ).group_by(func.date(models.Match.created_at))
+        )
+        for day, count, total in rows:
+            daily.setdefault(day, {}).update(match_score_count=float(count), match_score_sum=float(total or 0))
+        return daily
+
+    async def _lock_counters(self, db: AsyncSession) -> None:
+        """Take the database write lock before anything is read.
+
+        The bulk matcher records deltas from its own sync sessions, outside
+        serialized_write; holding the lock from the recompute to the commit
+        makes those writes wait instead of landing between the two and being
+        wiped by the rewrite.
+        """
+        dialect = engine.dialect.name
+        if dialect == "sqlite":
+            await db.execute(text("BEGIN IMMEDIATE"))
+        elif dialect == "postgresql":
+            await db.execute(text("LOCK TABLE admin_stats, admin_stats_daily IN EXCLUSIVE MODE"))
+        else:
+            await db.execute(select(models.AdminStat.name).with_for_update())
+
+    async def reconcile(self, db: AsyncSession) -> Dict[str, float]:
+        """Rebuild both tables from the source rows in one write transaction; returns how far the totals had drifted"""
+        async with serialized_write():
+            await self._lock_counters(db)
+            previous = await self.totals(db)
+            daily = await self._recompute(db)
+            totals = dict.fromkeys(COUNTERS, 0.0)
+            for values in daily.values():
+                for name, value in values.items():
+                    totals[name] += value
+
+            await db.execute(delete(models.AdminStat))
+            await db.execute(delete(models.AdminStatDaily))
+            await db.execute(insert(models.AdminStat), [
+                {"name": name, "value": value} for name, value in totals.items()
+            ])
+            # Rows without a creation time count towards the totals only
+            buckets = [
+                {"day": _day(day), "name": name, "value": value}
+                for day, values in daily.items() if day is not None
+                for name, value in values.items()
+            ]
+            if buckets:
+                await db.execute(insert(models.AdminStatDaily), buckets)
+            await db.commit()
+
+        self.reconciled_at = datetime.utcnow()
+        self.last_drift = {
+            name: totals[name] - previous[name] for name in COUNTERS if totals[name] != previous[name]
+        }
+        return self.last_drift
+
+    async def start(self) -> None:
+        """Start periodic reconciliation; the first pass runs at once if the tables are empty"""
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        async with AsyncSessionLocal() as db:
+            empty = (await db.execute(select(func.count()).select_from(models.AdminStat))).scalar() == 0
+        delay = 0 if empty else self.reconcile_seconds
+        while True:
+            await asyncio.sleep(delay)
+            delay = self.reconcile_seconds
+            try:
+                async with AsyncSessionLocal() as db:
+                    drift = await self.reconcile(db)
+                if drift:
+                    print(f"Admin stats reconciled, corrected drift: {drift}")
+            except Exception as e:
+                print(f"Error reconciling admin stats: {str(e)}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Reconciliation status"""
+        return {
+            "reconcile_seconds": self.reconcile_seconds,
+            "reconciled_at": self.reconciled_at.isoformat() if self.reconciled_at else None,
+            "last_drift": self.last_drift
+        }
+
+admin_stats = AdminStats(reconcile_seconds=settings.ADMIN_STATS_RECONCILE_SECONDS)
@@ -0,0 +1,135 @@
+from typing import Any, Dict, List, Optional
+import asyncio
+import json
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from .. import models
+from ..agents import MatchingAgent
+from ..database import AsyncSessionLocal, serialized_write
+
+class AnalysisQueue:
+    """In-process worker pool that fills in match analyses off the request path.
+
+    Job state lives in the ``analysis_jobs`` table, so queued work survives a
+    restart: ``start`` re-enqueues every job that was queued or running.
+    """
+
+    def __init__(self, workers: int = 4, max_attempts: int = 3):
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self) -> None:
+        """Start workers and recover unfinished jobs from the database"""
+        self._queue = asyncio.Queue()
+        async with AsyncSessionLocal() as db:
+            pending = await db.execute(
+                select(models.AnalysisJob.id).filter(
+                    models.AnalysisJob.status.in_(["queued", "running"])
+                )
+            )
+            for (job_id,) in pending:
+                self._queue.put_nowait(job_id)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        """Cancel workers; unfinished jobs stay queued in the database"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def enqueue(self, db: AsyncSession, match_id: str) -> models.AnalysisJob:
+        """Persist a job for the match and hand it to the workers"""
+        job = models.AnalysisJob(match_id=match_id, status="queued", attempts=0)
+        async with serialized_write():
+            db.add(job)
+            await db.commit()
+        if self._queue is not None:
+            self._queue.put_nowait(job.id)
+        return job
+
+    async def get_status(self, db: AsyncSession, match_id: str) -> Optional[Dict[str, Any]]:
+        """Latest analysis job state for a match"""
+        job = (await db.execute(
+            select(models.AnalysisJob).filter(
+                models.AnalysisJob.match_id == match_id
+            ).order_by(models.AnalysisJob.created_at.desc()).limit(1)
+        )).scalars().first()
+        if not job:
+            return None
+        return {
+            "job_id": job.id,
+            "match_id": job.match_id,
+            "status": job.status,
+            "attempts": job.attempts,
+            "error": job.error,
+            "updated_at": job.updated_at
+        }
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run(job_id)
+            except Exception as e:
+                print(f"Error running analysis job {job_id}: {str(e)}")
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job_id: str) -> None:
+        async with AsyncSessionLocal() as db:
+            # Relationships cannot lazy-load on an async session, so load them up front
+            job = (await db.execute(
+                select(models.AnalysisJob).filter(models.AnalysisJob.id == job_id).options(
+                    selectinload(models.AnalysisJob.match).undefer(models.Match.match_details),
+                    selectinload(models.AnalysisJob.match).selectinload(models.Match.job_posting),
+                    selectinload(models.AnalysisJob.match).selectinload(models.Match.resume).undefer(
+                        models.Resume.parsed_data
+                    )
+                )
+            )).scalars().first()
+            if not job or job.status == "completed":
+                return
+            match = job.match
+            if not match:
+                async with serialized_write():
+                    job.status = "failed"
+                    job.error = "Match not found"
+                    await db.commit()
+                return
+
+            async with serialized_write():
+                job.status = "running"
+                job.attempts = (job.attempts or 0) + 1
+                await db.commit()
+
+            try:
+                analysis = await MatchingAgent.analyze_match(
+                    match.job_posting.description,
+                    json.dumps(match.resume.parsed_data)
+                )
+            except Exception as e:
+                async with serialized_write():
+                    job.error = str(e)
+                    job.status = "queued" if job.attempts < self.max_attempts else "failed"
+                    await db.commit()
+                if job.status == "queued":
+                    # Back off without holding a worker
+                    asyncio.get_running_loop().call_later(
+                        2 ** job.attempts, self._queue.put_nowait, job_id
+                    )
+                return
+
+            async with serialized_write():
+                # Re-read under the lock so a rescore committed during the LLM call is not overwritten
+                await db.refresh(match, ["match_details"])
+                # A new dict so the JSON column sees the change
+                details = dict(match.match_details or {})
+                details["analysis"] = analysis.get("analysis", "")
+                match.match_details = details
+                job.status = "completed"
+                job.error = None
+                await db.commit()
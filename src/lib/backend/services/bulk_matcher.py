@@ -0,0 +1,149 @@
+from typing import Any, Dict, List
+from datetime import datetime
+import uuid
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from .. import models
+from ..database import insert_ignoring_duplicates
+from .matcher import Matcher
+from .admin_stats import admin_stats
+
+class BulkMatcher:
+    """Scores one job posting against every resume with batched encoding.
+
+    Resumes are read from the database in primary-key ordered chunks. For each
+    chunk all skill strings and experience texts are encoded in one batch,
+    scores are computed with matrix operations using the Matcher weights and
+    thresholds, and the resulting rows are bulk-inserted into ``matches``.
+    """
+
+    def __init__(self, matcher: Matcher, chunk_size: int = 500):
+        self.matcher = matcher
+        self.chunk_size = chunk_size
+
+    def match_job(self, db: Session, job: models.JobPosting) -> Dict[str, Any]:
+        """Match a job against all resumes that do not have a match for it yet"""
+        job_data = Matcher.job_data_from_posting(job)
+        job_skills = job_data["skills_required"]
+        job_vector = self.matcher.normalize(self.matcher.encode([job_data["description"] or ""]))[0]
+        job_skill_vectors = (
+            self.matcher.normalize(self.matcher.encode(job_skills)) if job_skills else None
+        )
+
+        already_matched = {
+            resume_id for (resume_id,) in
+            db.query(models.Match.resume_id).filter(models.Match.job_id == job.id)
+        }
+
+        # Page through resumes by primary key so each chunk can be committed independently
+        created = 0
+        last_id = ""
+        while True:
+            rows = db.query(
+                models.Resume.id,
+                models.Resume.skills,
+                models.Resume.experience
+            ).filter(
+                models.Resume.id > last_id
+            ).order_by(models.Resume.id).limit(self.chunk_size).all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+
+            batch = [row for row in rows if row.id not in already_matched]
+            if batch:
+                created += self._score_and_store(db, job, job_skills, job_skill_vectors, job_vector, batch)
+
+        return {"job_id": job.id, "matches_created": created}
+
+    def _score_and_store(
+        self,
+        db: Session,
+        job: models.JobPosting,
+        job_skills: List[str],
+        job_skill_vectors: Any,
+        job_vector: np.ndarray,
+        rows: List[Any]
+    ) -> int:
+        """Score one chunk of resumes and bulk-insert the matches"""
+        cv_skills = [row.skills or [] for row in rows]
+        experiences = [row.experience or [] for row in rows]
+
+        # One encode for every distinct skill in the chunk
+        skill_vocab = list(dict.fromkeys(skill for skills in cv_skills for skill in skills))
+        skill_similarity = None
+        if job_skill_vectors is not None and skill_vocab:
+            vocab_vectors = self.matcher.normalize(self.matcher.encode(skill_vocab))
+            skill_similarity = job_skill_vectors @ vocab_vectors.T
+        vocab_index = {skill: i for i, skill in enumerate(skill_vocab)}
+
+        # One encode for combined experience texts plus every individual entry
+        combined_texts = [
+            " ".join(exp.get("description", "") for exp in entries) for entries in experiences
+        ]
+        entry_texts = [exp.get("description", "") for entries in experiences for exp in entries]
+        text_vectors = self.matcher.normalize(self.matcher.encode(combined_texts + entry_texts))
+        experience_scores = text_vectors[:len(rows)] @ job_vector * 100
+        entry_scores = text_vectors[len(rows):] @ job_vector
+
+        now = datetime.utcnow()
+        records = []
+        entry_offset = 0
+        for i, row in enumerate(rows):
+            if skill_similarity is not None and cv_skills[i]:
+                matrix = skill_similarity[:, [vocab_index[skill] for skill in cv_skills[i]]]
+            else:
+                matrix = np.zeros((len(job_skills), 0), dtype=np.float32)
+            skill_match = self.matcher.skill_score(matrix)
+            matched_skills, missing_skills = self.matcher.split_skills(job_skills, matrix)
+
+            entries = experiences[i]
+            experience_match = float(experience_scores[i]) if entries else 0.0
+            relevance = entry_scores[entry_offset:entry_offset + len(entries)]
+            entry_offset += len(entries)
+
+            match_score = (
+                skill_match * Matcher.SKILL_WEIGHT + experience_match * Matcher.EXPERIENCE_WEIGHT
+            )
+            match_details = {
+                "match_score": match_score,
+                "skill_match": skill_match,
+                "experience_match": experience_match,
+                "analysis": "",
+                "matching_details": {
+                    "matched_skills": matched_skills,
+                    "missing_skills": missing_skills,
+                    "experience_analysis": {
+                        "total_years": sum(float(exp.get("duration_years", 0)) for exp in entries),
+                        "relevant_experience": [
+                            exp for exp, similarity in zip(entries, relevance)
+                            if similarity > Matcher.EXPERIENCE_RELEVANCE_THRESHOLD
+                        ]
+                    }
+                }
+            }
+            records.append({
+                "id": str(uuid.uuid4()),
+                "job_id": job.id,
+                "resume_id": row.id,
+                "match_score": match_score,
+                "match_details": match_details,
+                "status": "pending",
+                "created_at": now,
+                "updated_at": now
+            })
+
+        # Another request may have matched some of these resumes since already_matched was read
+        db.execute(insert_ignoring_duplicates(models.Match.__table__), records)
+        inserted_ids = set(db.scalars(
+            select(models.Match.id).filter(models.Match.id.in_([record["id"] for record in records]))
+        ))
+        inserted = [record for record in records if record["id"] in inserted_ids]
+        admin_stats.record_sync(db, {
+            "matches": len(inserted),
+            "match_score_count": len(inserted),
+            "match_score_sum": sum(record["match_score"] for record in inserted)
+        })
+        db.commit()
+        return len(inserted)
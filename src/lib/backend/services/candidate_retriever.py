@@ -0,0 +1,108 @@
+from typing import Any, Dict, List, Tuple
+import threading
+from sqlalchemy.orm import Session, undefer_group
+from .. import models
+from .executor import executor
+from .matcher import Matcher
+from .vector_index import IVFIndex
+
+class CandidateRetriever:
+    """Keeps an ANN index of resume embeddings for top-K candidate retrieval.
+
+    The index is built lazily from the ``resumes`` table on first use. Embeddings
+    go through the Matcher's persistent cache, so a rebuild after restart reads
+    stored vectors instead of re-encoding every resume.
+    """
+
+    def __init__(self, matcher: Matcher, chunk_size: int = 1000):
+        self.matcher = matcher
+        self.chunk_size = chunk_size
+        # Retraining runs on the CPU pool so the upload that crosses the threshold doesn't pay for it
+        self.index = IVFIndex(submit=executor.submit_cpu)
+        self._loaded = False
+        self._load_lock = threading.Lock()
+
+    @staticmethod
+    def resume_text(resume: Any) -> str:
+        """Text used to embed a resume: skills followed by experience descriptions"""
+        skills = resume.skills or []
+        experience = resume.experience or []
+        parts = [", ".join(str(skill) for skill in skills)]
+        parts.extend(exp.get("description", "") for exp in experience if isinstance(exp, dict))
+        return "\n".join(part for part in parts if part)
+
+    @staticmethod
+    def job_text(job: Any) -> str:
+        """Text used to embed a job posting as a query"""
+        skills = job.skills_required or []
+        return "\n".join([", ".join(skills), job.title or "", job.description or ""])
+
+    def ensure_loaded(self, db: Session) -> None:
+        """Build the index from the database if it has not been built yet"""
+        if self._loaded:
+            return
+        with self._load_lock:
+            if self._loaded:
+                return
+            query = db.query(
+                models.Resume.id,
+                models.Resume.skills,
+                models.Resume.experience
+            ).execution_options(yield_per=self.chunk_size)
+
+            batch = []
+            for row in query:
+                batch.append(row)
+                if len(batch) >= self.chunk_size:
+                    self._add_rows(batch)
+                    batch = []
+            self._add_rows(batch)
+            self._loaded = True
+
+    def _add_rows(self, rows: List[Any]) -> None:
+        if not rows:
+            return
+        vectors = self.matcher.encode([self.resume_text(row) for row in rows])
+        self.index.add([row.id for row in rows], vectors)
+
+    def add_resume(self, resume: models.Resume) -> None:
+        """Index a newly created resume; a no-op until the index is loaded"""
+        if self._loaded:
+            self._add_rows([resume])
+
+    def remove_resume(self, resume_id: str) -> None:
+        """Drop a resume from the index"""
+        self.index.remove(resume_id)
+
+    def top_candidates(self, db: Session, job: models.JobPosting, k: int = 10) -> List[Tuple[str, float]]:
+        """Return the k most similar resumes as (resume_id, similarity) pairs"""
+        self.ensure_loaded(db)
+        query = self.matcher.encode([self.job_text(job)])[0]
+        return self.index.search(query, k)
+
+    def rank_candidates(self, db: Session, job: models.JobPosting, k: int = 10) -> List[Dict[str, Any]]:
+        """Shortlist k resumes from the index and score each one in detail"""
+        shortlist = self.top_candidates(db, job, k)
+        resumes = {
+            resume.id: resume
+            for resume in db.query(models.Resume).options(undefer_group("details")).filter(
+                models.Resume.id.in_([resume_id for resume_id, _ in shortlist])
+            )
+        }
+        
+        job_data = Matcher.job_data_from_posting(job)
+        candidates = []
+        for resume_id, similarity in shortlist:
+            resume = resumes.get(resume_id)
+            if not resume:
+                continue
+            score = self.matcher.score_cv_with_job(job_data, Matcher.cv_data_from_resume(resume))
+            candidates.append({
+                "resume_id": resume_id,
+                "user_id": resume.user_id,
+                "similarity": similarity,
+                **score
+            })
+        
+        candidates.sort(key=lambda candidate: candidate["match_score"], reverse=True)
+        return candidates
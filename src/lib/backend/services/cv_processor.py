@@ -38,6 +38,39 @@ class CVProcessor:
             # For plain text files
             return file_content.decode('utf-8', errors='ignore')
 
+    @staticmethod
+    def extract_text_from_pdf_file(file_path: str) -> str:
+        """Extract text from a PDF on disk, reading pages from the file as needed"""
+        try:
+            # Passing an open file keeps PyPDF2 from copying the whole file into memory
+            with open(file_path, "rb") as pdf_file:
+                pdf_reader = PyPDF2.PdfReader(pdf_file)
+                return "".join(page.extract_text() for page in pdf_reader.pages)
+        except Exception as e:
+            print(f"Error extracting text from PDF: {str(e)}")
+            return ""
+
+    @staticmethod
+    def extract_text_from_docx_file(file_path: str) -> str:
+        """Extract text from a DOCX on disk"""
+        try:
+            return docx2txt.process(file_path)
+        except Exception as e:
+            print(f"Error extracting text from DOCX: {str(e)}")
+            return ""
+
+    @staticmethod
+    def extract_text_from_file(file_path: str, file_type: str) -> str:
+        """Extract text from a file on disk based on file type"""
+        if file_type == "application/pdf":
+            return CVProcessor.extract_text_from_pdf_file(file_path)
+        elif file_type in ["application/vnd.openxmlformats-officedocument.wordprocessingml.document", "application/msword"]:
+            return CVProcessor.extract_text_from_docx_file(file_path)
+        else:
+            # For plain text files
+            with open(file_path, "r", encoding="utf-8", errors="ignore") as text_file:
+                return text_file.read()
+
     @staticmethod
     def structure_cv_data(cv_text: str, parsed_data: Dict[str, Any]) -> Dict[str, Any]:
         """Structure CV data into required format"""
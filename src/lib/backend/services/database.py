@@ -1,15 +1,20 @@
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
-import json
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer_group
 from .. import models
+from ..database import serialized_write
+from .pagination import encode_cursor, decode_cursor
+from .skills import link_skills
+from .interview_slots import interview_slots, SlotConflict
+from .admin_stats import admin_stats
 import uuid
 
 class DatabaseService:
     async def create_job_posting(
         self,
-        db: Session,
+        db: AsyncSession,
         user_id: str,
         title: str,
         company: str,
@@ -23,16 +28,42 @@ class DatabaseService:
             title=title,
             company=company,
             description=description,
-            skills_required=json.dumps(skills_required)
+            skills_required=skills_required
         )
-        db.add(job_posting)
-        db.commit()
-        db.refresh(job_posting)
+        async with serialized_write():
+            db.add(job_posting)
+            await link_skills(db, models.JobPostingSkill, job_posting.id, skills_required)
+            await admin_stats.record(db, {"jobs": 1})
+            await db.commit()
         return job_posting
 
+    async def save_job_summary(
+        self,
+        db: AsyncSession,
+        job_id: str,
+        status: str,
+        summary: Optional[str] = None,
+        error: Optional[str] = None
+    ) -> models.JobPostingSummary:
+        """Create or update the AI summary attached to a job posting"""
+        async with serialized_write():
+            job_summary = await db.get(models.JobPostingSummary, job_id)
+            if job_summary is None:
+                job_summary = models.JobPostingSummary(job_id=job_id)
+                db.add(job_summary)
+            job_summary.status = status
+            job_summary.summary = summary
+            job_summary.error = error
+            await db.commit()
+        return job_summary
+
+    async def get_job_summary(self, db: AsyncSession, job_id: str) -> Optional[models.JobPostingSummary]:
+        """Get the AI summary attached to a job posting"""
+        return await db.get(models.JobPostingSummary, job_id)
+
     async def create_resume(
         self,
-        db: Session,
+        db: AsyncSession,
         user_id: str,
         file_path: str,
         file_name: str,
@@ -50,42 +81,59 @@ class DatabaseService:
             file_path=file_path,
             file_name=file_name,
             file_type=file_type,
-            parsed_data=json.dumps(parsed_data),
-            education=json.dumps(education),
-            experience=json.dumps(experience),
-            skills=json.dumps(skills),
-            certifications=json.dumps(certifications)
+            parsed_data=parsed_data,
+            education=education,
+            experience=experience,
+            skills=skills,
+            certifications=certifications
         )
-        db.add(resume)
-        db.commit()
-        db.refresh(resume)
+        async with serialized_write():
+            db.add(resume)
+            await link_skills(db, models.ResumeSkill, resume.id, skills)
+            await admin_stats.record(db, {"resumes": 1})
+            await db.commit()
         return resume
 
     async def create_match(
         self,
-        db: Session,
+        db: AsyncSession,
         job_id: str,
         resume_id: str,
         match_score: float,
         match_details: Dict[str, Any]
     ) -> models.Match:
-        """Create a new match"""
-        match = models.Match(
-            id=str(uuid.uuid4()),
-            job_id=job_id,
-            resume_id=resume_id,
-            match_score=match_score,
-            match_details=json.dumps(match_details),
-            status="pending"
-        )
-        db.add(match)
-        db.commit()
-        db.refresh(match)
+        """Create a match, or update the existing one for this (job, resume) pair"""
+        async with serialized_write():
+            match = (await db.execute(
+                select(models.Match).filter(
+                    models.Match.job_id == job_id,
+                    models.Match.resume_id == resume_id
+                )
+            )).scalars().first()
+            if match is None:
+                match = models.Match(
+                    id=str(uuid.uuid4()),
+                    job_id=job_id,
+                    resume_id=resume_id,
+                    status="pending",
+                    created_at=datetime.utcnow()
+                )
+                db.add(match)
+                deltas = {"matches": 1, "match_score_count": 1, "match_score_sum": match_score}
+            elif match.match_score is None:
+                deltas = {"match_score_count": 1, "match_score_sum": match_score}
+            else:
+                deltas = {"match_score_sum": match_score - match.match_score}
+            # A rescore adjusts the day the match was created
+            await admin_stats.record(db, deltas, match.created_at.date() if match.created_at else None)
+            match.match_score = match_score
+            match.match_details = match_details
+            await db.commit()
         return match
 
     async def create_interview(
         self,
-        db: Session,
+        db: AsyncSession,
         match_id: str,
         scheduled_time: datetime,
         duration_minutes: int,
@@ -100,73 +148,233 @@ class DatabaseService:
             interview_type=interview_type,
             status="scheduled"
         )
-        db.add(interview)
-        db.commit()
-        db.refresh(interview)
+        # The initial index load reads the whole table; never do that under the write lock
+        await interview_slots.ensure_loaded(db)
+        async with serialized_write():
+            booked = await self._book_slots(db, [interview])
+            db.add(interview)
+            try:
+                await admin_stats.record(db, {"interviews": 1})
+                await db.commit()
+            except Exception:
+                for interview_id in booked:
+                    interview_slots.remove(interview_id)
+                raise
         return interview
 
-    async def get_job_posting(self, db: Session, job_id: str) -> Optional[models.JobPosting]:
+    async def create_interviews(self, db: AsyncSession, slots: List[Dict[str, Any]]) -> List[models.Interview]:
+        """Create many interviews and mark their matches as interviewing in one transaction.
+
+        Anything else already added to the session (such as queued invitations)
+        commits with them.
+        """
+        interviews = [
+            models.Interview(
+                id=str(uuid.uuid4()),
+                match_id=slot["match_id"],
+                scheduled_time=slot["scheduled_time"],
+                duration_minutes=slot["duration_minutes"],
+                interview_type=slot["interview_type"],
+                status="scheduled"
+            )
+            for slot in slots
+        ]
+        await interview_slots.ensure_loaded(db)
+        async with serialized_write():
+            booked = await self._book_slots(db, interviews)
+            try:
+                db.add_all(interviews)
+                await db.execute(
+                    update(models.Match).where(
+                        models.Match.id.in_(list({slot["match_id"] for slot in slots}))
+                    ).values(status="interviewing")
+                )
+                await admin_stats.record(db, {"interviews": len(interviews)})
+                await db.commit()
+            except Exception:
+                for interview_id in booked:
+                    interview_slots.remove(interview_id)
+                raise
+        return interviews
+
+    async def get_interview_participants(self, db: AsyncSession, match_ids: List[str]) -> Dict[str, Tuple[str, str]]:
+        """(interviewer, candidate) user IDs per match: the job poster and the resume owner"""
+        rows = await db.execute(
+            select(
+                models.Match.id,
+                models.JobPosting.user_id,
+                models.Resume.user_id
+            ).join(
+                models.JobPosting, models.JobPosting.id == models.Match.job_id
+            ).join(
+                models.Resume, models.Resume.id == models.Match.resume_id
+            ).filter(models.Match.id.in_(match_ids))
+        )
+        return {match_id: (interviewer_id, candidate_id) for match_id, interviewer_id, candidate_id in rows}
+
+    async def _book_slots(self, db: AsyncSession, interviews: List[models.Interview]) -> List[str]:
+        """Reserve interviews in the slot index; raises SlotConflict on any overlap, including within the batch.
+
+        Called under serialized_write so concurrent bookings cannot both pass the check,
+        after ``interview_slots.ensure_loaded`` so the refresh here only reads recent changes.
+        """
+        participants = await self.get_interview_participants(db, list({i.match_id for i in interviews}))
+        await interview_slots.refresh(db)
+        booked = []
+        try:
+            for interview in interviews:
+                if interview.match_id not in participants:
+                    continue
+                interviewer_id, candidate_id = participants[interview.match_id]
+                conflicts = interview_slots.conflicts(
+                    interviewer_id, candidate_id, interview.scheduled_time, interview.duration_minutes
+                )
+                if conflicts:
+                    raise SlotConflict(conflicts)
+                interview_slots.upsert(
+                    interview.id, interviewer_id, candidate_id, interview.scheduled_time, interview.duration_minutes
+                )
+                booked.append(interview.id)
+        except SlotConflict:
+            for interview_id in booked:
+                interview_slots.remove(interview_id)
+            raise
+        return booked
+
+    async def get_invitation_details(self, db: AsyncSession, match_ids: List[str]) -> Dict[str, Any]:
+        """Candidate and job fields for invitation emails, keyed by match ID, in one query"""
+        rows = (await db.execute(
+            select(
+                models.Match.id,
+                models.User.email,
+                models.User.full_name,
+                models.JobPosting.title,
+                models.JobPosting.company
+            ).join(
+                models.Resume, models.Resume.id == models.Match.resume_id
+            ).join(
+                models.User, models.User.id == models.Resume.user_id
+            ).join(
+                models.JobPosting, models.JobPosting.id == models.Match.job_id
+            ).filter(models.Match.id.in_(match_ids))
+        )).all()
+        return {row.id: row for row in rows}
+
+    async def get_user(self, db: AsyncSession, user_id: str) -> Optional[models.User]:
+        """Get user by ID"""
+        return await db.get(models.User, user_id)
+
+    async def get_user_by_email(self, db: AsyncSession, email: str) -> Optional[models.User]:
+        """Get user by email"""
+        return (await db.execute(
+            select(models.User).filter(models.User.email == email)
+        )).scalars().first()
+
+    async def get_job_posting(self, db: AsyncSession, job_id: str) -> Optional[models.JobPosting]:
         """Get job posting by ID"""
-        return db.query(models.JobPosting).filter(models.JobPosting.id == job_id).first()
+        return await db.get(models.JobPosting, job_id)
 
-    async def get_resume(self, db: Session, resume_id: str) -> Optional[models.Resume]:
-        """Get resume by ID"""
-        return db.query(models.Resume).filter(models.Resume.id == resume_id).first()
+    async def get_resume(self, db: AsyncSession, resume_id: str) -> Optional[models.Resume]:
+        """Get resume by ID, with its parsed details"""
+        return await db.get(models.Resume, resume_id, options=[undefer_group("details")])
 
-    async def get_match(self, db: Session, match_id: str) -> Optional[models.Match]:
-        """Get match by ID"""
-        return db.query(models.Match).filter(models.Match.id == match_id).first()
+    async def get_match(self, db: AsyncSession, match_id: str) -> Optional[models.Match]:
+        """Get match by ID, with its details"""
+        return await db.get(models.Match, match_id, options=[undefer_group("details")])
 
     async def get_shortlisted_candidates(
         self,
-        db: Session,
+        db: AsyncSession,
         job_id: str,
-        min_score: float = 70.0
-    ) -> List[Dict[str, Any]]:
-        """Get shortlisted candidates for a job"""
-        matches = db.query(models.Match).filter(
+        min_score: float = 70.0,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        include_details: bool = False
+    ) -> Dict[str, Any]:
+        """Get shortlisted candidates for a job, best score first, one keyset page at a time"""
+        after = decode_cursor(cursor, 2)
+        
+        # One joined query projecting only the shortlist columns
+        columns = [
+            models.Match.id,
+            models.Match.match_score,
+            models.Match.resume_id,
+            models.User.full_name
+        ]
+        if include_details:
+            columns.append(models.Match.match_details)
+        query = select(*columns).join(
+            models.Resume, models.Resume.id == models.Match.resume_id
+        ).join(
+            models.User, models.User.id == models.Resume.user_id
+        ).filter(
             models.Match.job_id == job_id,
             models.Match.match_score >= min_score
-        ).all()
+        )
+        if after is not None:
+            last_score, last_id = after
+            # The leading <= bound keeps the (job_id, match_score) index seek on later pages
+            query = query.filter(
+                models.Match.match_score <= last_score,
+                or_(
+                    models.Match.match_score < last_score,
+                    and_(models.Match.match_score == last_score, models.Match.id < last_id)
+                )
+            )
+        rows = (await db.execute(
+            query.order_by(models.Match.match_score.desc(), models.Match.id.desc()).limit(limit + 1)
+        )).all()
         
         shortlisted = []
-        for match in matches:
-            resume = await self.get_resume(db, match.resume_id)
-            if resume:
-                user = db.query(models.User).filter(models.User.id == resume.user_id).first()
-                if user:
-                    shortlisted.append({
-                        "match_id": match.id,
-                        "candidate_name": user.full_name,
-                        "match_score": match.match_score,
-                        "match_details": json.loads(match.match_details) if match.match_details else {},
-                        "resume_id": resume.id
-                    })
+        for row in rows[:limit]:
+            candidate = {
+                "match_id": row.id,
+                "candidate_name": row.full_name,
+                "match_score": row.match_score,
+                "resume_id": row.resume_id
+            }
+            if include_details:
+                candidate["match_details"] = row.match_details or {}
+            shortlisted.append(candidate)
         
-        return shortlisted
+        next_cursor = None
+        if len(rows) > limit:
+            last = rows[limit - 1]
+            next_cursor = encode_cursor(last.match_score, last.id)
+        return {"shortlisted": shortlisted, "next_cursor": next_cursor}
 
-    async def update_match_status(self, db: Session, match_id: str, status: str) -> None:
+    async def update_match_status(self, db: AsyncSession, match_id: str, status: str) -> None:
         """Update match status"""
-        match = await self.get_match(db, match_id)
-        if match:
-            match.status = status
-            db.commit()
-
-    async def get_admin_stats(self, db: Session) -> Dict[str, Any]:
-        """Get admin dashboard statistics"""
-        total_jobs = db.query(models.JobPosting).count()
-        total_resumes = db.query(models.Resume).count()
-        total_matches = db.query(models.Match).count()
-        total_interviews = db.query(models.Interview).count()
-        
-        avg_match_score = db.query(models.Match).with_entities(
-            db.func.avg(models.Match.match_score)
-        ).scalar() or 0
-        
+        async with serialized_write():
+            match = await db.get(models.Match, match_id)
+            if match:
+                match.status = status
+                await db.commit()
+
+    async def get_admin_stats(self, db: AsyncSession) -> Dict[str, Any]:
+        """Get admin dashboard statistics from the materialized counters"""
+        totals = await admin_stats.totals(db)
+        scored = totals["match_score_count"]
         return {
-            "total_jobs": total_jobs,
-            "total_resumes": total_resumes,
-            "total_matches": total_matches,
-            "total_interviews": total_interviews,
-            "avg_match_score": float(avg_match_score)
-        } 
\ No newline at end of file
+            "total_jobs": int(totals["jobs"]),
+            "total_resumes": int(totals["resumes"]),
+            "total_matches": int(totals["matches"]),
+            "total_interviews": int(totals["interviews"]),
+            "avg_match_score": totals["match_score_sum"] / scored if scored else 0.0
+        }
+
+    async def get_daily_stats(self, db: AsyncSession, days: int = 30) -> List[Dict[str, Any]]:
+        """Jobs, resumes, matches and interviews created per day, with the day's average match score"""
+        return [
+            {
+                "day": bucket["day"],
+                "jobs": int(bucket["jobs"]),
+                "resumes": int(bucket["resumes"]),
+                "matches": int(bucket["matches"]),
+                "interviews": int(bucket["interviews"]),
+                "avg_match_score": (
+                    bucket["match_score_sum"] / bucket["match_score_count"] if bucket["match_score_count"] else None
+                )
+            }
+            for bucket in await admin_stats.daily(db, days)
+        ]
\ No newline at end of file
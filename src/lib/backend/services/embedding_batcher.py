@@ -0,0 +1,141 @@
+from typing import Any, Dict, List, Optional, Set, Tuple
+import asyncio
+import threading
+import numpy as np
+from ..config import settings
+from .executor import executor, encode_texts
+
+class EmbeddingBatcher:
+    """Coalesces concurrent encode requests into batched model forward passes.
+
+    Callers submit a few texts each; a collector task gathers requests until
+    ``max_batch_size`` texts are pending or ``max_wait_ms`` has passed since the
+    first one arrived, runs a single encode on the CPU pool and hands every
+    caller its own slice of the result.
+    """
+
+    def __init__(self, model_name: str, max_batch_size: int = 64, max_wait_ms: float = 5.0):
+        self.model_name = model_name
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self._queue: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop_thread: Optional[int] = None
+        self._inflight: Set[asyncio.Task] = set()
+        # Requests the collector has taken off the queue but not yet handed to a batch
+        self._collecting: List[Tuple[List[str], asyncio.Future]] = []
+        self.batches = 0
+        self.texts = 0
+        # Power-of-two buckets: "1", "2", "4", ... up to max_batch_size and beyond
+        self.batch_size_histogram: Dict[str, int] = {}
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        """Start the collector on the running event loop"""
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._collect())
+
+    async def stop(self) -> None:
+        """Stop collecting, fail requests not yet batched and wait for running batches"""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        pending, self._collecting = self._collecting, []
+        while self._queue is not None and not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        for _, future in pending:
+            if not future.done():
+                future.set_exception(RuntimeError("Embedding batcher stopped"))
+        # Batches already encoding still resolve their callers
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+        self._loop = None
+
+    async def encode(self, texts: List[str]) -> np.ndarray:
+        """Encode texts as part of the next batch"""
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        if not self.running:
+            return await executor.run_cpu(encode_texts, self.model_name, texts)
+        future = self._loop.create_future()
+        self._queue.put_nowait((list(texts), future))
+        return await future
+
+    def encode_blocking(self, texts: List[str]) -> np.ndarray:
+        """Synchronous entry point for code running on worker threads"""
+        loop = self._loop
+        if self.running and loop is not None and threading.get_ident() != self._loop_thread:
+            return asyncio.run_coroutine_threadsafe(self.encode(texts), loop).result()
+        # No collector, or called on the loop thread itself: encode directly
+        return executor.call_cpu(encode_texts, self.model_name, texts)
+
+    async def _collect(self) -> None:
+        while True:
+            batch = self._collecting = [await self._queue.get()]
+            size = len(batch[0][0])
+            deadline = self._loop.time() + self.max_wait_ms / 1000
+            while size < self.max_batch_size:
+                timeout = deadline - self._loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                batch.append(item)
+                size += len(item[0])
+            # Run the forward pass in the background so the next batch can form meanwhile
+            task = asyncio.create_task(self._run(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+            self._collecting = []
+
+    async def _run(self, batch: List[Tuple[List[str], asyncio.Future]]) -> None:
+        texts = [text for item_texts, _ in batch for text in item_texts]
+        self._record(len(texts))
+        try:
+            vectors = np.asarray(await executor.run_cpu(encode_texts, self.model_name, texts))
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        offset = 0
+        for item_texts, future in batch:
+            if not future.done():
+                future.set_result(vectors[offset:offset + len(item_texts)])
+            offset += len(item_texts)
+
+    def _record(self, size: int) -> None:
+        self.batches += 1
+        self.texts += size
+        bucket = 1
+        while bucket < size:
+            bucket *= 2
+        self.batch_size_histogram[str(bucket)] = self.batch_size_histogram.get(str(bucket), 0) + 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Batch counts and batch-size histogram"""
+        return {
+            "running": self.running,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+            "batches": self.batches,
+            "texts": self.texts,
+            "avg_batch_size": self.texts / self.batches if self.batches else 0.0,
+            "batch_size_histogram": dict(sorted(self.batch_size_histogram.items(), key=lambda item: int(item[0])))
+        }
+
+embedding_batcher = EmbeddingBatcher(
+    model_name=settings.EMBEDDING_MODEL,
+    max_batch_size=settings.EMBEDDING_BATCH_MAX_SIZE,
+    max_wait_ms=settings.EMBEDDING_BATCH_MAX_WAIT_MS
+)
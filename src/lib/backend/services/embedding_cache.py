@@ -0,0 +1,156 @@
+from typing import Any, Callable, Dict, List, Sequence
+from collections import OrderedDict
+import hashlib
+import os
+import sqlite3
+import threading
+import numpy as np
+
+class EmbeddingCache:
+    """Content-hashed embedding store: in-process LRU in front of a SQLite table.
+
+    Vectors are keyed by ``sha256(text)`` and scoped to a model name and version.
+    When the configured version of a model changes, its stored vectors are dropped
+    on startup so stale embeddings are never served.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        model_version: str,
+        db_path: str = "data/embeddings.db",
+        max_memory_items: int = 50000
+    ):
+        self.model_name = model_name
+        self.model_version = model_version
+        self.max_memory_items = max_memory_items
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embedding_models ("
+            "model TEXT PRIMARY KEY, version TEXT NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "model TEXT NOT NULL, key TEXT NOT NULL, dim INTEGER NOT NULL, "
+            "vector BLOB NOT NULL, PRIMARY KEY (model, key))"
+        )
+        self._check_model_version()
+
+    @staticmethod
+    def content_key(text: str) -> str:
+        """Stable content hash used as the cache key"""
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def _check_model_version(self) -> None:
+        """Invalidate stored vectors if the model version changed"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT version FROM embedding_models WHERE model = ?",
+                (self.model_name,)
+            ).fetchone()
+            if row is not None and row[0] == self.model_version:
+                return
+            self._conn.execute("DELETE FROM embeddings WHERE model = ?", (self.model_name,))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO embedding_models (model, version) VALUES (?, ?)",
+                (self.model_name, self.model_version)
+            )
+            self._conn.commit()
+
+    def _remember(self, key: str, vector: np.ndarray) -> None:
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, np.ndarray]:
+        """Look up vectors for the given keys, memory first then SQLite"""
+        found: Dict[str, np.ndarray] = {}
+        missing: List[str] = []
+        with self._lock:
+            for key in keys:
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    found[key] = vector
+                else:
+                    missing.append(key)
+
+            # SQLite limits bound parameters, so query in chunks
+            for start in range(0, len(missing), 500):
+                chunk = missing[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, dim, vector FROM embeddings "
+                    f"WHERE model = ? AND key IN ({placeholders})",
+                    [self.model_name, *chunk]
+                ).fetchall()
+                for key, dim, blob in rows:
+                    vector = np.frombuffer(blob, dtype=np.float32, count=dim)
+                    found[key] = vector
+                    self._remember(key, vector)
+        return found
+
+    def put_many(self, items: Dict[str, np.ndarray]) -> None:
+        """Store vectors in memory and persist them to SQLite"""
+        if not items:
+            return
+        with self._lock:
+            rows = []
+            for key, vector in items.items():
+                vector = np.ascontiguousarray(vector, dtype=np.float32)
+                self._remember(key, vector)
+                rows.append((self.model_name, key, int(vector.shape[0]), vector.tobytes()))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, key, dim, vector) VALUES (?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+
+    def encode(
+        self,
+        texts: Sequence[str],
+        encoder: Callable[[List[str]], np.ndarray]
+    ) -> np.ndarray:
+        """Return embeddings for texts, calling encoder only for unseen content"""
+        keys = [self.content_key(text) for text in texts]
+        found = self.get_many(list(dict.fromkeys(keys)))
+
+        # Encode each unseen text once, even if it appears several times
+        pending: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in found and key not in pending:
+                pending[key] = text
+
+        self.hits += len(keys) - len(pending)
+        self.misses += len(pending)
+
+        if pending:
+            vectors = np.asarray(encoder(list(pending.values())), dtype=np.float32)
+            fresh = dict(zip(pending.keys(), vectors))
+            self.put_many(fresh)
+            found.update(fresh)
+
+        if not keys:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.vstack([found[key] for key in keys])
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache hit statistics"""
+        total = self.hits + self.misses
+        return {
+            "model": self.model_name,
+            "model_version": self.model_version,
+            "memory_items": len(self._memory),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else None
+        }
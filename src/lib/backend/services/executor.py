@@ -0,0 +1,177 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from ..config import settings
+
+def _timed_call(fn: Callable, args: Tuple, kwargs: Dict[str, Any]) -> Tuple[float, Any]:
+    """Run fn in a worker and report the wall-clock time it started"""
+    started = time.time()
+    return started, fn(*args, **kwargs)
+
+def encode_texts(model_name: str, texts: List[str]) -> Any:
+    """Encode texts with the worker's shared sentence model"""
+    from .model_registry import model_registry
+    return model_registry.get_sentence_model(model_name).encode(texts)
+
+class PoolMetrics:
+    """In-flight count and wait/run time counters for one pool"""
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.completed = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.total_run = 0.0
+
+    def on_submit(self) -> None:
+        with self._lock:
+            self.submitted += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def on_done(self, wait: float, run: float) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            self.completed += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            self.total_run += run
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "in_flight": self.in_flight,
+                # Work beyond the worker count is waiting in the pool's queue
+                "queue_depth": max(0, self.in_flight - self.workers),
+                "max_queue_depth": max(0, self.max_in_flight - self.workers),
+                "avg_wait_ms": self.total_wait / self.completed * 1000 if self.completed else 0.0,
+                "max_wait_ms": self.max_wait * 1000,
+                "avg_run_ms": self.total_run / self.completed * 1000 if self.completed else 0.0
+            }
+
+class BlockingExecutor:
+    """Runs blocking work off the event loop.
+
+    ``run_io`` uses a thread pool for file, database and other I/O bound calls.
+    ``run_cpu`` uses a separate pool for model inference; set
+    ``EXECUTOR_CPU_MODE=process`` to run it in worker processes (functions and
+    arguments must then be picklable). ``call_cpu`` is the synchronous variant
+    for code already running on an I/O thread.
+    """
+
+    def __init__(self, io_workers: int, cpu_workers: int, cpu_mode: str = "thread"):
+        self.io_workers = io_workers
+        self.cpu_workers = cpu_workers
+        self.cpu_mode = cpu_mode
+        self._io_pool: Optional[Executor] = None
+        self._cpu_pool: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self.io_metrics = PoolMetrics(io_workers)
+        self.cpu_metrics = PoolMetrics(cpu_workers)
+
+    @property
+    def io_pool(self) -> Executor:
+        if self._io_pool is None:
+            with self._lock:
+                if self._io_pool is None:
+                    self._io_pool = ThreadPoolExecutor(self.io_workers, thread_name_prefix="io")
+        return self._io_pool
+
+    @property
+    def cpu_pool(self) -> Executor:
+        if self._cpu_pool is None:
+            with self._lock:
+                if self._cpu_pool is None:
+                    if self.cpu_mode == "process":
+                        # spawn avoids forking a process that already holds model threads
+                        self._cpu_pool = ProcessPoolExecutor(
+                            self.cpu_workers,
+                            mp_context=multiprocessing.get_context("spawn")
+                        )
+                    else:
+                        self._cpu_pool = ThreadPoolExecutor(self.cpu_workers, thread_name_prefix="cpu")
+        return self._cpu_pool
+
+    @staticmethod
+    def _submit(pool: Executor, metrics: PoolMetrics, fn: Callable, args: Tuple, kwargs: Dict[str, Any]):
+        metrics.on_submit()
+        submitted = time.time()
+        future = pool.submit(_timed_call, fn, args, kwargs)
+
+        def record(done):
+            finished = time.time()
+            if done.cancelled() or done.exception() is not None:
+                metrics.on_done(finished - submitted, 0.0)
+                return
+            started, _ = done.result()
+            metrics.on_done(max(0.0, started - submitted), finished - started)
+
+        future.add_done_callback(record)
+        return future
+
+    async def run_io(self, fn: Callable, *args, **kwargs) -> Any:
+        """Await a blocking I/O call on the thread pool"""
+        future = self._submit(self.io_pool, self.io_metrics, fn, args, kwargs)
+        _, result = await asyncio.wrap_future(future)
+        return result
+
+    async def run_cpu(self, fn: Callable, *args, **kwargs) -> Any:
+        """Await a CPU-bound call (model inference, parsing) on the CPU pool"""
+        future = self._submit(self.cpu_pool, self.cpu_metrics, fn, args, kwargs)
+        _, result = await asyncio.wrap_future(future)
+        return result
+
+    def submit_cpu(self, fn: Callable, *args, **kwargs) -> Future:
+        """Start a CPU-bound call on the CPU pool without waiting; the future resolves to its result"""
+        timed = self._submit(self.cpu_pool, self.cpu_metrics, fn, args, kwargs)
+        future: Future = Future()
+
+        def unwrap(done):
+            if done.cancelled():
+                future.cancel()
+            elif done.exception() is not None:
+                future.set_exception(done.exception())
+            else:
+                future.set_result(done.result()[1])
+
+        timed.add_done_callback(unwrap)
+        return future
+
+    def call_cpu(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run a CPU-bound call on the CPU pool and block until it finishes"""
+        if threading.current_thread().name.startswith("cpu"):
+            # Already on a CPU worker thread; submitting again could deadlock
+            return fn(*args, **kwargs)
+        _, result = self._submit(self.cpu_pool, self.cpu_metrics, fn, args, kwargs).result()
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool sizes plus queue-depth and wait-time metrics"""
+        return {
+            "io": self.io_metrics.snapshot(),
+            "cpu": {"mode": self.cpu_mode, **self.cpu_metrics.snapshot()}
+        }
+
+    def shutdown(self) -> None:
+        for pool in (self._io_pool, self._cpu_pool):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+        self._io_pool = None
+        self._cpu_pool = None
+
+executor = BlockingExecutor(
+    io_workers=settings.EXECUTOR_IO_WORKERS,
+    cpu_workers=settings.EXECUTOR_CPU_WORKERS or os.cpu_count() or 1,
+    cpu_mode=settings.EXECUTOR_CPU_MODE
+)
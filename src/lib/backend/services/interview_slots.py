@@ -0,0 +1,265 @@
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta, timezone
+import asyncio
+import heapq
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from .. import models
+from ..config import settings
+
+EPOCH = datetime(1970, 1, 1)
+
+class SlotConflict(ValueError):
+    """Raised when an interview would overlap another for the same interviewer or candidate"""
+
+    def __init__(self, conflicts: List[str]):
+        super().__init__(f"Slot overlaps {len(conflicts)} existing interview(s)")
+        self.conflicts = conflicts
+
+def to_seconds(moment: datetime) -> float:
+    """Seconds since the epoch for a naive-UTC or aware datetime"""
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return (moment - EPOCH).total_seconds()
+
+def from_seconds(seconds: float) -> datetime:
+    return EPOCH + timedelta(seconds=seconds)
+
+class Schedule:
+    """One person's booked intervals as parallel lists sorted by start.
+
+    Overlap lookups bisect on start time: anything overlapping [start, end)
+    must start before ``end`` and no earlier than ``start - max_length``.
+    """
+
+    __slots__ = ("starts", "ends", "ids", "max_length")
+
+    def __init__(self):
+        self.starts: List[float] = []
+        self.ends: List[float] = []
+        self.ids: List[str] = []
+        self.max_length = 0.0
+
+    def add(self, start: float, end: float, interview_id: str) -> None:
+        i = bisect_right(self.starts, start)
+        self.starts.insert(i, start)
+        self.ends.insert(i, end)
+        self.ids.insert(i, interview_id)
+        self.max_length = max(self.max_length, end - start)
+
+    def remove(self, start: float, interview_id: str) -> None:
+        i = bisect_left(self.starts, start)
+        while i < len(self.starts) and self.starts[i] == start:
+            if self.ids[i] == interview_id:
+                del self.starts[i], self.ends[i], self.ids[i]
+                return
+            i += 1
+
+    def overlapping(self, start: float, end: float) -> List[str]:
+        lo = bisect_left(self.starts, start - self.max_length)
+        hi = bisect_left(self.starts, end)
+        return [self.ids[i] for i in range(lo, hi) if self.ends[i] > start]
+
+    def busy_from(self, moment: float) -> Iterator[Tuple[float, float]]:
+        """(start, end) of every interval still running at or after moment, by start"""
+        for i in range(bisect_left(self.starts, moment - self.max_length), len(self.starts)):
+            if self.ends[i] > moment:
+                yield self.starts[i], self.ends[i]
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+class InterviewSlotIndex:
+    """In-memory interval index over scheduled interviews, per interviewer and per candidate.
+
+    The interviewer of an interview is the owner of the job posting and the
+    candidate is the owner of the resume. ``refresh`` loads rows changed
+    since the last call (by ``updated_at``), so the first call reads the whole
+    table and later ones only the recent changes; cancelled interviews drop
+    out. Conflict checks and free-slot searches bisect per-person sorted
+    lists instead of scanning the ``interviews`` table.
+    """
+
+    def __init__(
+        self,
+        granularity_minutes: int = 15,
+        workday_start_hour: int = 9,
+        workday_end_hour: int = 17,
+        search_days: int = 60,
+        refresh_overlap_seconds: float = 5.0
+    ):
+        self.granularity = granularity_minutes * 60
+        self.workday_start = workday_start_hour * 3600
+        self.workday_end = workday_end_hour * 3600
+        self.search_days = search_days
+        self.refresh_overlap = timedelta(seconds=refresh_overlap_seconds)
+        self._schedules: Dict[str, Schedule] = {}
+        # interview id -> (interviewer id, candidate id, start, end)
+        self._entries: Dict[str, Tuple[str, str, float, float]] = {}
+        self._watermark: Optional[datetime] = None
+        self._refresh_lock: Optional[asyncio.Lock] = None
+        self.loaded = False
+        self.loaded_rows = 0
+
+    def _schedule(self, person_id: str) -> Schedule:
+        schedule = self._schedules.get(person_id)
+        if schedule is None:
+            schedule = self._schedules[person_id] = Schedule()
+        return schedule
+
+    def remove(self, interview_id: str) -> None:
+        entry = self._entries.pop(interview_id, None)
+        if entry is None:
+            return
+        interviewer_id, candidate_id, start, _ = entry
+        for person_id in (interviewer_id, candidate_id):
+            self._schedules[person_id].remove(start, interview_id)
+
+    def upsert(
+        self,
+        interview_id: str,
+        interviewer_id: str,
+        candidate_id: str,
+        scheduled_time: datetime,
+        duration_minutes: int,
+        active: bool = True
+    ) -> None:
+        """Add or move an interview; inactive ones are removed"""
+        self.remove(interview_id)
+        if not active or scheduled_time is None:
+            return
+        start = to_seconds(scheduled_time)
+        end = start + (duration_minutes or 0) * 60
+        self._entries[interview_id] = (interviewer_id, candidate_id, start, end)
+        self._schedule(interviewer_id).add(start, end, interview_id)
+        if candidate_id != interviewer_id:
+            self._schedule(candidate_id).add(start, end, interview_id)
+
+    async def refresh(self, db: AsyncSession, chunk_size: int = 10000) -> int:
+        """Apply interviews changed since the last refresh; returns rows read"""
+        if self._refresh_lock is None:
+            self._refresh_lock = asyncio.Lock()
+        async with self._refresh_lock:
+            query = select(
+                models.Interview.id,
+                models.Interview.scheduled_time,
+                models.Interview.duration_minutes,
+                models.Interview.status,
+                models.Interview.updated_at,
+                models.JobPosting.user_id.label("interviewer_id"),
+                models.Resume.user_id.label("candidate_id")
+            ).join(
+                models.Match, models.Match.id == models.Interview.match_id
+            ).join(
+                models.JobPosting, models.JobPosting.id == models.Match.job_id
+            ).join(
+                models.Resume, models.Resume.id == models.Match.resume_id
+            ).order_by(models.Interview.updated_at)
+            if self._watermark is not None:
+                # Re-read a short window so rows committed slightly out of timestamp order
+                # are not missed; reapplying a row is harmless
+                query = query.filter(models.Interview.updated_at >= self._watermark - self.refresh_overlap)
+
+            read = 0
+            result = await db.stream(query.execution_options(yield_per=chunk_size))
+            # Whole chunks per await; iterating rows one by one costs a greenlet switch each
+            async for rows in result.partitions():
+                for row in rows:
+                    self.upsert(
+                        row.id,
+                        row.interviewer_id,
+                        row.candidate_id,
+                        row.scheduled_time,
+                        row.duration_minutes,
+                        active=row.status != "cancelled"
+                    )
+                    if row.updated_at is not None and (self._watermark is None or row.updated_at > self._watermark):
+                        self._watermark = row.updated_at
+                read += len(rows)
+            self.loaded_rows += read
+            self.loaded = True
+            return read
+
+    async def ensure_loaded(self, db: AsyncSession) -> None:
+        """Wait for the initial full load, running it if nobody has started it"""
+        if not self.loaded:
+            await self.refresh(db)
+
+    def conflicts(
+        self,
+        interviewer_id: str,
+        candidate_id: str,
+        scheduled_time: datetime,
+        duration_minutes: int
+    ) -> List[str]:
+        """IDs of interviews overlapping the slot for either participant"""
+        start = to_seconds(scheduled_time)
+        end = start + duration_minutes * 60
+        found: Dict[str, None] = {}
+        for person_id in (interviewer_id, candidate_id):
+            schedule = self._schedules.get(person_id)
+            if schedule is not None:
+                found.update(dict.fromkeys(schedule.overlapping(start, end)))
+        return list(found)
+
+    def _align(self, moment: float) -> float:
+        """Round up to the slot grid, then into working hours"""
+        moment = -(-moment // self.granularity) * self.granularity
+        day = moment - moment % 86400
+        if moment < day + self.workday_start:
+            return day + self.workday_start
+        if moment >= day + self.workday_end:
+            return day + 86400 + self.workday_start
+        return moment
+
+    def free_slots(
+        self,
+        interviewer_id: str,
+        candidate_id: str,
+        duration_minutes: int,
+        after: datetime,
+        count: int = 5
+    ) -> List[datetime]:
+        """Earliest ``count`` slots after a moment where both participants are free"""
+        length = duration_minutes * 60
+        if length <= 0 or length > self.workday_end - self.workday_start:
+            return []
+        cursor = self._align(to_seconds(after))
+        horizon = cursor + self.search_days * 86400
+        schedules = [self._schedules.get(person_id) for person_id in {interviewer_id, candidate_id}]
+        busy = heapq.merge(*(schedule.busy_from(cursor) for schedule in schedules if schedule is not None))
+
+        slots: List[datetime] = []
+        next_busy = next(busy, None)
+        while len(slots) < count and cursor < horizon:
+            day_end = cursor - cursor % 86400 + self.workday_end
+            if cursor + length > day_end:
+                cursor = self._align(day_end)
+                continue
+            # Skip past anything that overlaps the candidate slot
+            while next_busy is not None and next_busy[1] <= cursor:
+                next_busy = next(busy, None)
+            if next_busy is not None and next_busy[0] < cursor + length:
+                cursor = self._align(next_busy[1])
+                continue
+            slots.append(from_seconds(cursor))
+            cursor = self._align(cursor + length)
+        return slots
+
+    def stats(self) -> Dict[str, Any]:
+        """Index size and refresh position"""
+        return {
+            "loaded": self.loaded,
+            "interviews": len(self._entries),
+            "people": len(self._schedules),
+            "loaded_rows": self.loaded_rows,
+            "watermark": self._watermark.isoformat() if self._watermark else None
+        }
+
+interview_slots = InterviewSlotIndex(
+    granularity_minutes=settings.INTERVIEW_SLOT_GRANULARITY_MINUTES,
+    workday_start_hour=settings.INTERVIEW_WORKDAY_START_HOUR,
+    workday_end_hour=settings.INTERVIEW_WORKDAY_END_HOUR,
+    search_days=settings.INTERVIEW_SLOT_SEARCH_DAYS
+)
@@ -0,0 +1,158 @@
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from ..config import settings
+from .executor import executor
+
+# Relative cache paths are resolved here rather than against the working directory
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class LLMCache:
+    """Prompt-hash keyed cache of LLM responses on local SQLite.
+
+    Entries expire after ``ttl_seconds`` and the least recently used ones are
+    evicted once more than ``max_entries`` are stored. Concurrent identical
+    requests are coalesced: later callers await the first caller's result
+    instead of issuing their own call. Caching is switched on per agent.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        ttl_seconds: int,
+        max_entries: int,
+        enabled_agents: Iterable[str]
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.enabled_agents = set(enabled_agents)
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_responses ("
+            "key TEXT PRIMARY KEY, agent TEXT NOT NULL, response TEXT NOT NULL, "
+            "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_llm_responses_accessed_at ON llm_responses (accessed_at)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(agent: str, model: str, messages: List[Dict[str, Any]]) -> str:
+        """Stable hash of everything that determines the response"""
+        payload = json.dumps({"agent": agent, "model": model, "messages": messages}, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _read(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM llm_responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if now - row[1] > self.ttl_seconds:
+                self._conn.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE llm_responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            return row[0]
+
+    def _write(self, key: str, agent: str, response: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_responses (key, agent, response, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, agent, response, now, now)
+            )
+            # Drop expired rows, then the least recently used beyond the size bound
+            self._conn.execute(
+                "DELETE FROM llm_responses WHERE created_at < ?", (now - self.ttl_seconds,)
+            )
+            self._conn.execute(
+                "DELETE FROM llm_responses WHERE key IN ("
+                "SELECT key FROM llm_responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+            self._conn.commit()
+
+    async def get_or_create(
+        self,
+        agent: str,
+        model: str,
+        messages: List[Dict[str, Any]],
+        call: Callable[[], Awaitable[str]]
+    ) -> str:
+        """Return the cached response for this prompt, calling the LLM at most once"""
+        if agent not in self.enabled_agents:
+            return await call()
+
+        key = self.make_key(agent, model, messages)
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            cached = await executor.run_io(self._read, key)
+            if cached is not None:
+                self.hits += 1
+                future.set_result(cached)
+                return cached
+
+            self.misses += 1
+            response = await call()
+            await executor.run_io(self._write, key, agent, response)
+            future.set_result(response)
+            return response
+        except asyncio.CancelledError:
+            if not future.done():
+                future.cancel()
+            raise
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+                # Mark the exception as retrieved when nobody else was waiting
+                future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit, miss and coalescing counters"""
+        total = self.hits + self.misses
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+        return {
+            "enabled_agents": sorted(self.enabled_agents),
+            "entries": entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": self.hits / total if total else None
+        }
+
+llm_cache = LLMCache(
+    db_path=os.path.join(BACKEND_DIR, settings.LLM_CACHE_PATH),
+    ttl_seconds=settings.LLM_CACHE_TTL_SECONDS,
+    max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+    enabled_agents=[agent.strip() for agent in settings.LLM_CACHE_AGENTS.split(",") if agent.strip()]
+)
@@ -0,0 +1,203 @@
+from typing import Any, Dict, List, Optional
+import asyncio
+import hashlib
+import json
+import random
+import time
+import openai
+from ..config import settings
+
+class TokenBucket:
+    """Async token bucket refilled continuously at ``per_minute / 60`` per second"""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = float(per_minute)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1.0) -> float:
+        """Wait until amount tokens are available and take them; returns seconds waited"""
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return waited
+                delay = (amount - self.tokens) / self.rate
+                await asyncio.sleep(delay)
+                waited += delay
+
+    def adjust(self, delta: float) -> None:
+        """Give back (positive) or take extra (negative) tokens once actual usage is known"""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + delta)
+
+class LLMClient:
+    """Shared, rate-aware async client for chat completions.
+
+    Every call passes a requests-per-minute and a tokens-per-minute token bucket
+    and a concurrency semaphore, runs with a per-call timeout and is retried with
+    full-jitter exponential backoff on rate limits, timeouts, connection errors
+    and 5xx responses. Identical in-flight requests share one call. Point
+    ``OPENAI_BASE_URL`` at a local fake server to exercise it without the API.
+    """
+
+    RETRYABLE_ERRORS = (
+        openai.RateLimitError,
+        openai.APITimeoutError,
+        openai.APIConnectionError,
+        openai.InternalServerError
+    )
+
+    def __init__(
+        self,
+        api_key: Optional[str],
+        base_url: Optional[str] = None,
+        max_concurrency: int = 8,
+        requests_per_minute: int = 500,
+        tokens_per_minute: int = 40000,
+        timeout_seconds: float = 60.0,
+        max_retries: int = 4,
+        retry_base_seconds: float = 1.0,
+        http_client: Any = None
+    ):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.max_concurrency = max_concurrency
+        self.timeout_seconds = timeout_seconds
+        self.max_retries = max_retries
+        self.retry_base_seconds = retry_base_seconds
+        self.http_client = http_client
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute)
+        self._client: Optional[openai.AsyncOpenAI] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.metrics: Dict[str, float] = {
+            "calls": 0,
+            "coalesced": 0,
+            "retries": 0,
+            "failures": 0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "total_latency": 0.0,
+            "max_latency": 0.0,
+            "rate_limit_wait": 0.0
+        }
+
+    @property
+    def client(self) -> openai.AsyncOpenAI:
+        if self._client is None:
+            # Retries are handled here, so the SDK's own retry loop is disabled
+            self._client = openai.AsyncOpenAI(
+                api_key=self.api_key,
+                base_url=self.base_url,
+                max_retries=0,
+                http_client=self.http_client
+            )
+        return self._client
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    @staticmethod
+    def estimate_tokens(messages: List[Dict[str, Any]]) -> int:
+        """Rough prompt size (about four characters per token) for rate limiting"""
+        return sum(len(str(message.get("content", ""))) for message in messages) // 4 + 1
+
+    async def chat(self, model: str, messages: List[Dict[str, Any]], **kwargs) -> str:
+        """Return the content of a chat completion"""
+        key = hashlib.sha256(
+            json.dumps({"model": model, "messages": messages, **kwargs}, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.metrics["coalesced"] += 1
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            content = await self._chat_with_retries(model, messages, **kwargs)
+            future.set_result(content)
+            return content
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _chat_with_retries(self, model: str, messages: List[Dict[str, Any]], **kwargs) -> str:
+        estimated = self.estimate_tokens(messages)
+        attempt = 0
+        while True:
+            self.metrics["rate_limit_wait"] += await self.request_bucket.acquire(1)
+            self.metrics["rate_limit_wait"] += await self.token_bucket.acquire(estimated)
+            try:
+                async with self.semaphore:
+                    started = time.perf_counter()
+                    response = await asyncio.wait_for(
+                        self.client.chat.completions.create(model=model, messages=messages, **kwargs),
+                        timeout=self.timeout_seconds
+                    )
+                    latency = time.perf_counter() - started
+            except (asyncio.TimeoutError, *self.RETRYABLE_ERRORS) as e:
+                attempt += 1
+                if attempt > self.max_retries:
+                    self.metrics["failures"] += 1
+                    raise
+                self.metrics["retries"] += 1
+                delay = random.uniform(0, self.retry_base_seconds * 2 ** (attempt - 1))
+                print(f"LLM call failed ({type(e).__name__}), retry {attempt} in {delay:.2f}s")
+                await asyncio.sleep(delay)
+                continue
+            except Exception:
+                self.metrics["failures"] += 1
+                raise
+
+            self.metrics["calls"] += 1
+            self.metrics["total_latency"] += latency
+            self.metrics["max_latency"] = max(self.metrics["max_latency"], latency)
+            usage = getattr(response, "usage", None)
+            if usage is not None:
+                self.metrics["prompt_tokens"] += usage.prompt_tokens or 0
+                self.metrics["completion_tokens"] += usage.completion_tokens or 0
+                # Settle the estimate against what the call actually consumed
+                self.token_bucket.adjust(estimated - (usage.total_tokens or 0))
+            return response.choices[0].message.content
+
+    def stats(self) -> Dict[str, Any]:
+        """Call, retry, token and latency metrics"""
+        calls = self.metrics["calls"]
+        return {
+            **self.metrics,
+            "avg_latency": self.metrics["total_latency"] / calls if calls else 0.0,
+            "max_concurrency": self.max_concurrency
+        }
+
+llm_client = LLMClient(
+    api_key=settings.OPENAI_API_KEY,
+    base_url=settings.OPENAI_BASE_URL,
+    max_concurrency=settings.LLM_MAX_CONCURRENCY,
+    requests_per_minute=settings.LLM_REQUESTS_PER_MINUTE,
+    tokens_per_minute=settings.LLM_TOKENS_PER_MINUTE,
+    timeout_seconds=settings.LLM_TIMEOUT_SECONDS,
+    max_retries=settings.LLM_MAX_RETRIES,
+    retry_base_seconds=settings.LLM_RETRY_BASE_SECONDS
+)
@@ -0,0 +1,329 @@
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime, timedelta
+from email.message import Message
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+import asyncio
+import smtplib
+import threading
+import time
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from .. import models
+from ..config import settings
+from ..database import AsyncSessionLocal, serialized_write
+from .executor import executor
+
+# (delivered, error, permanent) for each message in a batch
+SendResult = Tuple[bool, Optional[str], bool]
+
+def build_message(sender: str, recipient: str, subject: str, body: str, is_html: bool = False) -> Message:
+    """MIME message for one outbox row"""
+    message = MIMEMultipart()
+    message['From'] = sender
+    message['To'] = recipient
+    message['Subject'] = subject
+    message.attach(MIMEText(body, 'html' if is_html else 'plain'))
+    return message
+
+class SMTPBatchAborted(Exception):
+    """The SMTP session failed part way through a batch"""
+
+    def __init__(self, results: List[SendResult], error: Exception):
+        super().__init__(f"{type(error).__name__}: {error}")
+        self.results = results
+        self.error = error
+
+class SMTPConnection:
+    """One reusable SMTP session: connect, STARTTLS and login once, then many sends.
+
+    Blocking; the outbox calls it on the I/O pool. The session is checked with
+    NOOP before reuse and dropped after ``idle_seconds`` without traffic.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: Optional[str],
+        password: Optional[str],
+        starttls: bool,
+        timeout: float,
+        idle_seconds: float
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+        self.idle_seconds = idle_seconds
+        self._smtp: Optional[smtplib.SMTP] = None
+        self._last_used = 0.0
+        self._lock = threading.Lock()
+        self.connects = 0
+
+    def _connect(self) -> smtplib.SMTP:
+        smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            smtp.ehlo()
+            if self.starttls:
+                smtp.starttls()
+                smtp.ehlo()
+            if self.username and self.password:
+                smtp.login(self.username, self.password)
+        except Exception:
+            smtp.close()
+            raise
+        self.connects += 1
+        return smtp
+
+    def _session(self) -> smtplib.SMTP:
+        if self._smtp is not None:
+            idle = time.monotonic() - self._last_used
+            try:
+                if idle > self.idle_seconds or self._smtp.noop()[0] != 250:
+                    self._close()
+            except (smtplib.SMTPException, OSError):
+                self._close()
+        if self._smtp is None:
+            self._smtp = self._connect()
+        self._last_used = time.monotonic()
+        return self._smtp
+
+    def _close(self) -> None:
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except Exception:
+                pass
+        self._smtp = None
+
+    def _send_one(self, message: Message) -> SendResult:
+        """Send one message, reconnecting once if the session dropped.
+
+        Only refusals of this message (recipients or data) come back as a
+        result; connect, login, sender and transport errors are raised.
+        """
+        for retry in (False, True):
+            smtp = self._session()
+            try:
+                smtp.send_message(message)
+                return (True, None, False)
+            except smtplib.SMTPServerDisconnected:
+                self._close()
+                if retry:
+                    raise
+            except smtplib.SMTPRecipientsRefused as e:
+                codes = [code for code, _ in e.recipients.values()]
+                return (False, str(e.recipients), all(code >= 500 for code in codes))
+            except smtplib.SMTPDataError as e:
+                return (False, f"{e.smtp_code} {e.smtp_error!r}", e.smtp_code >= 500)
+
+    def send_batch(self, messages: List[Message]) -> List[SendResult]:
+        """Send messages over the shared session.
+
+        Raises SMTPBatchAborted, carrying the results so far, when the session
+        itself fails; the rest of the batch was not attempted.
+        """
+        results: List[SendResult] = []
+        with self._lock:
+            try:
+                for message in messages:
+                    results.append(self._send_one(message))
+            except (smtplib.SMTPException, OSError) as e:
+                self._close()
+                raise SMTPBatchAborted(results, e) from e
+        return results
+
+    def close(self) -> None:
+        with self._lock:
+            self._close()
+
+class MailOutbox:
+    """Durable outbound mail queue drained in batches by one background sender.
+
+    ``add`` writes a message into the ``email_outbox`` table on the caller's
+    session, so it commits (or rolls back) with the caller's own rows; call
+    ``wake`` after the commit. The sender claims due messages in batches,
+    delivers each batch over a single reused SMTP session and reschedules
+    failures with exponential backoff until ``max_attempts``. Messages claimed
+    when the process stopped are re-queued on ``start``, so delivery is at
+    least once.
+    """
+
+    def __init__(
+        self,
+        connection: SMTPConnection,
+        sender: Optional[str],
+        batch_size: int = 50,
+        max_attempts: int = 5,
+        backoff_seconds: float = 30.0,
+        poll_seconds: float = 5.0
+    ):
+        self.connection = connection
+        self.sender = sender
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self.poll_seconds = poll_seconds
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.batches = 0
+        self.sent = 0
+        self.retried = 0
+        self.failed = 0
+
+    def add(
+        self,
+        db: AsyncSession,
+        recipient: str,
+        subject: str,
+        body: str,
+        is_html: bool = False
+    ) -> models.OutboxMessage:
+        """Queue a message in the caller's transaction; the caller commits"""
+        message = models.OutboxMessage(
+            recipient=recipient,
+            subject=subject,
+            body=body,
+            is_html=is_html,
+            status="queued",
+            attempts=0,
+            next_attempt_at=datetime.utcnow()
+        )
+        db.add(message)
+        return message
+
+    def wake(self) -> None:
+        """Tell the sender new messages were committed"""
+        if self._wake is not None:
+            self._wake.set()
+
+    async def start(self) -> None:
+        """Re-queue interrupted sends and start the sender"""
+        if not self.sender:
+            print("Error starting mail sender: SMTP sender not configured, emails stay queued in the outbox")
+            return
+        async with AsyncSessionLocal() as db:
+            async with serialized_write():
+                await db.execute(
+                    update(models.OutboxMessage).where(
+                        models.OutboxMessage.status == "sending"
+                    ).values(status="queued")
+                )
+                await db.commit()
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the sender and close the SMTP session; queued mail stays in the table"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await executor.run_io(self.connection.close)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                claimed = await self.send_due()
+            except Exception as e:
+                print(f"Error sending queued emails: {str(e)}")
+                claimed = 0
+            if claimed == self.batch_size:
+                # More may be due; keep draining
+                continue
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    async def send_due(self) -> int:
+        """Claim and deliver one batch of due messages; returns how many were claimed.
+
+        If the SMTP session fails, the unsent part of the batch is re-queued
+        with backoff and the session error is raised.
+        """
+        async with AsyncSessionLocal() as db:
+            async with serialized_write():
+                rows = (await db.execute(
+                    select(models.OutboxMessage).filter(
+                        models.OutboxMessage.status == "queued",
+                        models.OutboxMessage.next_attempt_at <= datetime.utcnow()
+                    ).order_by(models.OutboxMessage.next_attempt_at).limit(self.batch_size)
+                )).scalars().all()
+                if not rows:
+                    return 0
+                for row in rows:
+                    row.status = "sending"
+                await db.commit()
+
+            error: Optional[Exception] = None
+            try:
+                results = await executor.run_io(self.connection.send_batch, [
+                    build_message(self.sender, row.recipient, row.subject, row.body, row.is_html)
+                    for row in rows
+                ])
+            except SMTPBatchAborted as e:
+                results, error = e.results, e
+            except Exception as e:
+                results, error = [], e
+            # Messages the aborted session never reached go back on the retry schedule
+            results = results + [(False, str(error), False)] * (len(rows) - len(results))
+
+            now = datetime.utcnow()
+            async with serialized_write():
+                for row, (delivered, row_error, permanent) in zip(rows, results):
+                    row.attempts = (row.attempts or 0) + 1
+                    if delivered:
+                        row.status = "sent"
+                        row.sent_at = now
+                        row.last_error = None
+                        self.sent += 1
+                    elif permanent or row.attempts >= self.max_attempts:
+                        row.status = "failed"
+                        row.last_error = row_error
+                        self.failed += 1
+                    else:
+                        row.status = "queued"
+                        row.last_error = row_error
+                        row.next_attempt_at = now + timedelta(
+                            seconds=self.backoff_seconds * 2 ** (row.attempts - 1)
+                        )
+                        self.retried += 1
+                await db.commit()
+            self.batches += 1
+            if error is not None:
+                raise error
+            return len(rows)
+
+    def stats(self) -> Dict[str, Any]:
+        """Delivery counters for this process"""
+        return {
+            "configured": bool(self.sender),
+            "running": self._task is not None,
+            "batches": self.batches,
+            "sent": self.sent,
+            "retried": self.retried,
+            "failed": self.failed,
+            "smtp_connects": self.connection.connects
+        }
+
+mail_outbox = MailOutbox(
+    connection=SMTPConnection(
+        host=settings.SMTP_HOST,
+        port=settings.SMTP_PORT,
+        username=settings.SMTP_USERNAME,
+        password=settings.SMTP_PASSWORD,
+        starttls=settings.SMTP_STARTTLS,
+        timeout=settings.SMTP_TIMEOUT_SECONDS,
+        idle_seconds=settings.SMTP_IDLE_SECONDS
+    ),
+    sender=settings.SMTP_FROM or settings.SMTP_USERNAME,
+    batch_size=settings.OUTBOX_BATCH_SIZE,
+    max_attempts=settings.OUTBOX_MAX_ATTEMPTS,
+    backoff_seconds=settings.OUTBOX_RETRY_BACKOFF_SECONDS,
+    poll_seconds=settings.OUTBOX_POLL_SECONDS
+)
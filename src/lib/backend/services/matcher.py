@@ -1,15 +1,45 @@
-from typing import Dict, List, Any
-from sentence_transformers import SentenceTransformer
+from typing import Dict, List, Any, Tuple
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
-import spacy
+import json
 from ..agents import MatchingAgent
+from ..config import settings
+from .embedding_cache import EmbeddingCache
+from .model_registry import model_registry
+from .executor import executor
+from .embedding_batcher import embedding_batcher
 
 class Matcher:
+    SKILL_WEIGHT = 0.6
+    EXPERIENCE_WEIGHT = 0.4
+    SKILL_MATCH_THRESHOLD = 0.8
+    EXPERIENCE_RELEVANCE_THRESHOLD = 0.6
+
     def __init__(self):
-        self.model = SentenceTransformer('all-MiniLM-L6-v2')
-        self.nlp = spacy.load("en_core_web_sm")
         self.matching_agent = MatchingAgent()
+        self.embeddings = EmbeddingCache(
+            model_name=settings.EMBEDDING_MODEL,
+            model_version=settings.EMBEDDING_MODEL_VERSION,
+            db_path=settings.EMBEDDING_CACHE_PATH,
+            max_memory_items=settings.EMBEDDING_CACHE_MEMORY_ITEMS
+        )
+
+    @property
+    def model(self):
+        """Shared sentence model, loaded on first use"""
+        return model_registry.get_sentence_model(settings.EMBEDDING_MODEL)
+
+    @property
+    def nlp(self):
+        """Shared spaCy pipeline, loaded on first use"""
+        return model_registry.get_nlp()
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """Encode texts, reusing cached embeddings for previously seen content"""
+        return self.embeddings.encode(texts, self._encode_uncached)
+
+    def _encode_uncached(self, texts: List[str]) -> np.ndarray:
+        """Run the sentence model, batched with other concurrent requests"""
+        return embedding_batcher.encode_blocking(texts)
 
     def extract_skills(self, text: str) -> List[str]:
         """Extract skills from text using spaCy"""
@@ -23,22 +53,36 @@ class Matcher:
         
         return list(set(skills))
 
+    @staticmethod
+    def normalize(embeddings: np.ndarray) -> np.ndarray:
+        """L2-normalize rows so dot products are cosine similarities"""
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        return embeddings / np.maximum(norms, 1e-12)
+
+    def skill_similarity_matrix(self, job_skills: List[str], cv_skills: List[str]) -> np.ndarray:
+        """Cosine similarity of every (job skill, cv skill) pair from one batched encode"""
+        if not job_skills or not cv_skills:
+            return np.zeros((len(job_skills), len(cv_skills)), dtype=np.float32)
+        
+        embeddings = self.normalize(self.encode(list(job_skills) + list(cv_skills)))
+        job_embeddings = embeddings[:len(job_skills)]
+        cv_embeddings = embeddings[len(job_skills):]
+        return job_embeddings @ cv_embeddings.T
+
     def calculate_skill_match(self, job_skills: List[str], cv_skills: List[str]) -> float:
         """Calculate skill match percentage"""
         if not job_skills or not cv_skills:
             return 0.0
         
-        # Convert skills to embeddings
-        job_embeddings = self.model.encode(job_skills)
-        cv_embeddings = self.model.encode(cv_skills)
-        
-        # Calculate similarity matrix
-        similarity_matrix = cosine_similarity(job_embeddings, cv_embeddings)
-        
-        # Get best match for each job skill
+        similarity_matrix = self.skill_similarity_matrix(job_skills, cv_skills)
+        return self.skill_score(similarity_matrix)
+
+    @staticmethod
+    def skill_score(similarity_matrix: np.ndarray) -> float:
+        """Average best match for each job skill, as a percentage"""
+        if similarity_matrix.size == 0:
+            return 0.0
         best_matches = np.max(similarity_matrix, axis=1)
-        
-        # Calculate average match score
         return float(np.mean(best_matches) * 100)
 
     def calculate_experience_match(self, job_description: str, cv_experience: List[Dict]) -> float:
@@ -50,45 +94,59 @@ class Matcher:
         experience_text = " ".join([exp.get("description", "") for exp in cv_experience])
         
         # Calculate similarity between job description and experience
-        job_embedding = self.model.encode([job_description])
-        exp_embedding = self.model.encode([experience_text])
-        
-        similarity = cosine_similarity(job_embedding, exp_embedding)[0][0]
-        return float(similarity * 100)
+        embeddings = self.normalize(self.encode([job_description, experience_text]))
+        similarity = float(embeddings[0] @ embeddings[1])
+        return similarity * 100
 
-    async def match_cv_with_job(self, 
-                              job_data: Dict[str, Any], 
-                              cv_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Match CV with job posting and return detailed analysis"""
+    @staticmethod
+    def job_data_from_posting(job: Any) -> Dict[str, Any]:
+        """Build matcher input from a JobPosting row"""
+        return {
+            "title": job.title,
+            "description": job.description,
+            "skills_required": job.skills_required or []
+        }
+
+    @staticmethod
+    def cv_data_from_resume(resume: Any) -> Dict[str, Any]:
+        """Build matcher input from a Resume row"""
+        return {
+            "raw_text": json.dumps(resume.parsed_data) if resume.parsed_data else "",
+            "skills": resume.skills or [],
+            "experience": resume.experience or [],
+            "education": resume.education or []
+        }
+
+    def score_cv_with_job(self,
+                          job_data: Dict[str, Any],
+                          cv_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Compute the numeric match scores and skill breakdown without the LLM analysis"""
         
         # Extract skills
         job_skills = job_data.get("skills_required", [])
         cv_skills = cv_data.get("skills", [])
         
-        # Calculate different match components
-        skill_match = self.calculate_skill_match(job_skills, cv_skills)
+        # Score, matched and missing skills all come from one similarity matrix
+        similarity_matrix = self.skill_similarity_matrix(job_skills, cv_skills)
+        skill_match = self.skill_score(similarity_matrix)
+        matched_skills, missing_skills = self.split_skills(job_skills, similarity_matrix)
+        
         experience_match = self.calculate_experience_match(
             job_data.get("description", ""),
             cv_data.get("experience", [])
         )
         
-        # Get detailed AI analysis
-        analysis = await self.matching_agent.analyze_match(
-            job_data.get("description", ""),
-            cv_data.get("raw_text", "")
-        )
-        
         # Calculate overall match score
-        overall_score = (skill_match * 0.6 + experience_match * 0.4)
+        overall_score = (skill_match * self.SKILL_WEIGHT + experience_match * self.EXPERIENCE_WEIGHT)
         
         return {
             "match_score": overall_score,
             "skill_match": skill_match,
             "experience_match": experience_match,
-            "analysis": analysis.get("analysis", ""),
+            "analysis": "",
             "matching_details": {
-                "matched_skills": self._get_matching_skills(job_skills, cv_skills),
-                "missing_skills": self._get_missing_skills(job_skills, cv_skills),
+                "matched_skills": matched_skills,
+                "missing_skills": missing_skills,
                 "experience_analysis": self._analyze_experience(
                     job_data.get("description", ""),
                     cv_data.get("experience", [])
@@ -96,36 +154,61 @@ class Matcher:
             }
         }
 
+    async def match_cv_with_job(self, 
+                              job_data: Dict[str, Any], 
+                              cv_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Match CV with job posting and return detailed analysis"""
+        result = await executor.run_io(self.score_cv_with_job, job_data, cv_data)
+        
+        # Get detailed AI analysis
+        analysis = await self.matching_agent.analyze_match(
+            job_data.get("description", ""),
+            cv_data.get("raw_text", "")
+        )
+        result["analysis"] = analysis.get("analysis", "")
+        return result
+
+    def split_skills(self, job_skills: List[str], similarity_matrix: np.ndarray) -> Tuple[List[str], List[str]]:
+        """Split job skills into (matched, missing) using a precomputed similarity matrix"""
+        if similarity_matrix.size == 0:
+            return [], list(job_skills)
+        
+        is_matched = np.any(similarity_matrix > self.SKILL_MATCH_THRESHOLD, axis=1)
+        matched = [skill for skill, hit in zip(job_skills, is_matched) if hit]
+        missing = [skill for skill, hit in zip(job_skills, is_matched) if not hit]
+        return matched, missing
+
     def _get_matching_skills(self, job_skills: List[str], cv_skills: List[str]) -> List[str]:
         """Get list of matching skills"""
-        return [skill for skill in job_skills if any(
-            self._is_skill_match(skill, cv_skill) for cv_skill in cv_skills
-        )]
+        return self.split_skills(job_skills, self.skill_similarity_matrix(job_skills, cv_skills))[0]
 
     def _get_missing_skills(self, job_skills: List[str], cv_skills: List[str]) -> List[str]:
         """Get list of missing skills"""
-        return [skill for skill in job_skills if not any(
-            self._is_skill_match(skill, cv_skill) for cv_skill in cv_skills
-        )]
+        return self.split_skills(job_skills, self.skill_similarity_matrix(job_skills, cv_skills))[1]
 
     def _is_skill_match(self, skill1: str, skill2: str) -> bool:
         """Check if two skills match using embedding similarity"""
-        embeddings = self.model.encode([skill1, skill2])
-        similarity = cosine_similarity([embeddings[0]], [embeddings[1]])[0][0]
-        return similarity > 0.8
+        return bool(self.skill_similarity_matrix([skill1], [skill2])[0, 0] > self.SKILL_MATCH_THRESHOLD)
 
     def _analyze_experience(self, job_description: str, cv_experience: List[Dict]) -> Dict[str, Any]:
         """Analyze experience match in detail"""
+        relevant_experience = []
+        if cv_experience:
+            # Encode the job description and every experience entry in one batch
+            descriptions = [exp.get("description", "") for exp in cv_experience]
+            embeddings = self.normalize(self.encode([job_description] + descriptions))
+            similarities = embeddings[1:] @ embeddings[0]
+            relevant_experience = [
+                exp for exp, similarity in zip(cv_experience, similarities)
+                if similarity > self.EXPERIENCE_RELEVANCE_THRESHOLD
+            ]
+        
         return {
             "total_years": sum(float(exp.get("duration_years", 0)) for exp in cv_experience),
-            "relevant_experience": [
-                exp for exp in cv_experience
-                if self._is_experience_relevant(job_description, exp.get("description", ""))
-            ]
+            "relevant_experience": relevant_experience
         }
 
     def _is_experience_relevant(self, job_description: str, experience_description: str) -> bool:
         """Check if experience is relevant to job description"""
-        embeddings = self.model.encode([job_description, experience_description])
-        similarity = cosine_similarity([embeddings[0]], [embeddings[1]])[0][0]
-        return similarity > 0.6 
\ No newline at end of file
+        embeddings = self.normalize(self.encode([job_description, experience_description]))
+        return bool(embeddings[0] @ embeddings[1] > self.EXPERIENCE_RELEVANCE_THRESHOLD)
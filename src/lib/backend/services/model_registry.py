@@ -0,0 +1,82 @@
+from typing import Any, Callable, Dict, List, Optional
+import threading
+import time
+from ..config import settings
+
+class ModelRegistry:
+    """Process-wide, lazily loaded registry of NLP models.
+
+    Every service asks the registry for its models instead of loading its own
+    copy, so each process holds one instance of each model. Call ``preload``
+    before the server forks workers (e.g. ``gunicorn --preload``) to load models
+    once in the parent and share their memory pages copy-on-write.
+    """
+
+    def __init__(self):
+        self._models: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._warmup_hooks: List[Callable[["ModelRegistry"], None]] = []
+        self.load_seconds: Dict[str, float] = {}
+        self.warmup_seconds: Optional[float] = None
+
+    def _get(self, key: str, loader: Callable[[], Any]) -> Any:
+        model = self._models.get(key)
+        if model is not None:
+            return model
+        with self._lock:
+            model = self._models.get(key)
+            if model is None:
+                started = time.perf_counter()
+                model = loader()
+                self.load_seconds[key] = time.perf_counter() - started
+                self._models[key] = model
+        return model
+
+    def get_sentence_model(self, name: Optional[str] = None) -> Any:
+        """Shared SentenceTransformer instance"""
+        name = name or settings.EMBEDDING_MODEL
+
+        def load():
+            from sentence_transformers import SentenceTransformer
+            return SentenceTransformer(name)
+
+        return self._get(f"sentence_transformer:{name}", load)
+
+    def get_nlp(self, name: Optional[str] = None) -> Any:
+        """Shared spaCy pipeline"""
+        name = name or settings.SPACY_MODEL
+
+        def load():
+            import spacy
+            return spacy.load(name)
+
+        return self._get(f"spacy:{name}", load)
+
+    def add_warmup_hook(self, hook: Callable[["ModelRegistry"], None]) -> None:
+        """Register a callable run by ``warm_up`` after models are loaded"""
+        self._warmup_hooks.append(hook)
+
+    def preload(self) -> None:
+        """Load the default models now instead of on first use"""
+        self.get_sentence_model()
+        self.get_nlp()
+
+    def warm_up(self) -> None:
+        """Load the default models and run one inference pass plus any registered hooks"""
+        started = time.perf_counter()
+        self.preload()
+        self.get_sentence_model().encode(["warm up"])
+        self.get_nlp()("warm up")
+        for hook in self._warmup_hooks:
+            hook(self)
+        self.warmup_seconds = time.perf_counter() - started
+
+    def stats(self) -> Dict[str, Any]:
+        """Loaded models and startup timings"""
+        return {
+            "loaded": sorted(self._models),
+            "load_seconds": dict(self.load_seconds),
+            "warmup_seconds": self.warmup_seconds
+        }
+
+model_registry = ModelRegistry()
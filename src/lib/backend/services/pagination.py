@@ -0,0 +1,141 @@
+from typing import Any, AsyncIterator, Callable, List, Optional
+from datetime import datetime
+import base64
+import enum
+import json
+from sqlalchemy import and_, or_, select
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded"""
+
+class InvalidFields(ValueError):
+    """Raised when a fields= projection names unknown fields"""
+
+def encode_cursor(*values: Any) -> str:
+    """Opaque keyset cursor for the last row of a page"""
+    payload = json.dumps(values, default=str, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: Optional[str], size: int) -> Optional[List[Any]]:
+    """Decode a cursor produced by encode_cursor into its key values"""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor("Invalid cursor") from e
+    if not isinstance(values, list) or len(values) != size:
+        raise InvalidCursor("Invalid cursor")
+    return values
+
+def select_fields(fields: Optional[str], allowed: List[str]) -> List[str]:
+    """Parse a comma-separated fields= projection; all allowed fields when empty"""
+    if not fields:
+        return list(allowed)
+    names = list(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    unknown = [name for name in names if name not in allowed]
+    if unknown or not names:
+        raise InvalidFields(f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(allowed)}")
+    return names
+
+def keyset_page_query(model: Any, fields: List[str], limit: int, cursor: Optional[str], *filters: Any):
+    """Newest-first page on (created_at, id), selecting only the requested columns.
+
+    One extra row is fetched to tell whether another page follows. Legacy rows
+    with a NULL created_at are left out.
+    """
+    after = decode_cursor(cursor, 2)
+    columns = [getattr(model, name) for name in dict.fromkeys([*fields, "created_at", "id"])]
+    # Rows without created_at have no place in the keyset order and cannot end a page
+    query = select(*columns).filter(model.created_at.isnot(None), *filters)
+    if after is not None:
+        try:
+            last_created_at, last_id = datetime.fromisoformat(after[0]), str(after[1])
+        except (TypeError, ValueError) as e:
+            raise InvalidCursor("Invalid cursor") from e
+        # The leading <= bound lets the (created_at, id) index seek straight to the cursor
+        query = query.filter(
+            model.created_at <= last_created_at,
+            or_(
+                model.created_at < last_created_at,
+                and_(model.created_at == last_created_at, model.id < last_id)
+            )
+        )
+    return query.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1)
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    raise TypeError(f"Cannot encode {type(value).__name__}")
+
+async def _json_page_chunks(
+    session_factory: Callable,
+    query: Any,
+    fields: List[str],
+    limit: int,
+    chunk_bytes: int,
+    partition_rows: int
+) -> AsyncIterator[bytes]:
+    buffer: List[bytes] = [b'{"items":[']
+    size = 0
+    count = 0
+    last = None
+    has_more = False
+    async with session_factory() as db:
+        result = await db.stream(query.execution_options(yield_per=partition_rows))
+        try:
+            async for rows in result.partitions():
+                for row in rows:
+                    if count == limit:
+                        has_more = True
+                        break
+                    item = json.dumps({name: getattr(row, name) for name in fields}, default=_json_default).encode("utf-8")
+                    buffer.append(b"," + item if count else item)
+                    size += len(item)
+                    count += 1
+                    last = row
+                if has_more:
+                    break
+                # Only whole partitions are flushed, so the first yield comes after the first one is encoded
+                if size >= chunk_bytes:
+                    yield b"".join(buffer)
+                    buffer = []
+                    size = 0
+        finally:
+            await result.close()
+    next_cursor = encode_cursor(last.created_at.isoformat(), last.id) if has_more else None
+    buffer.append(b'],"next_cursor":' + json.dumps(next_cursor).encode("utf-8") + b"}")
+    yield b"".join(buffer)
+
+async def stream_json_page(
+    session_factory: Callable,
+    query: Any,
+    fields: List[str],
+    limit: int,
+    chunk_bytes: int = 64 * 1024,
+    partition_rows: int = 100
+) -> AsyncIterator[bytes]:
+    """Stream {"items": [...], "next_cursor": ...} for a keyset_page_query.
+
+    Rows are read in partitions through a server-side cursor on a session
+    owned by the stream, so neither the rows nor the encoded body are held in
+    full. The query runs and its first partition is encoded before this
+    returns, so a failing query or row raises here, while the caller can still
+    answer with an error status, instead of truncating a 200 body.
+    """
+    chunks = _json_page_chunks(session_factory, query, fields, limit, chunk_bytes, partition_rows)
+    try:
+        first = await chunks.__anext__()
+    except BaseException:
+        await chunks.aclose()
+        raise
+
+    async def body() -> AsyncIterator[bytes]:
+        yield first
+        async for chunk in chunks:
+            yield chunk
+
+    return body()
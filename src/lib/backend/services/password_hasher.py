@@ -0,0 +1,100 @@
+from typing import Any, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import os
+import threading
+import time
+from passlib.context import CryptContext
+from ..config import settings
+from .executor import PoolMetrics
+
+class HasherBusy(Exception):
+    """Raised when too many password hashes are already queued"""
+
+class PasswordHasher:
+    """Runs bcrypt on a dedicated, bounded thread pool.
+
+    bcrypt releases the GIL while hashing, so a small pool keeps a burst of
+    logins off the event loop without starving the shared I/O pool. At most
+    ``max_pending`` calls may be running or queued; beyond that ``hash`` and
+    ``verify`` raise ``HasherBusy`` instead of growing the queue, so callers
+    can shed load with a 503.
+    """
+
+    def __init__(self, rounds: int, workers: int, max_pending: int):
+        self.context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds)
+        self.rounds = rounds
+        self.workers = workers
+        self.max_pending = max_pending
+        self.metrics = PoolMetrics(workers)
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.rejected = 0
+
+    @property
+    def pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix="bcrypt")
+        return self._pool
+
+    def _timed(self, fn, *args) -> Any:
+        started = time.time()
+        return started, fn(*args)
+
+    async def _run(self, fn, *args) -> Any:
+        with self._lock:
+            if self.metrics.in_flight >= self.max_pending:
+                self.rejected += 1
+                raise HasherBusy("Too many password operations in progress, retry shortly")
+            self.metrics.on_submit()
+        submitted = time.time()
+        try:
+            future = self.pool.submit(self._timed, fn, *args)
+        except BaseException:
+            self.metrics.on_done(0.0, 0.0)
+            raise
+
+        def release(done):
+            # Runs when the bcrypt call really ends; an awaiting request that was
+            # cancelled cannot stop a call already running, so it keeps its slot
+            finished = time.time()
+            if done.cancelled() or done.exception() is not None:
+                self.metrics.on_done(finished - submitted, 0.0)
+                return
+            started, _ = done.result()
+            self.metrics.on_done(max(0.0, started - submitted), finished - started)
+
+        future.add_done_callback(release)
+        _, result = await asyncio.wrap_future(future)
+        return result
+
+    async def hash(self, password: str) -> str:
+        """Hash a password at the configured cost factor"""
+        return await self._run(self.context.hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        """Check a password against a stored hash"""
+        return await self._run(self.context.verify, password, hashed_password)
+
+    def stats(self) -> Dict[str, Any]:
+        """Cost factor, queue depth, wait times and rejections"""
+        return {
+            "rounds": self.rounds,
+            "max_pending": self.max_pending,
+            "rejected": self.rejected,
+            **self.metrics.snapshot()
+        }
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+        self._pool = None
+
+_workers = settings.PASSWORD_HASH_WORKERS or os.cpu_count() or 1
+password_hasher = PasswordHasher(
+    rounds=settings.BCRYPT_ROUNDS,
+    workers=_workers,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING or _workers * 16
+)
@@ -0,0 +1,90 @@
+from typing import Any, Dict, Optional
+import os
+import threading
+from sqlalchemy.ext.asyncio import AsyncSession
+from .. import models
+from ..database import insert_ignoring_duplicates, serialized_write
+from .executor import executor
+
+class ResumeStore:
+    """Content-addressed store for uploaded resumes and their processing results.
+
+    Raw files live at ``{root}/{sha[:2]}/{sha}`` and the extracted text and
+    parsed LLM output are kept in ``resume_contents`` under the same hash, so an
+    identical re-upload skips both text extraction and the parsing call.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def blob_path(self, sha256: str) -> str:
+        return os.path.join(self.root, sha256[:2], sha256)
+
+    async def lookup(self, db: AsyncSession, sha256: str) -> Optional[models.ResumeContent]:
+        """Return stored results for this content, counting the hit or miss"""
+        content = await db.get(models.ResumeContent, sha256)
+        if (
+            content is not None
+            and content.parsed_data is not None
+            and await executor.run_io(os.path.exists, content.file_path)
+        ):
+            async with serialized_write():
+                content.reuse_count = (content.reuse_count or 0) + 1
+                await db.commit()
+            with self._lock:
+                self.hits += 1
+            return content
+        with self._lock:
+            self.misses += 1
+        return None
+
+    async def store_file(self, spooled_path: str, sha256: str) -> str:
+        """Move a spooled upload into the store, dropping it if the blob already exists"""
+        def run():
+            path = self.blob_path(sha256)
+            if os.path.exists(path):
+                os.remove(spooled_path)
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(spooled_path, path)
+            return path
+        return await executor.run_io(run)
+
+    async def save(
+        self,
+        db: AsyncSession,
+        sha256: str,
+        file_path: str,
+        file_type: str,
+        size_bytes: int,
+        extracted_text: str,
+        parsed_data: Dict[str, Any]
+    ) -> models.ResumeContent:
+        """Record extraction and parsing results for this content"""
+        async with serialized_write():
+            # A concurrent upload of the same bytes (or another process) may have
+            # inserted the row since lookup; keep it and overwrite its results
+            await db.execute(
+                insert_ignoring_duplicates(models.ResumeContent.__table__).values(sha256=sha256, reuse_count=0)
+            )
+            content = await db.get(models.ResumeContent, sha256, populate_existing=True)
+            content.file_path = file_path
+            content.file_type = file_type
+            content.size_bytes = size_bytes
+            content.extracted_text = extracted_text
+            content.parsed_data = parsed_data
+            await db.commit()
+        return content
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit-rate statistics since process start"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else None
+            }
@@ -0,0 +1,47 @@
+from typing import Any, Iterable, List, Type
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from .. import models
+
+def normalize_skill(name: Any) -> str:
+    """Dictionary key for a skill: lowercase with single spaces"""
+    return " ".join(str(name).lower().split())
+
+def unique_skills(skills: Iterable[Any]) -> List[str]:
+    """Normalized, de-duplicated skill names in their original order"""
+    names = (normalize_skill(skill) for skill in skills or [])
+    return list(dict.fromkeys(name for name in names if name))
+
+def skill_filter(link_model: Type[Any], owner_column: Any, skills: List[str], match_all: bool = True):
+    """SQL condition selecting owners linked to all (or any) of the given skills"""
+    names = unique_skills(skills)
+    query = select(link_model.owner_id).join(
+        models.Skill, models.Skill.id == link_model.skill_id
+    ).filter(models.Skill.name.in_(names))
+    if match_all:
+        query = query.group_by(link_model.owner_id).having(func.count() == len(names))
+    return owner_column.in_(query)
+
+async def link_skills(db: AsyncSession, link_model: Type[Any], owner_id: str, skills: Iterable[Any]) -> None:
+    """Add join rows from an owner to its skills, creating missing dictionary entries.
+
+    Runs inside the caller's transaction; the caller commits.
+    """
+    names = unique_skills(skills)
+    if not names:
+        return
+    existing = {
+        skill.name: skill.id
+        for skill in (await db.execute(
+            select(models.Skill).filter(models.Skill.name.in_(names))
+        )).scalars()
+    }
+    missing = [models.Skill(name=name) for name in names if name not in existing]
+    if missing:
+        db.add_all(missing)
+        await db.flush()
+        existing.update((skill.name, skill.id) for skill in missing)
+    db.add_all(
+        link_model(owner_id=owner_id, skill_id=existing[name], position=position)
+        for position, name in enumerate(names)
+    )
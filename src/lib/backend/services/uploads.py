@@ -0,0 +1,56 @@
+from typing import Tuple
+from fastapi import UploadFile
+import hashlib
+import os
+import uuid
+from .executor import executor
+
+class UploadTooLarge(Exception):
+    """Raised when an upload exceeds the configured size cap"""
+
+    def __init__(self, max_bytes: int):
+        super().__init__(f"File exceeds the {max_bytes} byte upload limit")
+        self.max_bytes = max_bytes
+
+async def spool_upload(
+    file: UploadFile,
+    dest_path: str,
+    max_bytes: int,
+    chunk_size: int = 1024 * 1024
+) -> Tuple[int, str]:
+    """
+    Stream an upload to disk in chunks, hashing it on the way.
+
+    The file is written to a temporary name next to dest_path and renamed once
+    complete, so peak memory is one chunk regardless of file size.
+
+    Returns:
+        (size in bytes, sha256 hex digest)
+
+    Raises:
+        UploadTooLarge: if more than max_bytes are received; nothing is kept
+    """
+    os.makedirs(os.path.dirname(dest_path) or ".", exist_ok=True)
+    tmp_path = f"{dest_path}.{uuid.uuid4().hex}.part"
+    digest = hashlib.sha256()
+    size = 0
+
+    out = await executor.run_io(open, tmp_path, "wb")
+    try:
+        while True:
+            chunk = await file.read(chunk_size)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > max_bytes:
+                raise UploadTooLarge(max_bytes)
+            digest.update(chunk)
+            await executor.run_io(out.write, chunk)
+    except BaseException:
+        out.close()
+        os.remove(tmp_path)
+        raise
+
+    out.close()
+    await executor.run_io(os.replace, tmp_path, dest_path)
+    return size, digest.hexdigest()
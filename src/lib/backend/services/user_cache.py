@@ -0,0 +1,103 @@
+from typing import Any, Dict, Optional
+from collections import OrderedDict
+import threading
+import time
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+from .. import models
+from ..config import settings
+
+class UserCache:
+    """In-process LRU of authenticated user principals keyed by token subject.
+
+    Entries hold only the fields requests need (id, email, full_name, role)
+    and expire after ``ttl_seconds``. Any ORM update or delete of a User
+    drops its entry at flush and again after the commit, so a request that
+    reloads the old row in between cannot keep it cached, and role changes
+    apply on the next request.
+    """
+
+    FIELDS = ("id", "email", "full_name", "role")
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Cached principal for a user, or None when absent or expired"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[user_id]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, user: models.User) -> Dict[str, Any]:
+        """Cache the principal for a freshly loaded user and return it"""
+        principal = {field: getattr(user, field) for field in self.FIELDS}
+        if self.max_entries <= 0 or self.ttl_seconds <= 0:
+            return principal
+        with self._lock:
+            self._entries[user.id] = (time.monotonic() + self.ttl_seconds, principal)
+            self._entries.move_to_end(user.id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return principal
+
+    def invalidate(self, user_id: str) -> None:
+        with self._lock:
+            if self._entries.pop(user_id, None) is not None:
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit, miss and invalidation counters"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "hit_rate": self.hits / total if total else None
+            }
+
+user_cache = UserCache(
+    ttl_seconds=settings.AUTH_USER_CACHE_TTL_SECONDS,
+    max_entries=settings.AUTH_USER_CACHE_MAX_ENTRIES
+)
+
+@event.listens_for(models.User, "after_update")
+@event.listens_for(models.User, "after_delete")
+def invalidate_cached_user(mapper, connection, target) -> None:
+    """Drop the cached principal whenever a user row changes through the ORM"""
+    user_cache.invalidate(target.id)
+    session = object_session(target)
+    if session is not None:
+        # Until the commit, other requests still read the old row and may re-cache it
+        session.info.setdefault("changed_user_ids", set()).add(target.id)
+
+@event.listens_for(Session, "after_commit")
+def invalidate_committed_users(session) -> None:
+    """Drop users changed in this transaction once the change is visible to other sessions"""
+    for user_id in session.info.pop("changed_user_ids", ()):
+        user_cache.invalidate(user_id)
+
+@event.listens_for(Session, "after_rollback")
+def forget_rolled_back_users(session) -> None:
+    session.info.pop("changed_user_ids", None)
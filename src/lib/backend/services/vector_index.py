@@ -0,0 +1,205 @@
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from concurrent.futures import Future
+import threading
+import numpy as np
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+def train_ivf(vectors: np.ndarray, iterations: int = 10, sample_size: int = 50000) -> Tuple[np.ndarray, np.ndarray]:
+    """k-means centroids for normalized vectors, plus the list each vector falls in.
+
+    A pure function of its input so it can run on any CPU worker, threads or processes.
+    """
+    n_lists = max(1, int(np.sqrt(len(vectors))))
+    rng = np.random.default_rng(0)
+    sample = vectors[rng.choice(len(vectors), size=min(sample_size, len(vectors)), replace=False)]
+    centroids = sample[rng.choice(len(sample), size=n_lists, replace=False)]
+    for _ in range(iterations):
+        assignments = np.argmax(sample @ centroids.T, axis=1)
+        for list_no in range(n_lists):
+            members = sample[assignments == list_no]
+            if len(members):
+                centroids[list_no] = members.mean(axis=0)
+        centroids = normalize(centroids)
+    return centroids, np.argmax(vectors @ centroids.T, axis=1)
+
+class IVFIndex:
+    """In-process inverted-file (IVF) index for approximate nearest-neighbour search.
+
+    Vectors are L2-normalized and assigned to the closest of ``n_lists`` k-means
+    centroids. A query scans only the ``n_probe`` closest lists, so search cost
+    grows with ``N / n_lists * n_probe`` instead of ``N``. Small indexes (below
+    ``min_train_size``) are searched exactly.
+
+    Training is retriggered whenever the index doubles. With ``submit`` (a
+    function that starts ``fn(*args)`` in the background and returns a
+    Future) k-means runs on a snapshot of the vectors off the caller's thread,
+    and searches keep using the old lists until the new centroids are swapped
+    in; without it training runs inline.
+    """
+
+    def __init__(
+        self,
+        dim: Optional[int] = None,
+        n_probe: int = 8,
+        min_train_size: int = 2048,
+        submit: Optional[Callable[..., Future]] = None
+    ):
+        self.dim = dim
+        self.n_probe = n_probe
+        self.min_train_size = min_train_size
+        self.submit = submit
+        self._lock = threading.RLock()
+        self._ids: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self._vectors = np.zeros((0, dim or 0), dtype=np.float32)
+        self._alive = np.zeros(0, dtype=bool)
+        self._centroids: Optional[np.ndarray] = None
+        self._lists: List[np.ndarray] = []
+        self._trained_size = 0
+        self._training = False
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    _normalize = staticmethod(normalize)
+
+    def add(self, ids: Sequence[str], vectors: np.ndarray) -> None:
+        """Add or replace vectors for the given ids"""
+        if len(ids) == 0:
+            return
+        vectors = self._normalize(np.atleast_2d(vectors))
+        with self._lock:
+            if self.dim is None or self._vectors.shape[1] == 0:
+                self.dim = vectors.shape[1]
+                self._vectors = np.zeros((0, self.dim), dtype=np.float32)
+            for item_id in ids:
+                self._remove_locked(item_id)
+
+            start = len(self._ids)
+            self._reserve_locked(start + len(ids))
+            self._ids.extend(ids)
+            self._vectors[start:start + len(ids)] = vectors
+            self._alive[start:start + len(ids)] = True
+            for offset, item_id in enumerate(ids):
+                self._positions[item_id] = start + offset
+
+            if self._centroids is not None:
+                # Append to the nearest existing list; retrain once the index has doubled
+                positions = np.arange(start, start + len(ids))
+                assignments = np.argmax(vectors @ self._centroids.T, axis=1)
+                for list_no in np.unique(assignments):
+                    self._lists[list_no] = np.concatenate(
+                        [self._lists[list_no], positions[assignments == list_no]]
+                    )
+            if len(self._positions) >= max(self.min_train_size, 2 * self._trained_size):
+                self._start_training_locked()
+
+    def _reserve_locked(self, size: int) -> None:
+        """Grow storage geometrically so repeated adds stay amortized O(1)"""
+        capacity = self._vectors.shape[0]
+        if size <= capacity:
+            return
+        capacity = max(size, 2 * capacity, 1024)
+        vectors = np.zeros((capacity, self.dim), dtype=np.float32)
+        vectors[:len(self._ids)] = self._vectors[:len(self._ids)]
+        alive = np.zeros(capacity, dtype=bool)
+        alive[:len(self._ids)] = self._alive[:len(self._ids)]
+        self._vectors = vectors
+        self._alive = alive
+
+    def remove(self, item_id: str) -> None:
+        """Remove a vector from the index"""
+        with self._lock:
+            self._remove_locked(item_id)
+
+    def _remove_locked(self, item_id: str) -> None:
+        position = self._positions.pop(item_id, None)
+        if position is not None:
+            self._alive[position] = False
+
+    def _start_training_locked(self) -> None:
+        """Train on a snapshot of the live vectors, in the background when a submit function is set"""
+        if self._training:
+            return
+        live = np.flatnonzero(self._alive[:len(self._ids)])
+        snapshot = self._vectors[live]
+        self._training = True
+        if self.submit is None:
+            self._install_locked(live, *train_ivf(snapshot))
+            return
+        try:
+            future = self.submit(train_ivf, snapshot)
+        except RuntimeError as e:
+            # Pool already shut down; keep the current lists
+            self._training = False
+            print(f"Error scheduling vector index training: {str(e)}")
+            return
+        future.add_done_callback(lambda done: self._on_trained(live, done))
+
+    def _on_trained(self, snapshot_positions: np.ndarray, done: Future) -> None:
+        with self._lock:
+            if done.cancelled() or done.exception() is not None:
+                self._training = False
+                if not done.cancelled():
+                    print(f"Error training vector index: {str(done.exception())}")
+                return
+            self._install_locked(snapshot_positions, *done.result())
+
+    def _install_locked(self, snapshot_positions: np.ndarray, centroids: np.ndarray, snapshot_assignments: np.ndarray) -> None:
+        """Swap in new centroids and rebuild the inverted lists.
+
+        Vectors still alive from the snapshot keep their computed list; only
+        vectors added while training ran are assigned here.
+        """
+        self._training = False
+        assignments = np.full(len(self._ids), -1, dtype=np.int64)
+        assignments[snapshot_positions] = snapshot_assignments
+        live = np.flatnonzero(self._alive[:len(self._ids)])
+        assignments = assignments[live]
+        added = assignments < 0
+        if added.any():
+            assignments[added] = np.argmax(self._vectors[live[added]] @ centroids.T, axis=1)
+
+        # Compact storage so removed rows do not linger across retrains
+        self._vectors = self._vectors[live]
+        self._ids = [self._ids[i] for i in live]
+        self._alive = np.ones(len(live), dtype=bool)
+        self._positions = {item_id: i for i, item_id in enumerate(self._ids)}
+
+        n_lists = len(centroids)
+        order = np.argsort(assignments, kind="stable")
+        bounds = np.searchsorted(assignments[order], np.arange(n_lists + 1))
+        self._centroids = centroids
+        self._lists = [order[bounds[i]:bounds[i + 1]] for i in range(n_lists)]
+        self._trained_size = len(snapshot_positions)
+        if len(self._positions) >= 2 * self._trained_size:
+            # The index doubled again while this round trained
+            self._start_training_locked()
+
+    def search(self, query: np.ndarray, k: int = 10) -> List[Tuple[str, float]]:
+        """Return up to k (id, cosine similarity) pairs, best first"""
+        if k <= 0:
+            return []
+        query = self._normalize(np.asarray(query).reshape(-1))
+        with self._lock:
+            if not self._positions:
+                return []
+            if self._centroids is None:
+                candidates = np.flatnonzero(self._alive[:len(self._ids)])
+            else:
+                n_probe = min(self.n_probe, len(self._centroids))
+                closest = np.argpartition(-(self._centroids @ query), n_probe - 1)[:n_probe]
+                candidates = np.concatenate([self._lists[i] for i in closest])
+                candidates = candidates[self._alive[candidates]]
+            if len(candidates) == 0:
+                return []
+
+            scores = self._vectors[candidates] @ query
+            top = min(k, len(candidates))
+            best = np.argpartition(-scores, top - 1)[:top]
+            best = best[np.argsort(-scores[best])]
+            return [(self._ids[candidates[i]], float(scores[i])) for i in best]
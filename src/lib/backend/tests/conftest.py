@@ -0,0 +1,15 @@
+"""
+Shared setup for the backend tests.
+
+Run from the repository root so ``src.lib.backend`` is importable:
+
+    python -m pytest src/lib/backend/tests
+"""
+import os
+import tempfile
+
+# Settings are read at import time, so point the app at throwaway storage first
+_data_dir = tempfile.mkdtemp(prefix="jobspark-tests-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_data_dir}/jobspark.db")
+os.environ.setdefault("LLM_CACHE_PATH", os.path.join(_data_dir, "llm_cache.db"))
+os.environ.setdefault("UPLOAD_DIR", os.path.join(_data_dir, "uploads"))
@@ -0,0 +1,133 @@
+"""
+LLMClient against a fake chat completions server on an httpx mock transport.
+"""
+from typing import List
+import asyncio
+import httpx
+import pytest
+
+from src.lib.backend.services.llm_client import LLMClient
+
+MESSAGES = [{"role": "user", "content": "Summarize this job description"}]
+
+def completion(content: str) -> dict:
+    return {
+        "id": "chatcmpl-test",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "gpt-test",
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop"
+        }],
+        "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15}
+    }
+
+class FakeServer:
+    """Replies with the queued (status, delay) steps in order, then 200s"""
+
+    def __init__(self, steps=()):
+        self.steps = list(steps)
+        self.requests: List[httpx.Request] = []
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        status, delay = self.steps.pop(0) if self.steps else (200, 0.0)
+        if delay:
+            await asyncio.sleep(delay)
+        if status == 200:
+            return httpx.Response(200, json=completion("A short summary"))
+        return httpx.Response(status, json={"error": {"message": "slow down", "type": "rate_limit"}})
+
+def make_client(server: FakeServer, **options) -> LLMClient:
+    return LLMClient(
+        api_key="test-key",
+        base_url="http://fake-llm.test/v1",
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(server)),
+        **{"retry_base_seconds": 0.05, "timeout_seconds": 1.0, **options}
+    )
+
+def test_retries_rate_limits_with_backoff(monkeypatch):
+    server = FakeServer([(429, 0.0), (429, 0.0)])
+    client = make_client(server, max_retries=3)
+    delays = []
+    real_sleep = asyncio.sleep
+
+    async def recording_sleep(delay, *args):
+        delays.append(delay)
+        await real_sleep(0)
+
+    monkeypatch.setattr("src.lib.backend.services.llm_client.asyncio.sleep", recording_sleep)
+    content = asyncio.run(client.chat("gpt-test", MESSAGES))
+
+    assert content == "A short summary"
+    assert len(server.requests) == 3
+    assert server.requests[0].url.path == "/v1/chat/completions"
+    assert client.metrics["retries"] == 2
+    assert client.metrics["calls"] == 1
+    assert client.metrics["completion_tokens"] == 5
+    # Full jitter: each delay is drawn from [0, base * 2 ** (attempt - 1)]
+    assert len(delays) == 2
+    assert 0 <= delays[0] <= 0.05
+    assert 0 <= delays[1] <= 0.1
+
+def test_gives_up_after_max_retries():
+    server = FakeServer([(429, 0.0)] * 5)
+    client = make_client(server, max_retries=2, retry_base_seconds=0.0)
+
+    with pytest.raises(Exception) as raised:
+        asyncio.run(client.chat("gpt-test", MESSAGES))
+
+    assert type(raised.value) in LLMClient.RETRYABLE_ERRORS
+    assert len(server.requests) == 3
+    assert client.metrics["failures"] == 1
+
+def test_timeout_is_retried():
+    server = FakeServer([(200, 1.0)])
+    client = make_client(server, timeout_seconds=0.1, max_retries=1, retry_base_seconds=0.0)
+
+    content = asyncio.run(client.chat("gpt-test", MESSAGES))
+
+    assert content == "A short summary"
+    assert len(server.requests) == 2
+    assert client.metrics["retries"] == 1
+
+def test_timeout_fails_once_retries_run_out():
+    server = FakeServer([(200, 1.0)] * 2)
+    client = make_client(server, timeout_seconds=0.1, max_retries=1, retry_base_seconds=0.0)
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(client.chat("gpt-test", MESSAGES))
+
+    assert len(server.requests) == 2
+    assert client.metrics["failures"] == 1
+
+def test_identical_inflight_requests_share_one_call():
+    server = FakeServer([(200, 0.1)])
+    client = make_client(server)
+
+    async def burst():
+        return await asyncio.gather(*(client.chat("gpt-test", MESSAGES) for _ in range(5)))
+
+    results = asyncio.run(burst())
+
+    assert results == ["A short summary"] * 5
+    assert len(server.requests) == 1
+    assert client.metrics["coalesced"] == 4
+    assert client.metrics["calls"] == 1
+
+def test_different_requests_are_not_coalesced():
+    server = FakeServer([(200, 0.1), (200, 0.1)])
+    client = make_client(server)
+
+    async def burst():
+        return await asyncio.gather(
+            client.chat("gpt-test", MESSAGES),
+            client.chat("gpt-test", MESSAGES, temperature=0.2)
+        )
+
+    asyncio.run(burst())
+
+    assert len(server.requests) == 2
+    assert client.metrics["coalesced"] == 0
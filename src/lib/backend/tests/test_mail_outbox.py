@@ -0,0 +1,183 @@
+"""
+MailOutbox and SMTPConnection against a local aiosmtpd server.
+"""
+from typing import List
+import asyncio
+import socket
+import pytest
+from aiosmtpd.controller import Controller
+from aiosmtpd.smtp import AuthResult
+from sqlalchemy import delete, select
+
+from src.lib.backend import models
+from src.lib.backend.database import AsyncSessionLocal, async_engine, engine
+from src.lib.backend.services.mail_outbox import MailOutbox, SMTPBatchAborted, SMTPConnection
+
+REJECTED = "rejected@example.com"
+
+class RecordingHandler:
+    """Accepts mail, refusing REJECTED with a 550, and records each session"""
+
+    def __init__(self):
+        self.delivered: List[str] = []
+        self.sessions: List[object] = []
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address == REJECTED:
+            return "550 5.1.1 Mailbox unavailable"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        if not any(seen is session for seen in self.sessions):
+            self.sessions.append(session)
+        self.delivered.extend(envelope.rcpt_tos)
+        return "250 Message accepted for delivery"
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def make_outbox(port: int, batch_size: int = 50, username=None, password=None) -> MailOutbox:
+    connection = SMTPConnection(
+        host="127.0.0.1",
+        port=port,
+        username=username,
+        password=password,
+        starttls=False,
+        timeout=5.0,
+        idle_seconds=60.0
+    )
+    return MailOutbox(connection, sender="jobs@example.com", batch_size=batch_size, backoff_seconds=0.0)
+
+async def queue(outbox: MailOutbox, recipients: List[str]) -> None:
+    async with AsyncSessionLocal() as db:
+        for recipient in recipients:
+            outbox.add(db, recipient, "Interview invitation", "See you then")
+        await db.commit()
+
+async def outbox_rows() -> List[models.OutboxMessage]:
+    async with AsyncSessionLocal() as db:
+        return (await db.execute(select(models.OutboxMessage))).scalars().all()
+
+@pytest.fixture(autouse=True)
+def empty_outbox():
+    models.Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(delete(models.OutboxMessage))
+    yield
+
+def run(coro):
+    async def main():
+        try:
+            return await coro
+        finally:
+            # Pooled aiosqlite connections belong to this event loop
+            await async_engine.dispose()
+    return asyncio.run(main())
+
+@pytest.fixture
+def smtp_server():
+    handler = RecordingHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=free_port())
+    controller.start()
+    yield controller, handler
+    controller.stop()
+
+def test_batches_share_one_connection(smtp_server):
+    controller, handler = smtp_server
+    outbox = make_outbox(controller.port, batch_size=3)
+    recipients = [f"candidate{i}@example.com" for i in range(7)]
+
+    async def scenario():
+        await queue(outbox, recipients)
+        claimed = [await outbox.send_due() for _ in range(4)]
+        outbox.connection.close()
+        return claimed, await outbox_rows()
+
+    claimed, rows = run(scenario())
+
+    assert claimed == [3, 3, 1, 0]
+    assert sorted(handler.delivered) == sorted(recipients)
+    assert len(handler.sessions) == 1
+    assert outbox.connection.connects == 1
+    assert {row.status for row in rows} == {"sent"}
+
+def test_permanent_refusal_fails_only_that_message(smtp_server):
+    controller, handler = smtp_server
+    outbox = make_outbox(controller.port)
+
+    async def scenario():
+        await queue(outbox, ["first@example.com", REJECTED, "last@example.com"])
+        await outbox.send_due()
+        outbox.connection.close()
+        return {row.recipient: row for row in await outbox_rows()}
+
+    rows = run(scenario())
+
+    assert rows[REJECTED].status == "failed"
+    assert rows[REJECTED].attempts == 1
+    assert "550" in rows[REJECTED].last_error
+    assert rows["first@example.com"].status == "sent"
+    assert rows["last@example.com"].status == "sent"
+    assert sorted(handler.delivered) == ["first@example.com", "last@example.com"]
+
+def test_server_down_requeues_then_delivers():
+    port = free_port()
+    outbox = make_outbox(port)
+
+    async def while_down():
+        await queue(outbox, ["first@example.com", "second@example.com"])
+        with pytest.raises(SMTPBatchAborted):
+            await outbox.send_due()
+        return await outbox_rows()
+
+    rows = run(while_down())
+    assert [row.status for row in rows] == ["queued", "queued"]
+    assert [row.attempts for row in rows] == [1, 1]
+    assert outbox.failed == 0
+
+    handler = RecordingHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+    try:
+        async def after_restart():
+            claimed = await outbox.send_due()
+            outbox.connection.close()
+            return claimed, await outbox_rows()
+
+        claimed, rows = run(after_restart())
+    finally:
+        controller.stop()
+
+    assert claimed == 2
+    assert [row.status for row in rows] == ["sent", "sent"]
+    assert sorted(handler.delivered) == ["first@example.com", "second@example.com"]
+
+def test_rejected_login_requeues_the_batch():
+    handler = RecordingHandler()
+    controller = Controller(
+        handler,
+        hostname="127.0.0.1",
+        port=free_port(),
+        auth_require_tls=False,
+        authenticator=lambda *args: AuthResult(success=False, handled=False)
+    )
+    controller.start()
+    outbox = make_outbox(controller.port, username="jobs", password="wrong")
+    try:
+        async def scenario():
+            await queue(outbox, [f"candidate{i}@example.com" for i in range(3)])
+            with pytest.raises(SMTPBatchAborted) as aborted:
+                await outbox.send_due()
+            return aborted.value, await outbox_rows()
+
+        aborted, rows = run(scenario())
+    finally:
+        controller.stop()
+
+    assert "535" in str(aborted)
+    assert [row.status for row in rows] == ["queued"] * 3
+    assert outbox.failed == 0
+    assert handler.delivered == []